@@ -1,5 +1,3 @@
-from collections.abc import Iterable
-
 from django.contrib import admin
 from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
 from django.template.response import TemplateResponse
@@ -10,57 +8,9 @@ admin.site.index_title = "DCSS Translation"  # “Site administration” 자리
 from django.http import HttpResponseRedirect
 from django.forms.models import model_to_dict
 from .models import TranslationData, Matcher, AdminFastLink
+from . import facets
 
-# 유틸 1) groups 가 None → [] 로
-def groups_or_empty(groups):
-    return groups or []
-
-# 유틸 2) 주어진 구조 안에 old 가 하나라도 있으면 True
-def any_contains(item, old):
-    if isinstance(item, str):
-        return item == old
-    elif isinstance(item, Iterable) and not isinstance(item, (str, bytes)):
-        return any(any_contains(sub, old) for sub in item)
-    else:
-        return False
-# ──────────────────────────────────────────────────────────────
-# 보조 함수: groups 가 None 일 때 [] 로 대체
-# ──────────────────────────────────────────────────────────────
-# 유틸 3) 구조 전체를 돌며 old → new 로 교체
-def replace_all(item, old, new):
-    """
-    반환: (치환된_item, changed_bool)
-    - item 이 str  → old 와 같으면 new 로, changed = True
-    - item 이 list/tuple → 내부 원소마다 재귀, 하나라도 바뀌면 changed = True
-    - 그 외        → 그대로 반환, changed = False
-    """
-    if isinstance(item, str):
-        if item == old:
-            return new, True
-        return item, False
-
-    elif isinstance(item, Iterable) and not isinstance(item, (str, bytes)):
-        changed = False
-        new_container = []
-        for sub in item:
-            repl, ch = replace_all(sub, old, new)
-            changed |= ch
-            new_container.append(repl)
-        return new_container, changed
-
-    else:
-        return item, False
-# ───────────────────────────────────────────────────────────────
-def contains_old(groups, old):
-    """
-    groups (list | None) 안에 old 가 포함돼 있으면 True.
-    - 하위 항목이 None / 스칼라여도 안전하게 처리
-    """
-    for sub in groups_or_empty(groups):
-        if isinstance(sub, Iterable) and not isinstance(sub, (str, bytes)):
-            if old in sub:
-                return True
-    return False
+from .grouprefs import referencing_ids, referrer_count, rename_category
 
 def _change_url(obj):
     """해당 객체의 admin change URL"""
@@ -97,14 +47,17 @@ from urllib.parse import urlencode
 from django.conf import settings
 from django.contrib import admin
 from django.db.models.functions import Coalesce
-from django.http import HttpResponse
-from django.urls import reverse
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import path, reverse
 from django.utils.html import format_html, escape, mark_safe
 
 from .forms import TranslationDataForm, MatcherForm, CategoryChangeForm, CategoryBulkForm
 from .utils import NoCountPaginator
 from .utils import SmartPaginator
-from django.db import models, transaction
+from .status import status_counts
+from .batching import bulk_signals
+from django.db import models
 from django.db.models import Func, Value, F, Expression
 
 
@@ -163,13 +116,106 @@ class ModePassThroughFilter(SimpleListFilter):
         return queryset
 
 
+def _facet_label(label: str, rows: int) -> str:
+    return f"{label} ({rows:,})"
+
+
+class FacetFilter(SimpleListFilter):
+    """
+    선택지·개수를 facet 표에서 (core/facets.py) — 원본 표를 DISTINCT 로 훑지 않는다
+    많은 순 facets.LIMIT 개만 그리고, select2 에 입력하면 FacetAdminMixin 의 JSON 으로 서버에서 좁힌다
+    """
+    template = "admin/facet_filter.html"
+    facet = None
+
+    def __init__(self, request, params, model, model_admin):
+        self.more = 0
+        site = model_admin.admin_site.name if model_admin is not None else "admin"
+        self.url = reverse(f"{site}:{model._meta.app_label}_{model._meta.model_name}_facets", args=[self.facet])
+        super().__init__(request, params, model, model_admin)
+
+    def lookups(self, request, model_admin):
+        rows, total = facets.choices(self.facet, selected=self.used_parameters.get(self.parameter_name))
+        self.more = max(total - facets.LIMIT, 0)
+        return [(value, _facet_label(label, n)) for value, label, n in rows]
+
+    def has_output(self):
+        return True
+
+
+class SourceFacetFilter(FacetFilter):
+    title = "source"
+    parameter_name = "source__id__exact"        # Django 기본 FK 필터와 같은 이름 (기존 링크 유지)
+    facet = "source"
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        return queryset.filter(source_id=value) if value is not None else queryset
+
+
+class CategoryFacetFilter(FacetFilter):
+    title = "category"
+    parameter_name = "category__exact"
+    facet = "category"
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        return queryset.filter(category=value) if value is not None else queryset
+
+
+class FacetAdminMixin:
+    """list_filter 의 FacetFilter 가 select2 로 부르는 JSON — facets/<facet>/?q=글자&page=n"""
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path("facets/<str:facet>/", self.admin_site.admin_view(self.facet_view), name="%s_%s_facets" % info),
+        ] + super().get_urls()
+
+    def facet_view(self, request, facet):
+        names = {f.facet for f in self.list_filter if isinstance(f, type) and issubclass(f, FacetFilter)}
+        if facet not in names:
+            raise Http404
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            page = max(int(request.GET.get("page") or 1), 1)
+        except ValueError:
+            page = 1
+        rows, total = facets.choices(facet, narrow=request.GET.get("q", "").strip(),
+                                     offset=(page - 1) * facets.LIMIT)
+        return JsonResponse({
+            "results": [{"id": value, "text": _facet_label(label, n)} for value, label, n in rows],
+            "pagination": {"more": total > page * facets.LIMIT},
+        })
+
+
+class TranslationStatusFilter(SimpleListFilter):
+    """저장된 번역 상태(core/status.py)로 거르기 — 개수는 FacetCount 에서 (목록을 열 때마다 GROUP BY 하지 않는다)"""
+    title = "translation status"
+    parameter_name = "status"
+
+    def lookups(self, request, model_admin):
+        counts = status_counts(request.GET.get("source__id__exact") or None)
+        return [(value or "pending", f"{label} ({counts.get(value, 0):,})")
+                for value, label in TranslationData.STATUS_CHOICES]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value is None:
+            return queryset
+        return queryset.filter(status="" if value == "pending" else value)
+
+
 @admin.register(TranslationData)
-class TranslationDataAdmin(admin.ModelAdmin):
+class TranslationDataAdmin(FacetAdminMixin, admin.ModelAdmin):
     form = TranslationDataForm
     list_display = ("id", "source", "content_pre", "translation", "translation_status", "to_matcher_link")
-    search_fields = ["source"]
+    search_fields = ["source__name"]
     list_per_page = 50
-    list_filter = ("source", ModePassThroughFilter,)
+    list_filter = (SourceFacetFilter, TranslationStatusFilter, ModePassThroughFilter,)
+    list_select_related = ("source",)
+    autocomplete_fields = ("source",)
     paginator = NoCountPaginator
     readonly_fields = (
         "source", "content", "content_pre", "translation", "translation_status", "to_matcher_link", "translation_info")
@@ -219,6 +265,11 @@ class TranslationDataAdmin(admin.ModelAdmin):
         obj._actor = request.user.username  # ← 한 줄 추가
         super().save_model(request, obj, form, change)
 
+    def delete_queryset(self, request, queryset):
+        # 선택 삭제: 행마다 웹훅 대신 요약 한 건 (core/batching.py)
+        with bulk_signals("Bulk delete"):
+            super().delete_queryset(request, queryset)
+
     def get_readonly_fields(self, request, obj=None):
         if obj is None:  # ➜ 새 레코드 추가 화면
             return (
@@ -247,7 +298,7 @@ class TranslationDataAdmin(admin.ModelAdmin):
 
         return mark_safe(
             f'<span style="white-space:pre-wrap;font-family:monospace;" class="translation-info" '
-            f'data-source="{escape(obj.source)}" '
+            f'data-source="{escape(obj.source.name)}" '
             f'data-content="{escape(obj.content)}"></span>'
         )
 
@@ -276,7 +327,7 @@ class TranslationDataAdmin(admin.ModelAdmin):
         add_url = reverse("admin:core_matcher_add")
 
         params = urlencode({
-            "category": obj.source,
+            "category": obj.source.name,
             "raw": obj.content,  # ← 인코딩된 값
             "type": "raw",
         })
@@ -299,7 +350,7 @@ class TranslationDataAdmin(admin.ModelAdmin):
 
         return mark_safe(
             f'<span style="white-space:pre-line;font-family:monospace;" class="translation-result" '
-            f'data-source="{escape(obj.source)}" '
+            f'data-source="{escape(obj.source.name)}" '
             f'data-content="{escape(obj.content)}"></span>'
         )
 
@@ -307,18 +358,22 @@ class TranslationDataAdmin(admin.ModelAdmin):
 
     # ── Result (JS가 채울 자리) ─────────────────────────────
 
+    _STATUS_BADGE = {
+        TranslationData.STATUS_UNTRANSLATED: ("bg-danger", "Untranslated"),
+        TranslationData.STATUS_PART: ("bg-warning", "Part-Translated"),
+        TranslationData.STATUS_TRANSLATED: ("bg-primary", "Translated"),
+    }
+
     def translation_status(self, obj):
         """
-        <span class="dyn-result" data-source="..." data-content="..."></span>
-        JS 가 1초 뒤 'source+content+hello' 로 값 채움
+        저장된 상태 배지를 먼저 그려 두고, JS 가 브라우저 언어 기준 결과로 덮어씀
         """
-        url = reverse("admin:core_translationdata_change", args=[obj.pk])
-
-        return mark_safe(
-            f'<span style="" class="translation-status"></span>'
-        )
+        badge = self._STATUS_BADGE.get(obj.status)
+        inner = format_html('<span class="badge {}">{}</span>', *badge) if badge else ""
+        return format_html('<span class="translation-status">{}</span>', inner)
 
     translation_status.short_description = "Status"
+    translation_status.admin_order_field = "status"
 
     # JS 삽입
     class Media:
@@ -333,8 +388,10 @@ from django import forms
 from django.contrib import admin, messages
 from django.contrib.admin.views.main import ChangeList
 from django.urls import reverse, path
-from django.http import HttpResponseRedirect
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponseBadRequest, HttpResponseRedirect, JsonResponse
 from django.template.response import TemplateResponse
+from django.utils import timezone
 from django.utils.html import format_html, escape, mark_safe
 from django.utils.translation import gettext_lazy as _
 
@@ -353,16 +410,67 @@ from .models import TranslationData, Matcher, AdminFastLink
 from .forms import TranslationDataForm, MatcherForm
 from .utils import NoCountPaginator, SmartPaginator
 from .forms import CategoryChangeConfirmForm  # ← 방금 만든 폼
+from .impact import analyze, summarize
+
+
+class MatcherUsageFilter(admin.SimpleListFilter):
+    """manage.py matcher_stats 결과로 거르기 — 정리 대상 찾기용"""
+    title = "corpus usage"
+    parameter_name = "usage"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("dead", "Unused (no hits)"),
+            ("shadowed", "Fully shadowed"),
+            ("partly", "Partly shadowed"),
+            ("used", "Used"),
+            ("unknown", "Not computed"),
+        )
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value == "dead":
+            return queryset.filter(stats__hits=0, stats__nested=0)
+        if value == "shadowed":
+            return queryset.filter(stats__hits__gt=0, stats__wins=0, stats__nested=0)
+        if value == "partly":
+            return queryset.filter(stats__wins__gt=0, stats__shadowed__gt=0)
+        if value == "used":
+            return queryset.filter(Q(stats__wins__gt=0) | Q(stats__nested__gt=0))
+        if value == "unknown":
+            return queryset.filter(stats__isnull=True)
+        return queryset
+
+
+class MatcherReferencesFilter(admin.SimpleListFilter):
+    """?references=<category> → groups 로 그 category 를 참조하는 matcher (역색인 조회)"""
+    title = "references category"
+    parameter_name = "references"
+
+    def lookups(self, request, model_admin):
+        value = request.GET.get(self.parameter_name)
+        return ((value, value),) if value else ()
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value:
+            return queryset.filter(pk__in=referencing_ids(value))
+        return queryset
 
 # ──────────────────────────────────────────
 # ModelAdmin
 # ──────────────────────────────────────────
 @admin.register(Matcher)
-class MatcherAdmin(admin.ModelAdmin):
+class MatcherAdmin(FacetAdminMixin, admin.ModelAdmin):
     form = MatcherForm
     change_list_template = "admin/matcher_change_list.html"
     actions= ["change_category_confirm"]
 
+    def delete_queryset(self, request, queryset):
+        # 선택 삭제: 재빌드 한 번 + 요약 웹훅 한 건 (core/batching.py)
+        with bulk_signals("Bulk delete"):
+            super().delete_queryset(request, queryset)
+
     @admin.action(description="Change category…")
     def change_category_confirm(self, request, queryset):
         """
@@ -380,7 +488,11 @@ class MatcherAdmin(admin.ModelAdmin):
                 return
 
             pks = request.POST.getlist("_selected_action")
-            updated = Matcher.objects.filter(pk__in=pks).update(category=new_cat)
+            # update() 는 시그널이 없다 → 재빌드 예약·요약 웹훅을 직접 알린다
+            with bulk_signals(f"Change category → {new_cat}") as batch:
+                moved = Matcher.objects.filter(pk__in=pks)
+                batch.note_matchers("moved", moved.only("pk", "category", "raw", "regexp_source"), to=new_cat)
+                updated = moved.update(category=new_cat, updated_at=timezone.now())
 
             self.message_user(
                 request,
@@ -410,7 +522,34 @@ class MatcherAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         # ▲ signals 쪽에서 읽을 수 있도록
         obj._actor = request.user.username  # ← 한 줄 추가
+        # 저장 전 DB 와 비교해야 하므로 영향 분석은 save 보다 먼저 (짧은 예산)
+        # 기본은 끔 — matcher 전체를 두 번 컴파일하므로 저장 지연이 matcher 수에 비례, 평소엔 "Preview impact" 로
+        report = None
+        if getattr(settings, "MATCHER_IMPACT_ON_SAVE", False):
+            report = analyze(obj, old_id=obj.pk if change else None,
+                             budget=getattr(settings, "MATCHER_IMPACT_SAVE_BUDGET", 1.0))
         super().save_model(request, obj, form, change)
+        if report is not None:
+            self.message_user(request, summarize(report), level=messages.INFO)
+
+    # ── 저장 전 미리보기: 폼 내용 그대로 POST → 영향 분석 조각 ──
+    def impact_view(self, request, object_id=None):
+        obj = self.get_object(request, object_id) if object_id else None
+        if request.method != "POST" or (object_id and obj is None):
+            return HttpResponseBadRequest()
+        if not (self.has_change_permission(request, obj) if obj else self.has_add_permission(request)):
+            raise PermissionDenied
+
+        form = self.get_form(request, obj)(request.POST, instance=obj)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        report = analyze(form.save(commit=False), old_id=obj.pk if obj else None)
+        return TemplateResponse(request, "admin/matcher_impact.html", {
+            "report": report,
+            "sections": [("Newly translated", report["newly_translated"]),
+                         ("Newly broken", report["newly_broken"]),
+                         ("Changed", report["changed"])],
+        })
 
     def get_search_results(self, request, queryset, search_term):
         qs, use_distinct = super().get_search_results(
@@ -442,15 +581,20 @@ class MatcherAdmin(admin.ModelAdmin):
         "memo_display",
         "priority",
         "ignore_part_translated_display",
+        "hits_col",
+        "wins_col",
+        "shadowed_col",
+        "nested_col",
         "copy_link"
     )
     list_display_links = None  # 기본 a 태그 비활성화
-    list_filter = ("category",)
+    list_filter = (CategoryFacetFilter, MatcherUsageFilter, MatcherReferencesFilter)
+    readonly_fields = ("usage_examples", "referenced_by")
     search_fields = ("category", "raw", "regexp_source", "replace_value", "groups", "memo")
 
 
     class Media:
-        js = ("core/js/matcher_form_toggle.js",)
+        js = ("core/js/matcher_form_toggle.js", "core/js/matcher_impact.js")
 
     def get_changeform_initial_data(self, request):
         """
@@ -488,10 +632,54 @@ class MatcherAdmin(admin.ModelAdmin):
 
     # Queryset: 정렬용
     def get_queryset(self, request):
-        return super().get_queryset(request).annotate(
+        return super().get_queryset(request).select_related("stats").annotate(
             pattern_value=Coalesce("raw", "regexp_source")
         )
 
+    # ── 코퍼스 사용 통계 (manage.py matcher_stats) ──
+    @staticmethod
+    def _stat(obj, name):
+        stats = getattr(obj, "stats", None)
+        return "–" if stats is None else f"{getattr(stats, name):,}"
+
+    @admin.display(description="Hits", ordering="stats__hits")
+    def hits_col(self, obj):
+        return _wrap_link(obj, self._stat(obj, "hits"))
+
+    @admin.display(description="Wins", ordering="stats__wins")
+    def wins_col(self, obj):
+        return _wrap_link(obj, self._stat(obj, "wins"))
+
+    @admin.display(description="Shadowed", ordering="stats__shadowed")
+    def shadowed_col(self, obj):
+        return _wrap_link(obj, self._stat(obj, "shadowed"))
+
+    @admin.display(description="Nested", ordering="stats__nested")
+    def nested_col(self, obj):
+        return _wrap_link(obj, self._stat(obj, "nested"))
+
+    @admin.display(description="Corpus examples")
+    def usage_examples(self, obj):
+        stats = getattr(obj, "stats", None) if obj.pk else None
+        if stats is None:
+            return "–"
+        items = "".join(f"<li><code>{escape(e)}</code></li>" for e in stats.examples)
+        return mark_safe(
+            f"hits {stats.hits:,} · wins {stats.wins:,} · shadowed {stats.shadowed:,} · "
+            f"nested {stats.nested:,} <small>(generation {stats.generation})</small>"
+            f"<ul style='margin:4px 0 0 1em;'>{items}</ul>"
+        )
+
+    @admin.display(description="Referenced by")
+    def referenced_by(self, obj):
+        if not obj.pk:
+            return "–"
+        count = referrer_count(obj.category)
+        if not count:
+            return f"No matcher uses “{obj.category}” in groups"
+        url = f"{reverse('admin:core_matcher_changelist')}?{urlencode({'references': obj.category})}"
+        return format_html('<a href="{}">{} matcher(s)</a> use “{}” in groups', url, f"{count:,}", obj.category)
+
     # ── Type ──
     def match_type_col(self, obj):
         badge = (
@@ -609,7 +797,11 @@ class MatcherAdmin(admin.ModelAdmin):
                 "change-category/",
                 self.admin_site.admin_view(self.bulk_change_category_view),
                 name="core_matcher_bulk_change_category",  # ★ bulk 이름으로 통일
-            )
+            ),
+            path("impact/", self.admin_site.admin_view(self.impact_view),
+                 name="core_matcher_impact_add"),
+            path("<path:object_id>/impact/", self.admin_site.admin_view(self.impact_view),
+                 name="core_matcher_impact"),
         ]
         return my + urls
 
@@ -638,29 +830,9 @@ class MatcherAdmin(admin.ModelAdmin):
                 old = form.cleaned_data["old_category"]
                 new = form.cleaned_data["new_category"]
 
-                # (1) category 필드 카운트
-                direct_q = Q(category=old)
-                direct_cnt = Matcher.objects.filter(direct_q).count()
-
-                # (2) groups 안 old 포함 여부 카운트
-                all_matchers = Matcher.objects.all()
-                group_cnt = sum(
-                    1 for m in all_matchers
-                    if any_contains(groups_or_empty(m.groups), old)
-                )
-
-                # ========= 실제 UPDATE =========
-                with transaction.atomic():
-                    # ① category 필드
-                    updated += Matcher.objects.filter(direct_q).update(category=new)
-
-                    # ② groups 재귀 치환
-                    for m in all_matchers:
-                        grp, changed = replace_all(groups_or_empty(m.groups), old, new)
-                        if changed:
-                            m.groups = grp
-                            m.save(update_fields=["groups"])
-                            updated += 1
+                # category 필드 + groups 역색인(MatcherGroupRef) 으로 참조하는 행만 — 한 트랜잭션
+                direct_cnt, group_cnt = rename_category(old, new)
+                updated = direct_cnt + group_cnt
 
                 messages.success(
                     request,
@@ -674,10 +846,7 @@ class MatcherAdmin(admin.ModelAdmin):
                 old = request.POST.get("old_category")
                 if old:
                     direct_cnt = Matcher.objects.filter(category=old).count()
-                    group_cnt = sum(
-                        1 for m in Matcher.objects.all()
-                        if any_contains(groups_or_empty(m.groups), old)
-                    )
+                    group_cnt = referrer_count(old)
 
         # -----------------------------------------------------------
         # GET  ― 미리보기(Preview)
@@ -687,10 +856,7 @@ class MatcherAdmin(admin.ModelAdmin):
             if form.is_valid():
                 old = form.cleaned_data["old_category"]
                 direct_cnt = Matcher.objects.filter(category=old).count()
-                group_cnt = sum(
-                    1 for m in Matcher.objects.all()
-                    if any_contains(groups_or_empty(m.groups), old)
-                )
+                group_cnt = referrer_count(old)
 
         ctx.update(dict(form=form,
                         direct_cnt=direct_cnt,
@@ -698,3 +864,62 @@ class MatcherAdmin(admin.ModelAdmin):
         return TemplateResponse(request,
                                 "admin/bulk_change_category.html",
                                 ctx)
+
+
+# ──────────────────────────────────────────
+# Discord 웹훅 outbox (core/outbox.py) — 읽기 전용, 제목에 대기 수·지연
+# ──────────────────────────────────────────
+from .models import WebhookMessage
+from .outbox import outbox_stats
+
+
+@admin.register(WebhookMessage)
+class WebhookMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "created_at", "sent_at", "attempts", "next_attempt_at", "last_error")
+    list_filter = ("status",)
+    readonly_fields = [f.name for f in WebhookMessage._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        stats = outbox_stats()
+        title = (f"Webhook outbox — {stats['pending']:,} pending, {stats['dead']:,} dead, "
+                 f"{stats['sent_24h']:,} sent in 24h")
+        if stats["latency_p95"] is not None:
+            title += f", latency p50 {stats['latency_p50']:.1f}s / p95 {stats['latency_p95']:.1f}s"
+        return super().changelist_view(request, {**(extra_context or {}), "title": title})
+
+
+# ──────────────────────────────────────────
+# import_packs manifest — 읽기 전용 (다시 읽히려면 행 삭제 또는 --force)
+# ──────────────────────────────────────────
+from .models import PackManifest
+
+
+@admin.register(PackManifest)
+class PackManifestAdmin(admin.ModelAdmin):
+    list_display = ("path", "size", "records_done", "completed", "updated_at", "last_error")
+    list_filter = ("completed",)
+    search_fields = ("path",)
+    readonly_fields = [f.name for f in PackManifest._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+from .models import Source
+
+
+@admin.register(Source)
+class SourceAdmin(admin.ModelAdmin):
+    # TranslationData 의 source 자동완성이 이 search_fields 로 찾는다
+    list_display = ("name", "rows")
+    search_fields = ("name",)
+    readonly_fields = ("rows",)
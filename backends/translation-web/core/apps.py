@@ -1,3 +1,5 @@
+import sys
+
 from django.apps import AppConfig
 
 
@@ -7,3 +9,9 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         import core.signals  # noqa
+
+        # 서버 프로세스만 (gunicorn / runserver) — migrate·test 등 다른 관리 명령은 건너뜀
+        if sys.argv[0].endswith("manage.py") and sys.argv[1:2] != ["runserver"]:
+            return
+        from core.outbox import resume_pending
+        resume_pending()
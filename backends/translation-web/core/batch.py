@@ -0,0 +1,54 @@
+# core/batch.py
+"""
+TranslationData 전체를 훑는 배치 작업 공통 — pk 구간 나누기 + 프로세스 풀
+
+• plan_ranges(): [lo, hi) 구간, 경계는 chunk 배수 (재실행해도 같은 구간)
+• run_ranges(): 구간마다 func(pk_range) 실행, 끝나는 대로 (pk_range, 결과) 를 돌려준다
+  workers > 1 이면 fork 된 자식 프로세스에서 (initializer 로 Translator 등 한 번만 준비)
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.db import connections
+from django.db.models import Max, Min
+
+from .models import TranslationData
+
+
+def plan_ranges(chunk: int) -> list[tuple[int, int]]:
+    """[lo, hi) 구간 목록 — 경계를 chunk 배수에 맞춰 재실행해도 같은 구간이 나온다"""
+    agg = TranslationData.objects.aggregate(lo=Min("pk"), hi=Max("pk"))
+    if agg["lo"] is None:
+        return []
+    start = agg["lo"] // chunk * chunk
+    return [(lo, lo + chunk) for lo in range(start, agg["hi"] + 1, chunk)]
+
+
+def _forked_init(initializer, initargs):
+    connections.close_all()                 # 부모에게서 물려받은 DB 연결은 쓰지 않는다
+    initializer(*initargs)
+
+
+def run_ranges(func, ranges, *, workers: int = 1, initializer=None, initargs=()):
+    """
+    func(pk_range) → 결과. 완료 순서대로 (pk_range, 결과) 를 yield.
+    func / initializer 는 모듈 최상위 함수여야 한다 (자식 프로세스로 넘어감)
+    """
+    ranges = list(ranges)
+    if workers > 1 and len(ranges) > 1:
+        connections.close_all()             # fork 전에 닫아야 자식과 소켓을 공유하지 않는다
+        ctx = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_forked_init,
+                                 initargs=(initializer or _noop, initargs)) as pool:
+            futures = {pool.submit(func, r): r for r in ranges}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    else:
+        if initializer is not None:
+            initializer(*initargs)
+        for r in ranges:
+            yield r, func(r)
+
+
+def _noop(*args):
+    pass
@@ -0,0 +1,108 @@
+# core/batching.py
+"""
+대량 작업용 시그널 묶음 — with bulk_signals("bulk delete"): …
+
+• 범위 안에서 저장·삭제 시그널은 행마다 하던 일(Discord 웹훅, 재빌드 예약, 상태 재계산, 역색인)을 모아 두기만
+• 범위를 나갈 때: 역색인은 한 번에 sync_refs, Source.rows·상태별 개수·category facet 은 값마다 UPDATE 한 번,
+                  영향받은 행을 나열한 요약 웹훅 1건을 outbox 에 (모두 같은 트랜잭션)
+                  commit 후 mark_dirty 1회 + refresh_rows 1회
+• 범위 전체가 한 트랜잭션, 중첩되면 가장 바깥 범위가 처리, 스레드마다 따로
+  atomic=False → 호출부가 조각마다 commit (아주 큰 삭제), 요약은 범위가 끝까지 성공했을 때 한 번
+• queryset.update() 처럼 시그널이 없는 경로는 batch.note_matchers() 로 직접 알린다 (category 를 옮기면 to=새 값)
+• 요약에 나열할 앞쪽 KEEP 행만 보관하고 나머지는 개수만 센다 → 수백만 행이어도 메모리 일정
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from django.db import transaction
+
+from .middleware import get_current_username
+
+_local = threading.local()
+KEEP = 100              # 요약용으로 보관하는 행 수 (종류별)
+
+
+class Batch:
+    def __init__(self, label: str, actor: str):
+        self.label = label
+        self.actor = actor
+        self.matchers: list[tuple[str, int, str, str]] = []    # (action, pk, category, 패턴) — 앞쪽 KEEP 개
+        self.rows: list[tuple[str, int, int]] = []             # (action, pk, source_id) — TranslationData, 앞쪽 KEEP 개
+        self.counts: Counter = Counter()                       # ("matcher" | "translation data", action) → 개수
+        self.refs: dict[int, object] = {}                      # 역색인을 다시 맞출 Matcher
+        self.refresh: list[int] = []                           # 번역 상태를 다시 볼 TranslationData pk
+        self.sources: Counter = Counter()                      # (source_id, status) → 행 수 증감 (아직 반영 안 한 것)
+        self.categories: Counter = Counter()                   # category → facet 행 수 증감 (아직 반영 안 한 것)
+        self.dirty = False
+
+    # ── 시그널 / 호출부에서 기록 ─────────────────────────────
+    def note_matchers(self, action: str, matchers, *, refs: bool = False, to: str | None = None) -> None:
+        for m in matchers:
+            self.counts["matcher", action] += 1
+            if to is not None:
+                self.categories[m.category] -= 1
+                self.categories[to] += 1
+            if len(self.matchers) < KEEP:
+                self.matchers.append((action, m.pk, m.category, m.raw or f"/{m.regexp_source}/"))
+            if refs:
+                self.refs[m.pk] = m
+        self.dirty = True
+
+    def note_rows(self, action: str, rows, *, refresh: bool = False) -> None:
+        for row in rows:
+            self.counts["translation data", action] += 1
+            if len(self.rows) < KEEP:
+                self.rows.append((action, row.pk, row.source_id))
+            if refresh:
+                self.refresh.append(row.pk)
+
+    def apply_counts(self) -> None:
+        """모아 둔 Source.rows·상태별 개수 / category facet 증감을 반영 — atomic=False 범위는 호출부가 조각 트랜잭션마다 부른다"""
+        from .models import adjust_facet, adjust_row_counts
+
+        adjust_row_counts(self.sources)
+        adjust_facet("category", self.categories)
+        self.sources.clear()
+        self.categories.clear()
+
+    # ── 범위 끝 ───────────────────────────────────────────────
+    def _flush(self) -> None:
+        from .grouprefs import sync_refs
+
+        from .signals import send_batch_summary
+
+        sync_refs(m for m in self.refs.values() if m.pk is not None)
+        self.apply_counts()
+        if self.counts:
+            send_batch_summary(self)          # outbox 행도 범위와 같은 트랜잭션 → 함께 commit / 롤백
+        transaction.on_commit(self._after_commit)
+
+    def _after_commit(self) -> None:
+        from .rebuild import mark_dirty
+        from .status import refresh_rows
+
+        if self.dirty:
+            mark_dirty()
+        if self.refresh:
+            refresh_rows(self.refresh)
+
+
+def current_batch() -> Batch | None:
+    return getattr(_local, "batch", None)
+
+
+@contextmanager
+def bulk_signals(label: str, *, atomic: bool = True):
+    """대량 작업 범위 — 안에서 일어난 행 단위 시그널 작업을 commit 후 한 번으로 합친다"""
+    outer = current_batch()
+    if outer is not None:
+        yield outer
+        return
+    batch = _local.batch = Batch(label, get_current_username())
+    try:
+        with transaction.atomic() if atomic else nullcontext():
+            yield batch
+            batch._flush()
+    finally:
+        _local.batch = None
@@ -0,0 +1,173 @@
+# core/compact.py
+"""
+latest.json 의 compact(열 지향) 인코딩 — latest.compact.json / latest.msgpack
+
+기존 latest.json 은 그대로 두고, 원하는 클라이언트만 골라 받는 선택 포맷.
+같은 category / 언어 문자열이 수천 번 반복되는 것을 문자열 테이블로 접고,
+matcher 필드를 열(column) 단위 배열로 저장한다.
+
+스키마 (format = "dwem-compact", version = 1)
+────────────────────────────────────────────────────────────────
+{
+  "format":   "dwem-compact",
+  "version":  1,
+  "count":    N,                     # matcher 개수 (모든 열의 길이)
+  "strings":  [str, ...],            # 문자열 테이블 (category·언어·groups 이름·flags)
+  "columns": {
+    "id":        [int]               # matcher id
+    "category":  [sidx]              # strings 인덱스
+    "priority":  [int]
+    "raw":       [str | null]        # raw matcher 면 문자열, regex 면 null
+    "regex":     [str | null]        # regex 원문 (raw 면 null)
+    "flags":     [sidx | null]       # regex flags (없으면 null)
+    "replace":   [[sidx, str, ...] | str]
+                                     # {lang: text} → [lang, text, lang, text ...]
+    "groups":    [null | [g, ...]]   # g = sidx | null | [g, ...]  (중첩 깊이 제한 없음)
+    "ignorePT":  [0 | 1]             # ignorePartTranslated
+    "literals":  [null | [str, ...]] # 사전 필터용 필수 리터럴 (core/prefilter.py, 없으면 열 자체 생략 가능)
+  },
+  ...나머지 최상위 키(time, messages, generation 등)는 그대로 복사
+}
+- sidx 는 strings 배열의 0-based 인덱스
+- latest.msgpack 은 위 구조를 MessagePack 으로 직렬화한 것 (msgpack 패키지 필요)
+- decode_compact() 가 기준 디코더: 결과는 latest.json 과 같은 dict
+"""
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgpack = None
+
+FORMAT = "dwem-compact"
+VERSION = 1
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def __call__(self, s: str) -> int:
+        idx = self._index.get(s)
+        if idx is None:
+            idx = self._index[s] = len(self.strings)
+            self.strings.append(s)
+        return idx
+
+
+def _encode_group(g, intern):
+    if g is None:
+        return None
+    if isinstance(g, list):
+        return [_encode_group(x, intern) for x in g]
+    return intern(g)
+
+
+def _decode_group(g, strings):
+    if g is None:
+        return None
+    if isinstance(g, list):
+        return [_decode_group(x, strings) for x in g]
+    return strings[g]
+
+
+def encode_compact(payload: dict) -> dict:
+    """build_translation_payload() 결과 → compact dict"""
+    intern = _StringTable()
+    cols = {k: [] for k in
+            ("id", "category", "priority", "raw", "regex", "flags", "replace", "groups", "ignorePT",
+             "literals")}
+
+    for m in payload.get("matchers", []):
+        cols["id"].append(m["id"])
+        cols["category"].append(intern(m["category"]))
+        cols["priority"].append(m.get("priority", 0))
+
+        regex = m.get("regex")
+        if "raw" in m:
+            cols["raw"].append(m["raw"])
+            cols["regex"].append(None)
+            cols["flags"].append(None)
+        elif isinstance(regex, dict):
+            cols["raw"].append(None)
+            cols["regex"].append(regex["pattern"])
+            cols["flags"].append(intern(regex["flags"]))
+        else:
+            cols["raw"].append(None)
+            cols["regex"].append(regex)
+            cols["flags"].append(None)
+
+        rv = m.get("replaceValue")
+        if isinstance(rv, dict):
+            flat = []
+            for lang, text in rv.items():
+                flat += [intern(lang), text]
+            cols["replace"].append(flat)
+        else:
+            cols["replace"].append(rv)
+
+        groups = m.get("groups")
+        cols["groups"].append([_encode_group(g, intern) for g in groups] if groups else None)
+        cols["ignorePT"].append(1 if m.get("ignorePartTranslated") else 0)
+        cols["literals"].append(m.get("literals"))
+
+    head = {k: v for k, v in payload.items() if k != "matchers"}
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        **head,
+        "count": len(cols["id"]),
+        "strings": intern.strings,
+        "columns": cols,
+    }
+
+
+def decode_compact(doc: dict) -> dict:
+    """compact dict → latest.json 과 같은 payload (기준 디코더)"""
+    if doc.get("format") != FORMAT or doc.get("version") != VERSION:
+        raise ValueError(f"unsupported compact payload: {doc.get('format')} v{doc.get('version')}")
+
+    strings = doc["strings"]
+    cols = doc["columns"]
+    matchers = []
+    for i in range(doc["count"]):
+        m = {"category": strings[cols["category"][i]]}
+
+        rv = cols["replace"][i]
+        if isinstance(rv, list):
+            rv = {strings[rv[j]]: rv[j + 1] for j in range(0, len(rv), 2)}
+        m["replaceValue"] = rv
+
+        if cols["raw"][i] is not None:
+            m["raw"] = cols["raw"][i]
+        else:
+            flags = cols["flags"][i]
+            m["regex"] = (
+                {"pattern": cols["regex"][i], "flags": strings[flags]}
+                if flags is not None else cols["regex"][i]
+            )
+
+        groups = cols["groups"][i]
+        if groups:
+            m["groups"] = [_decode_group(g, strings) for g in groups]
+        if cols["ignorePT"][i]:
+            m["ignorePartTranslated"] = True
+        m["priority"] = cols["priority"][i]
+        m["id"] = cols["id"][i]
+        literals = cols.get("literals")
+        if literals and literals[i] is not None:
+            m["literals"] = literals[i]
+        matchers.append(m)
+
+    skip = {"format", "version", "count", "strings", "columns"}
+    return {"matchers": matchers, **{k: v for k, v in doc.items() if k not in skip}}
+
+
+def pack(doc: dict) -> bytes | None:
+    """compact dict → MessagePack (msgpack 미설치 시 None)"""
+    if msgpack is None:
+        return None
+    return msgpack.packb(doc, use_bin_type=True)
+
+
+def unpack(data: bytes) -> dict:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
@@ -0,0 +1,219 @@
+# core/coverage.py
+"""
+source 별 번역 커버리지 집계 → CoverageSummary
+
+• TranslationData 를 pk 구간(CHUNK 배수 경계)으로 나눠 프로세스 풀에서 평가
+  (각 워커는 같은 matcher 목록으로 Translator 를 한 번만 컴파일, 행 status 도 함께 저장)
+• 구간이 끝날 때마다 BUILD_ROOT/.coverage-checkpoint.json 에 누적 개수 기록
+  → 중단 후 다시 실행하면 남은 구간만 (matcher 가 바뀌었으면 처음부터)
+• 끝나면 CoverageSummary 를 한 트랜잭션으로 교체 — 대시보드는 이 표만 읽는다
+• 빌드 락은 matcher 목록을 읽을 때와 결과를 기록할 때만 잠깐 — 그사이 재빌드가 있었으면 다시 계산
+"""
+import hashlib
+import json
+import os
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.html import escape
+
+from .batch import plan_ranges, run_ranges
+from .models import CoverageSummary
+from .rebuild import build_lock, read_generation
+from .status import recompute
+from .translator import Translator
+from .views import fragment_digests, matcher_dicts
+
+CHECKPOINT_NAME = ".coverage-checkpoint.json"
+DEFAULT_CHUNK = 20_000
+
+
+def _checkpoint_path() -> Path:
+    return Path(settings.BUILD_ROOT) / CHECKPOINT_NAME
+
+
+ATTEMPTS = 3        # 계산 중에 matcher 가 바뀌면 다시 — 이만큼 연속이면 포기
+
+
+class MatchersChanged(RuntimeError):
+    """계산하는 동안 matcher / generation 이 계속 바뀌어 결과를 버렸다"""
+
+
+def matcher_signature(matchers: list[dict]) -> str:
+    """matcher 집합이 같으면 같은 값 (조각 해시 기반 → 캐시에 있으면 재직렬화 없음)"""
+    digests = fragment_digests({"matchers": matchers})
+    h = hashlib.sha256()
+    for pk in sorted(digests):
+        h.update(f"{pk}:{digests[pk]}\n".encode())
+    return h.hexdigest()
+
+
+def matcher_state() -> tuple[list[dict], int, str]:
+    """(matchers, generation, signature) — 빌드 락은 읽는 동안만, 긴 계산은 락 밖에서"""
+    with build_lock():
+        matchers = matcher_dicts()
+        return matchers, read_generation(), matcher_signature(matchers)
+
+
+@contextmanager
+def unchanged_since(generation: int, signature: str):
+    """락을 잡고 그사이 재빌드가 없었는지 yield — True 면 같은 락 안에서 결과를 기록할 것"""
+    with build_lock():
+        yield read_generation() == generation and matcher_signature(matcher_dicts()) == signature
+
+
+# ────────────────────────────────────────────────────────
+# 체크포인트
+# ────────────────────────────────────────────────────────
+def load_checkpoint(signature: str, chunk: int) -> tuple[set[int], Counter]:
+    """(끝난 구간 시작 pk, 누적 개수) — 조건이 다르면 빈 값"""
+    try:
+        data = json.loads(_checkpoint_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return set(), Counter()
+    if data.get("signature") != signature or data.get("chunk") != chunk:
+        return set(), Counter()
+    return set(data["done"]), Counter({(s, st): n for s, st, n in data["counts"]})
+
+
+def _save_checkpoint(signature: str, chunk: int, done: set[int], counts: Counter) -> None:
+    path = _checkpoint_path()
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps({
+        "signature": signature, "chunk": chunk, "done": sorted(done),
+        "counts": [[s, st, n] for (s, st), n in sorted(counts.items())],
+    }, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ────────────────────────────────────────────────────────
+# 워커 (fork 된 자식 프로세스 또는 workers=1 이면 현재 프로세스)
+# ────────────────────────────────────────────────────────
+_worker: tuple[Translator, int] | None = None
+
+
+def _init_worker(matchers: list[dict], generation: int) -> None:
+    global _worker
+    _worker = (Translator(matchers, debug=True), generation)
+
+
+def _run_range(pk_range: tuple[int, int]) -> Counter:
+    translator, generation = _worker
+    per_source = Counter()
+    recompute(translator=translator, generation=generation, pk_range=pk_range, per_source=per_source)
+    return per_source
+
+
+# ────────────────────────────────────────────────────────
+# 공개 API
+# ────────────────────────────────────────────────────────
+def write_summary(counts: Counter, generation: int) -> None:
+    now = timezone.now()
+    with transaction.atomic():
+        CoverageSummary.objects.all().delete()
+        CoverageSummary.objects.bulk_create([
+            CoverageSummary(source=source, status=status, count=n, generation=generation, computed_at=now)
+            for (source, status), n in sorted(counts.items())
+        ])
+
+
+def compute_coverage(*, workers: int = 1, chunk: int = DEFAULT_CHUNK,
+                     restart: bool = False, progress=None) -> Counter:
+    """
+    전체 커버리지 계산 후 CoverageSummary 교체. 반환: (source, status) → 개수
+    계산은 빌드 락 밖에서 — 끝났을 때 matcher / generation 이 바뀌었으면 버리고 새 목록으로 다시
+    (체크포인트는 signature 가 다르면 무시되므로 처음부터). ATTEMPTS 번 연속이면 MatchersChanged.
+    progress(done_ranges, total_ranges) 는 구간이 끝날 때마다 호출
+    """
+    for _ in range(ATTEMPTS):
+        matchers, generation, signature = matcher_state()
+        ranges = plan_ranges(chunk)
+
+        done, counts = (set(), Counter()) if restart else load_checkpoint(signature, chunk)
+        starts = {r[0] for r in ranges}
+        todo = [r for r in ranges if r[0] not in done]
+
+        for pk_range, per_source in run_ranges(_run_range, todo, workers=workers,
+                                               initializer=_init_worker, initargs=(matchers, generation)):
+            done.add(pk_range[0])
+            counts.update(per_source)
+            _save_checkpoint(signature, chunk, done, counts)
+            if progress is not None:
+                progress(len(done & starts), len(ranges))
+
+        with unchanged_since(generation, signature) as unchanged:
+            if unchanged:
+                write_summary(counts, generation)
+                _checkpoint_path().unlink(missing_ok=True)
+                return counts
+        restart = True
+    raise MatchersChanged(f"계산하는 동안 matcher 가 계속 바뀌었습니다 ({ATTEMPTS}회) — 나중에 다시 실행하세요")
+
+
+def coverage_table() -> tuple[list[dict], dict | None]:
+    """대시보드용: source 별 한 줄 (전체 많은 순) + 계산 시각/generation"""
+    rows: dict[str, dict] = {}
+    meta = None
+    for s in CoverageSummary.objects.all():
+        row = rows.setdefault(s.source, {"source": s.source, "total": 0})
+        row[s.status or "pending"] = s.count
+        row["total"] += s.count
+        meta = {"computed_at": s.computed_at, "generation": s.generation}
+    return sorted(rows.values(), key=lambda r: (-r["total"], r["source"])), meta
+
+
+# ────────────────────────────────────────────────────────
+# 대시보드  /coverage/  (CoverageSummary 만 읽음 → 코퍼스 크기와 무관)
+# ────────────────────────────────────────────────────────
+_COLUMNS = (
+    ("translated", "Translated", "#198754"),
+    ("part-translated", "Part-translated", "#ffc107"),
+    ("untranslated", "Untranslated", "#dc3545"),
+    ("pending", "Pending", "#adb5bd"),
+)
+
+
+@staff_member_required
+def coverage_report(request):
+    rows, meta = coverage_table()
+    if meta is None:
+        return HttpResponse(
+            "<h2>Translation coverage</h2>"
+            "<p>아직 집계가 없습니다. <code>python manage.py coverage</code> 를 실행하세요.</p>"
+        )
+
+    body = []
+    for row in rows:
+        total = row["total"]
+        bar = "".join(
+            f"<span title='{label}' style='display:inline-block;height:10px;"
+            f"width:{row.get(key, 0) / total * 200:.1f}px;background:{color};'></span>"
+            for key, label, color in _COLUMNS if row.get(key)
+        )
+        cells = "".join(f"<td style='text-align:right;'>{row.get(key, 0):,}</td>" for key, _, _ in _COLUMNS)
+        body.append(
+            f"<tr><td><code>{escape(row['source'])}</code></td>"
+            f"<td style='text-align:right;'>{total:,}</td>"
+            f"<td style='text-align:right;'>{row.get('translated', 0) / total * 100:.1f}%</td>"
+            f"{cells}<td style='white-space:nowrap;'>{bar}</td></tr>"
+        )
+
+    head = "".join(f"<th>{label}</th>" for _, label, _ in _COLUMNS)
+    html = (
+            "<h2>Translation coverage</h2>"
+            f"<p><small>generation {meta['generation']}, "
+            f"{timezone.localtime(meta['computed_at']):%Y-%m-%d %H:%M:%S} 집계</small></p>"
+            "<table class='table table-striped'><thead>"
+            f"<tr><th>Source</th><th>Total</th><th>Coverage</th>{head}<th></th></tr>"
+            "</thead><tbody>"
+            + "".join(body) +
+            "</tbody></table>"
+            "<p><a href='#' onclick='history.back();return false;' >← Back</a></p>"
+    )
+    return HttpResponse(html)
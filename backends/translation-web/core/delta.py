@@ -0,0 +1,149 @@
+# core/delta.py
+"""
+latest.json 버전별 delta 피드  —  GET /build/delta?since=<generation>
+
+• 게시(_publish)할 때마다 직전 generation 과 matcher 조각 해시를 비교해
+  BUILD_ROOT/deltas/<generation>.json 에 바뀐 id / 삭제된 id(tombstone) 기록
+• 요청 시 since+1 … 현재 까지의 delta 를 합쳐 바뀐 matcher 본문 + removed id 반환
+• 중간 delta 가 없거나(너무 오래됨) 변경이 많으면 전체 payload 로 대체 (full: true)
+"""
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.http import JsonResponse
+
+from .views import fragment_digests
+
+DELTA_DIR = "deltas"
+INDEX_NAME = ".delta-index.json"
+
+
+def _root() -> Path:
+    return Path(settings.BUILD_ROOT)
+
+
+def _write_json(path: Path, data) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ────────────────────────────────────────────────────────
+# 1) 빌드 쪽: 빌드 락 안에서 호출
+# ────────────────────────────────────────────────────────
+_index_cache: tuple[int, dict] | None = None   # (generation, {id: digest})
+
+
+def _load_index() -> tuple[int, dict] | None:
+    global _index_cache
+    path = _root() / INDEX_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    _index_cache = (data["generation"], {int(k): v for k, v in data["digests"].items()})
+    return _index_cache
+
+
+def record_delta(generation: int, payload: dict) -> None:
+    """generation-1 → generation 사이 변경분 기록 (직전 인덱스가 없으면 체인 끊김)"""
+    global _index_cache
+    delta_dir = _root() / DELTA_DIR
+    delta_dir.mkdir(parents=True, exist_ok=True)
+
+    digests = fragment_digests(payload)
+    prev = _index_cache if _index_cache and _index_cache[0] == generation - 1 else _load_index()
+
+    delta_path = delta_dir / f"{generation}.json"
+    if prev is not None and prev[0] == generation - 1:
+        old = prev[1]
+        _write_json(delta_path, {
+            "generation": generation,
+            "changed": sorted(pk for pk, d in digests.items() if old.get(pk) != d),
+            "removed": sorted(old.keys() - digests.keys()),
+        })
+    else:
+        delta_path.unlink(missing_ok=True)
+
+    _write_json(_root() / INDEX_NAME, {"generation": generation, "digests": digests})
+    _index_cache = (generation, digests)
+
+    # 보관 개수 초과분 정리
+    keep = getattr(settings, "DELTA_HISTORY", 500)
+    for p in delta_dir.glob("*.json"):
+        if p.stem.isdigit() and int(p.stem) <= generation - keep:
+            p.unlink(missing_ok=True)
+
+
+# ────────────────────────────────────────────────────────
+# 2) 제공 쪽
+# ────────────────────────────────────────────────────────
+_latest_cache: tuple[tuple, dict, dict] | None = None   # ((inode, mtime), payload, {id: matcher})
+
+
+def _load_latest() -> tuple[dict, dict] | None:
+    global _latest_cache
+    path = _root() / "latest.json"
+    try:
+        st = path.stat()
+        key = (st.st_ino, st.st_mtime_ns)   # rename 으로 교체되므로 inode 가 바뀐다
+        if _latest_cache is None or _latest_cache[0] != key:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            _latest_cache = (key, payload, {m["id"]: m for m in payload["matchers"]})
+    except (FileNotFoundError, ValueError):
+        return None
+    return _latest_cache[1], _latest_cache[2]
+
+
+def collect_delta(since: int, current: int) -> tuple[set, set] | None:
+    """since → current 누적 (changed, removed). 체인이 끊겼으면 None"""
+    changed, removed = set(), set()
+    for g in range(since + 1, current + 1):
+        try:
+            d = json.loads((_root() / DELTA_DIR / f"{g}.json").read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        changed.update(d["changed"])
+        removed.update(d["removed"])
+    return changed - removed, removed
+
+
+def build_delta(since: int | None) -> dict | None:
+    loaded = _load_latest()
+    if loaded is None:
+        return None
+    payload, by_id = loaded
+    current = payload.get("generation", 0)
+    head = {k: v for k, v in payload.items() if k != "matchers"}
+
+    delta = None
+    if since is not None and 0 <= since <= current:
+        delta = collect_delta(since, current)
+    # 바뀐 게 절반을 넘으면 전체가 더 싸다
+    if delta is None or len(delta[0]) * 2 > len(by_id):
+        return {**head, "full": True, "since": since, "matchers": payload["matchers"], "removed": []}
+
+    changed, removed = delta
+    return {
+        **head,
+        "full": False,
+        "since": since,
+        "matchers": [by_id[pk] for pk in sorted(changed) if pk in by_id],
+        "removed": sorted(removed),
+    }
+
+
+def delta_view(request):
+    try:
+        since = int(request.GET["since"])
+    except (KeyError, ValueError):
+        since = None
+
+    data = build_delta(since)
+    if data is None:
+        return JsonResponse({"error": "no build yet"}, status=404)
+    resp = JsonResponse(data, json_dumps_params={"ensure_ascii": False, "separators": (",", ":")})
+    resp["Cache-Control"] = "no-cache"
+    return resp
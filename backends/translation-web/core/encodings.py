@@ -0,0 +1,115 @@
+# core/encodings.py
+"""
+빌드 산출물 사전 압축 + Accept-Encoding 협상
+
+• 빌드 때 latest.json → latest.json.br / .zst / .gz 를 한 번만 만들어 둔다
+• serve_build 는 요청마다 압축하지 않고 알맞은 형제 파일을 골라 보낸다
+• brotli / zstandard 패키지가 없으면 해당 인코딩만 건너뜀
+"""
+import gzip
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 선택 의존성
+    zstandard = None
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)   # mtime=0 → 같은 입력이면 같은 바이트
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=19).compress(data)
+
+
+# (Content-Encoding, 파일 확장자, 압축 함수) — 서버 선호 순
+ENCODINGS = [
+    enc for enc in (
+        ("br", ".br", _brotli if brotli else None),
+        ("zstd", ".zst", _zstd if zstandard else None),
+        ("gzip", ".gz", _gzip),
+    ) if enc[2] is not None
+]
+SUFFIXES = (".br", ".zst", ".gz")
+
+
+def write_compressed_siblings(path: Path) -> None:
+    """path 옆에 압축본을 write-then-rename 으로 생성 (원본보다 늦게 써야 최신으로 인정)"""
+    data = path.read_bytes()
+    for _, suffix, compress in ENCODINGS:
+        target = path.with_name(path.name + suffix)
+        tmp = target.with_name(f".{target.name}.tmp")
+        tmp.write_bytes(compress(data))
+        os.replace(tmp, target)
+
+
+def remove_compressed_siblings(path: Path) -> None:
+    for suffix in SUFFIXES:
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """'br;q=1.0, gzip;q=0.5, *;q=0' → {'br': 1.0, 'gzip': 0.5, '*': 0.0}"""
+    accepted = {}
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def choose_encoding(header: str | None) -> tuple[str, str, object] | None:
+    """파일 없이 고를 때 (스냅샷 압축본 등) — q 가 가장 높은 ENCODINGS 항목, 받는 것이 없으면 None"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for enc in ENCODINGS:
+        q = accepted.get(enc[0], accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def negotiate(path: Path, header: str | None) -> tuple[Path, str | None]:
+    """
+    보낼 파일과 Content-Encoding 을 고른다.
+    q 값이 가장 높은 것, 같으면 ENCODINGS 순서. 원본보다 오래된 압축본은 무시.
+    """
+    accepted = parse_accept_encoding(header)
+    if not accepted:
+        return path, None
+
+    base_mtime = path.stat().st_mtime_ns
+    best, best_q = (path, None), 0.0
+    for encoding, suffix, _ in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q <= best_q:
+            continue
+        variant = path.with_name(path.name + suffix)
+        try:
+            if variant.stat().st_mtime_ns < base_mtime:
+                continue
+        except FileNotFoundError:
+            continue
+        best, best_q = (variant, encoding), q
+    return best
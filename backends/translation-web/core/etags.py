@@ -0,0 +1,76 @@
+# core/etags.py
+"""
+빌드 산출물 ETag 매니페스트 — BUILD_ROOT/.etags.json
+
+• 빌드 때 파일(+ .br/.zst/.gz 압축본)마다 sha256 을 한 번만 계산해 기록
+• serve_build 는 요청마다 해시하지 않고 여기서 강한 ETag 를 꺼낸다
+• 기록된 size / mtime 과 실제 파일이 다르면(교체 도중 등) 사용하지 않음
+• "content" = time / generation 을 뺀 payload 해시 → 내용이 같으면 재게시 생략
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+
+from .encodings import SUFFIXES
+
+MANIFEST_NAME = ".etags.json"
+
+_cache: tuple[tuple, dict] | None = None   # ((inode, mtime), manifest)
+
+
+def _path() -> Path:
+    return Path(settings.BUILD_ROOT) / MANIFEST_NAME
+
+
+def load_manifest() -> dict:
+    global _cache
+    path = _path()
+    try:
+        st = path.stat()
+        key = (st.st_ino, st.st_mtime_ns)   # rename 으로 교체되므로 inode 가 바뀐다
+        if _cache is None or _cache[0] != key:
+            _cache = (key, json.loads(path.read_text(encoding="utf-8")))
+    except (FileNotFoundError, ValueError):
+        return {"content": None, "files": {}}
+    return _cache[1]
+
+
+def _entry(path: Path) -> dict:
+    data = path.read_bytes()
+    st = path.stat()
+    return {
+        "etag": hashlib.sha256(data).hexdigest()[:32],
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+def record_etags(paths: list[Path], *, content: str | None = None) -> None:
+    """paths 와 그 압축본의 ETag 를 매니페스트에 반영 (write-then-rename)"""
+    old = load_manifest()
+    files = dict(old.get("files", {}))
+    for path in paths:
+        for variant in [path, *(path.with_name(path.name + s) for s in SUFFIXES)]:
+            if variant.exists():
+                files[variant.name] = _entry(variant)
+            else:
+                files.pop(variant.name, None)
+
+    manifest = {"content": content if content is not None else old.get("content"), "files": files}
+    path = _path()
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=0, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def lookup_etag(path: Path, st: os.stat_result) -> str | None:
+    """BUILD_ROOT 바로 아래 파일의 강한 ETag ('"…"'), 매니페스트와 안 맞으면 None"""
+    if path.parent != Path(settings.BUILD_ROOT).resolve():
+        return None
+    entry = load_manifest().get("files", {}).get(path.name)
+    if entry is None or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+        return None
+    return f'"{entry["etag"]}"'
@@ -0,0 +1,81 @@
+# core/facets.py
+"""
+admin 목록 필터의 선택지 + 행 수 — 요청 중에는 원본 표(TranslationData / Matcher)를 훑지 않는다
+
+• source   → Source(name, rows)                          선택 값은 Source pk
+• category → FacetCount(facet="category", value, rows)   선택 값은 category 문자열
+• status   → FacetCount(facet="status" / "source_status")   번역 상태 필터 개수 (core/status.py status_counts)
+• 개수는 저장·삭제 시그널, bulk_signals 범위 끝, import_packs, 상태 재계산이 증감으로 맞춘다 (core/signals.py)
+  DB 표라서 모든 작업자 프로세스가 같은 값을 보고, 프로세스별로 무효화할 캐시가 없다
+• 많은 순 LIMIT 개만 그리고 나머지는 입력한 글자로 서버에서 좁힌다 (값이 수천 개여도 페이지 크기 일정)
+• rebuild() — 원본에서 다시 센다 (manage.py rebuild_facets, 어긋났다고 의심될 때)
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import FacetCount, Matcher, Source, TranslationData
+
+LIMIT = 30          # 필터에 나열할 최대 값 수
+
+
+def _table(facet: str):
+    """(값, 표시 이름, 행 수) QuerySet 과 이름 열"""
+    if facet == "source":
+        return Source.objects.values_list("pk", "name", "rows"), "name"
+    return FacetCount.objects.filter(facet=facet).values_list("value", "value", "rows"), "value"
+
+
+def choices(facet: str, *, narrow: str = "", selected: str | None = None,
+            limit: int = LIMIT, offset: int = 0) -> tuple[list[tuple[str, str, int]], int]:
+    """
+    (값, 표시 이름, 행 수) 많은 순 offset 부터 limit 개 + 조건에 맞는 값 전체 수
+    narrow → 이름에 그 글자가 들어간 값만, selected 는 목록 밖이어도 끝에 붙인다
+    """
+    qs, name = _table(facet)
+    qs = qs.filter(rows__gt=0)
+    if narrow:
+        qs = qs.filter(**{f"{name}__icontains": narrow})
+    rows = [(str(v), label, n) for v, label, n in qs.order_by("-rows", name)[offset:offset + limit]]
+    total = offset + len(rows) if len(rows) < limit else qs.count()
+    if selected is not None and all(v != selected for v, _, _ in rows):
+        key = "pk" if facet == "source" else "value"
+        try:
+            extra = _table(facet)[0].filter(**{key: selected}).first()
+        except ValueError:                  # ?source__id__exact=abc
+            extra = None
+        if extra is not None:
+            rows.append((str(extra[0]), extra[1], extra[2]))
+    return rows, total
+
+
+def values(facet: str) -> list[str]:
+    """행이 있는 값 이름 전체 (자동완성 목록용, 이름순)"""
+    qs, name = _table(facet)
+    return list(qs.filter(rows__gt=0).order_by(name).values_list(name, flat=True))
+
+
+@transaction.atomic
+def rebuild() -> dict[str, int]:
+    """원본 표에서 다시 세어 덮어쓴다 → facet 별 값 수"""
+    per_source = dict(TranslationData.objects.order_by().values_list("source").annotate(n=Count("pk")))
+    sources = list(Source.objects.only("pk", "rows"))
+    for s in sources:
+        s.rows = per_source.get(s.pk, 0)
+    Source.objects.bulk_update(sources, ["rows"], batch_size=1000)
+
+    per_category = Matcher.objects.order_by().values_list("category").annotate(n=Count("pk"))
+    per_status = list(TranslationData.objects.order_by().values_list("source", "status").annotate(n=Count("pk")))
+    total = Counter()
+    for _, status, n in per_status:
+        total[status] += n
+    FacetCount.objects.filter(facet__in=["category", "status", "source_status"]).delete()
+    FacetCount.objects.bulk_create(
+        [FacetCount(facet="category", value=c, rows=n) for c, n in per_category]
+        + [FacetCount(facet="status", value=status, rows=n) for status, n in total.items()]
+        + [FacetCount(facet="source_status", value=f"{s}:{status}", rows=n) for s, status, n in per_status],
+        batch_size=1000,
+    )
+    return {"source": len(per_source), "category": FacetCount.objects.filter(facet="category").count(),
+            "status": len(total)}
@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 
 from .models  import Matcher
 from .widgets import ReplaceValueWidget, CategoryAutoCompleteWidget
+from . import facets
 
 class MatcherForm(forms.ModelForm):
     TYPE_CHOICES = (("raw", "Raw"), ("regex", "Regex"))
@@ -77,10 +78,8 @@ class MatcherForm(forms.ModelForm):
         #    새 레코드( instance.pk is None )면 기본값 'raw'
         default_type = "raw" if (not self.instance.pk or self.instance.raw) else "regex"
         self.initial.setdefault("type", default_type)
-        # ① 카테고리 목록 추출 (중복 제거 & 정렬)
-        cat_list = list(
-            Matcher.objects.values_list("category", flat=True).distinct().order_by("category")
-        )
+        # ① 카테고리 목록 — Matcher 를 DISTINCT 로 훑지 않고 facet 표에서 (core/facets.py)
+        cat_list = facets.values("category")
 
         # ② Category 필드 위젯 교체
         self.fields["category"].widget = CategoryAutoCompleteWidget(cat_list)
@@ -118,19 +117,7 @@ class TranslationDataForm(forms.ModelForm):
     class Meta:
         model   = TranslationData
         fields  = "__all__"
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # 🔹 DB에 이미 존재하는 source 값을 datalist 옵션으로 주입
-        cats = list(
-            TranslationData.objects
-            .order_by()
-            .values_list("source", flat=True)
-            .distinct()
-        )
-        if "sources" in self.fields:
-            self.fields["source"].widget = CategoryAutoCompleteWidget(cats)
+        # source 는 Source FK — admin 의 autocomplete_fields 가 Source 표에서 검색한다 (DISTINCT 없음)
 
 class CategoryChangeForm(forms.Form):
     new_category = forms.CharField(label="New category", max_length=50)
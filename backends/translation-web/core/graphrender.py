@@ -0,0 +1,247 @@
+# core/graphrender.py
+"""
+카테고리 그래프(latest.svg) 백그라운드 렌더
+
+• write_payload 는 JSON 만 게시하고 schedule_render() 로 넘긴다 → 빌드·요청 스레드는 Graphviz 를 기다리지 않음
+• 그래프 fingerprint 가 진행 중인 렌더 또는 게시된 SVG 와 같으면 아무것도 안 함
+• 스레드 풀(GRAPH_RENDER_WORKERS) 에서 Graphviz 하위 프로세스 실행, GRAPH_RENDER_TIMEOUT 초 넘으면 kill
+  그동안·실패 시에는 이전 latest.svg 가 그대로 서비스 (게시 상태를 안 바꾸므로 다음 빌드가 다시 시도)
+• 노드가 GRAPH_SFDP_THRESHOLD 개를 넘으면 dot 대신 sfdp (계층 레이아웃은 큰 그래프에서 수 분)
+• 시작 전에 새 렌더가 들어온 job 은 건너뜀, 더 새 generation 이 이미 게시됐으면 결과를 버림
+• 렌더마다 엔진·소요 시간·결과를 BUILD_ROOT/.graph-renders.json 에 최근 GRAPH_RENDER_HISTORY 개
+• 렌더 중에 만든 스냅샷은 SVG 없이 등록 → 렌더가 끝나면 svg_blob 을 채운다
+• GRAPH_RENDER_ASYNC=False → 호출한 스레드에서 바로 렌더 (테스트 등)
+"""
+import fcntl
+import json
+import os
+import subprocess
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from . import views
+from .encodings import write_compressed_siblings
+from .etags import record_etags
+from .snapshots import attach_svg
+
+STATE_NAME = ".graph-render.json"       # 게시된 SVG 의 fingerprint / generation
+LOG_NAME = ".graph-renders.json"
+LOCK_NAME = ".graph-render.lock"
+DEFAULT_ENGINE = "dot"
+FALLBACK_ENGINE = "sfdp"
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _root() -> Path:
+    return Path(settings.BUILD_ROOT)
+
+
+@contextmanager
+def _publish_lock():
+    """게시(교체) 구간만 프로세스 간 배타 — 빌드 락과 따로 둬서 debounce 대기와 엮이지 않게"""
+    with open(_root() / LOCK_NAME, "a") as fp:
+        fcntl.flock(fp, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+
+def _read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def _write_json(path: Path, data) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=0), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def published_state() -> dict:
+    """{"fingerprint", "generation", "engine", "seconds"} — 아직 없으면 {}"""
+    return _read_json(_root() / STATE_NAME, {})
+
+
+def render_log() -> list[dict]:
+    """최근 렌더 기록 (오래된 것부터)"""
+    return _read_json(_root() / LOG_NAME, [])
+
+
+def _append_log(entry: dict) -> None:
+    keep = _setting("GRAPH_RENDER_HISTORY", 50)
+    _write_json(_root() / LOG_NAME, (render_log() + [entry])[-keep:])
+
+
+# ────────────────────────────────────────────────────────
+# job
+# ────────────────────────────────────────────────────────
+_guard = threading.Lock()
+_latest: "RenderJob | None" = None      # 이 프로세스에서 마지막으로 예약한 렌더
+_executor: ThreadPoolExecutor | None = None
+
+
+class RenderJob:
+    def __init__(self, matchers: list, *, fingerprint: str, generation: int, nodes: int, edges: int):
+        self.matchers = matchers
+        self.fingerprint = fingerprint
+        self.generation = generation
+        self.nodes = nodes
+        self.edges = edges
+        self.engine = FALLBACK_ENGINE if nodes > _setting("GRAPH_SFDP_THRESHOLD", 400) else DEFAULT_ENGINE
+        self.started = False
+        self.done = threading.Event()
+        self.status: str | None = None
+        self.svg: bytes | None = None               # 게시한 SVG (스냅샷 채우기용)
+        self.forward: "RenderJob | None" = None     # 건너뛴 경우 대신 렌더하는 job
+        self._snapshots: list[int] = []
+
+    def attach(self, snapshot_id: int) -> None:
+        """이 렌더 결과를 스냅샷에 붙인다 (이미 끝났으면 바로)"""
+        with _guard:
+            if not self.done.is_set():
+                self._snapshots.append(snapshot_id)
+                return
+        self._fill(snapshot_id)
+
+    def _fill(self, snapshot_id: int) -> None:
+        if self.forward is not None:
+            self.forward.attach(snapshot_id)
+        elif self.svg is not None:
+            attach_svg(snapshot_id, self.svg)
+
+    def _finish(self, status: str) -> None:
+        # 기다리던 스냅샷을 다 채운 뒤에 done → wait_for_render() 후에는 svg_blob 이 있다
+        while True:
+            with _guard:
+                waiting, self._snapshots = self._snapshots, []
+                if not waiting:
+                    self.status = status
+                    self.matchers = []
+                    self.done.set()
+                    return
+            for snapshot_id in waiting:
+                self._fill(snapshot_id)
+
+
+def _run(job: RenderJob) -> None:
+    with _guard:
+        if job.forward is not None:
+            skipped = True
+        else:
+            skipped, job.started = False, True
+    if skipped:
+        job._finish("superseded")
+        return
+
+    root = _root()
+    tmp_base = root / f".latest.{os.getpid()}.{job.generation}.tmp"
+    tmp_svg = Path(f"{tmp_base}.svg")
+    status, error = "ok", ""
+    start = time.monotonic()
+    try:
+        views.generate_category_graph(job.matchers, tmp_base, engine=job.engine,
+                                      timeout=_setting("GRAPH_RENDER_TIMEOUT", 120.0))
+    except subprocess.TimeoutExpired:
+        status = "timeout"
+    except subprocess.CalledProcessError as exc:
+        status, error = "error", (exc.stderr or b"").decode("utf-8", "replace").strip()[-500:]
+    except Exception as exc:
+        status, error = "error", repr(exc)[-500:]
+    seconds = round(time.monotonic() - start, 3)
+
+    with _publish_lock():
+        if status == "ok" and published_state().get("generation", -1) > job.generation:
+            status = "stale"                        # 다른 프로세스가 더 새 그림을 먼저 게시
+        if status == "ok":
+            latest_svg = root / "latest.svg"
+            os.replace(tmp_svg, latest_svg)
+            write_compressed_siblings(latest_svg)
+            record_etags([latest_svg])
+            _write_json(root / STATE_NAME, {"fingerprint": job.fingerprint, "generation": job.generation,
+                                            "engine": job.engine, "seconds": seconds})
+            job.svg = latest_svg.read_bytes()
+        tmp_svg.unlink(missing_ok=True)
+        entry = {"generation": job.generation, "fingerprint": job.fingerprint[:12], "engine": job.engine,
+                 "nodes": job.nodes, "edges": job.edges, "seconds": seconds, "status": status,
+                 "finished_at": timezone.now().isoformat(timespec="seconds")}
+        if error:
+            entry["error"] = error
+        _append_log(entry)
+    job._finish(status)
+
+
+def _run_in_pool(job: RenderJob) -> None:
+    try:
+        _run(job)
+    except Exception:
+        traceback.print_exc()
+        if not job.done.is_set():
+            job._finish("error")
+    finally:
+        connection.close()                          # 스냅샷 채우기에 쓴 스레드 연결
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _guard:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(_setting("GRAPH_RENDER_WORKERS", 1),
+                                           thread_name_prefix="graph-render")
+        return _executor
+
+
+# ────────────────────────────────────────────────────────
+# 공개 API
+# ────────────────────────────────────────────────────────
+def schedule_render(matchers: list, *, generation: int) -> RenderJob | None:
+    """그래프가 바뀌었으면 렌더 예약 (진행 중인 같은 그래프가 있으면 그 job), 그대로면 None"""
+    global _latest
+    matcher_count, edges = views.category_graph(matchers)
+    fingerprint = views.graph_digest(matcher_count, edges)
+
+    with _guard:
+        current = _latest if _latest is not None and not _latest.done.is_set() else None
+    if current is not None:
+        if current.fingerprint == fingerprint:
+            return current
+    elif (_root() / "latest.svg").exists() and published_state().get("fingerprint") == fingerprint:
+        return None
+
+    job = RenderJob(list(matchers), fingerprint=fingerprint, generation=generation,
+                    nodes=len(matcher_count), edges=len(edges))
+    if not _setting("GRAPH_RENDER_ASYNC", True):
+        _run(job)
+        return job
+
+    with _guard:
+        if _latest is not None and not _latest.started and not _latest.done.is_set():
+            _latest.forward = job                   # 아직 시작 안 한 옛 렌더는 건너뛴다
+        _latest = job
+    _pool().submit(_run_in_pool, job)
+    return job
+
+
+def pending_render() -> RenderJob | None:
+    """이 프로세스에서 아직 끝나지 않은 마지막 렌더"""
+    with _guard:
+        return _latest if _latest is not None and not _latest.done.is_set() else None
+
+
+def wait_for_render(timeout: float | None = None) -> bool:
+    """마지막 렌더가 끝날 때까지 대기 (관리 명령·테스트용) — 시간 안에 끝나면 True"""
+    job = pending_render()
+    return job is None or job.done.wait(timeout)
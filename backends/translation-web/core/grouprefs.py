@@ -0,0 +1,151 @@
+# core/grouprefs.py
+"""
+Matcher.groups 역색인 — MatcherGroupRef(matcher, position, category)
+
+• Matcher 저장 때 signals 가 sync_refs() 로 그 matcher 의 행을 교체, 삭제는 CASCADE
+  queryset.update() / bulk_update 로 groups 를 바꾸는 코드는 sync_refs() 를 직접 부를 것
+• "이 category 를 참조하는 matcher" = 색인 조회 한 번 (groups JSON 을 전부 읽지 않음)
+• rename_category(): category 필드 + 참조하는 행만 groups 치환, 한 트랜잭션 + bulk_update
+  (bulk_signals 범위 → 재빌드 한 번 + 요약 웹훅 한 건)
+"""
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Matcher, MatcherGroupRef
+
+BATCH = 500
+
+
+# ────────────────────────────────────────────────────────
+# groups 구조 다루기 (admin 일괄 변경도 같이 쓴다)
+# ────────────────────────────────────────────────────────
+def any_contains(item, old):
+    """주어진 구조 안에 old 가 하나라도 있으면 True"""
+    if isinstance(item, str):
+        return item == old
+    elif isinstance(item, Iterable) and not isinstance(item, (str, bytes)):
+        return any(any_contains(sub, old) for sub in item)
+    else:
+        return False
+
+
+def replace_all(item, old, new):
+    """
+    반환: (치환된_item, changed_bool)
+    - item 이 str  → old 와 같으면 new 로, changed = True
+    - item 이 list/tuple → 내부 원소마다 재귀, 하나라도 바뀌면 changed = True
+    - 그 외        → 그대로 반환, changed = False
+    """
+    if isinstance(item, str):
+        if item == old:
+            return new, True
+        return item, False
+
+    elif isinstance(item, Iterable) and not isinstance(item, (str, bytes)):
+        changed = False
+        new_container = []
+        for sub in item:
+            repl, ch = replace_all(sub, old, new)
+            changed |= ch
+            new_container.append(repl)
+        return new_container, changed
+
+    else:
+        return item, False
+
+
+def group_refs(groups) -> list[tuple[int, str]]:
+    """groups → [(최상위 위치, 참조 category), …] (중복 제거, 등장 순서 유지)"""
+    found: list[tuple[int, str]] = []
+
+    def walk(g, position):
+        if isinstance(g, str):
+            if g and (position, g) not in found:
+                found.append((position, g))
+        elif isinstance(g, list):
+            for sub in g:
+                walk(sub, position)
+
+    for position, g in enumerate(groups if isinstance(groups, list) else ()):
+        walk(g, position)
+    return found
+
+
+# ────────────────────────────────────────────────────────
+# 색인 유지
+# ────────────────────────────────────────────────────────
+def sync_refs(matchers: Iterable[Matcher]) -> None:
+    """주어진 matcher 들의 색인 행을 현재 groups 로 교체"""
+    matchers = list(matchers)
+    if not matchers:
+        return
+    with transaction.atomic():
+        MatcherGroupRef.objects.filter(matcher__in=[m.pk for m in matchers]).delete()
+        MatcherGroupRef.objects.bulk_create(
+            [MatcherGroupRef(matcher_id=m.pk, position=position, category=category)
+             for m in matchers for position, category in group_refs(m.groups)],
+            batch_size=BATCH,
+        )
+
+
+def rebuild_refs() -> int:
+    """전체 재작성 (색인이 어긋났다고 의심될 때) — 만든 행 수"""
+    with transaction.atomic():
+        MatcherGroupRef.objects.all().delete()
+        rows = [
+            MatcherGroupRef(matcher_id=pk, position=position, category=category)
+            for pk, groups in Matcher.objects.values_list("pk", "groups").iterator(chunk_size=BATCH)
+            for position, category in group_refs(groups)
+        ]
+        MatcherGroupRef.objects.bulk_create(rows, batch_size=BATCH)
+    return len(rows)
+
+
+# ────────────────────────────────────────────────────────
+# 조회
+# ────────────────────────────────────────────────────────
+def referencing_ids(category: str):
+    """category 를 groups 로 참조하는 matcher pk (subquery 로 쓸 수 있는 QuerySet)"""
+    return MatcherGroupRef.objects.filter(category=category).values("matcher_id").distinct()
+
+
+def referrer_count(category: str) -> int:
+    return referencing_ids(category).count()
+
+
+def referrer_map() -> dict[str, set[str]]:
+    """참조되는 category → 그것을 groups 로 참조하는 matcher 들의 category"""
+    referrers: dict[str, set[str]] = {}
+    pairs = MatcherGroupRef.objects.values_list("category", "matcher__category").distinct()
+    for referenced, owner in pairs.iterator(chunk_size=BATCH * 4):
+        referrers.setdefault(referenced, set()).add(owner)
+    return referrers
+
+
+# ────────────────────────────────────────────────────────
+# category 이름 바꾸기
+# ────────────────────────────────────────────────────────
+def rename_category(old: str, new: str) -> tuple[int, int]:
+    """
+    category 필드가 old 인 행 + groups 에서 old 를 참조하는 행만 고친다.
+    반환: (category 를 바꾼 수, groups 를 바꾼 수)
+    """
+    from .batching import bulk_signals
+
+    now = timezone.now()
+    with bulk_signals(f"Rename category {old} → {new}") as batch:
+        moved = Matcher.objects.filter(category=old)
+        batch.note_matchers("moved", moved.only("pk", "category", "raw", "regexp_source"), to=new)
+        direct = moved.update(category=new, updated_at=now)
+        ids = sorted(referencing_ids(old).values_list("matcher_id", flat=True))
+        for start in range(0, len(ids), BATCH):
+            batch_rows = list(Matcher.objects.filter(pk__in=ids[start:start + BATCH])
+                              .only("pk", "category", "raw", "regexp_source", "groups"))
+            for m in batch_rows:
+                m.groups, _ = replace_all(m.groups, old, new)
+                m.updated_at = now
+            Matcher.objects.bulk_update(batch_rows, ["groups", "updated_at"])
+            batch.note_matchers("groups renamed", batch_rows, refs=True)
+    return direct, len(ids)
@@ -0,0 +1,148 @@
+# core/hitstats.py
+"""
+matcher 별 코퍼스 사용 통계 → MatcherStats  (manage.py matcher_stats)
+
+• 행마다 source = category 로 번역하고, 같은 category 의 모든 matcher 를 따로 대 본다
+  - raw: content 와 같으면 hit (raw 는 항상 먼저 적용 → 같은 문자열의 regex 는 가려짐)
+  - regex: 필수 리터럴 색인(core/prefilter.py)으로 불가능한 것은 대 보지 않고 search
+• 번역을 맡은 matcher = wins, 나머지 hit = shadowed, groups 재귀 안에서 쓰인 횟수 = nested
+• 예시는 matcher 가 번역을 맡은 문자열 중 짧은 것 top-k
+• pk 구간 × 프로세스 풀 (core/batch.py)
+"""
+import heapq
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .batch import plan_ranges, run_ranges
+from .models import Matcher, MatcherStats, TranslationData
+from .rebuild import read_generation
+from .translator import TRANSLATED, Translator
+from .views import matcher_dicts
+
+DEFAULT_CHUNK = 20_000
+DEFAULT_TOP_K = 5
+FETCH = 1000
+
+
+class _Tally:
+    """구간 하나의 집계 (자식 프로세스에서 부모로 pickle 되어 넘어온다)"""
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self.hits = Counter()
+        self.wins = Counter()
+        self.nested = Counter()
+        self.examples: dict[int, list] = {}     # id → 최대 힙 [(-len, -pk, content)]
+
+    def example(self, matcher_id: int, pk: int, content: str) -> None:
+        if self.top_k <= 0:                     # --top-k 0 → 예시 없이 횟수만
+            return
+        heap = self.examples.setdefault(matcher_id, [])
+        item = (-len(content), -pk, content)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def merge(self, other: "_Tally") -> None:
+        self.hits.update(other.hits)
+        self.wins.update(other.wins)
+        self.nested.update(other.nested)
+        for matcher_id, heap in other.examples.items():
+            for _, neg_pk, content in heap:
+                self.example(matcher_id, -neg_pk, content)
+
+    def examples_of(self, matcher_id: int) -> list[str]:
+        return [content for _, _, content in sorted(self.examples.get(matcher_id, ()), reverse=True)]
+
+
+# ────────────────────────────────────────────────────────
+# 워커
+# ────────────────────────────────────────────────────────
+_worker: tuple[Translator, str, int] | None = None
+
+
+def _init_worker(matchers: list[dict], top_k: int) -> None:
+    global _worker
+    _worker = (Translator(matchers, debug=True), getattr(settings, "TRANSLATION_STATUS_LANGUAGE", "ko"), top_k)
+
+
+def _count_nested(translations, tally: _Tally) -> None:
+    for sub in translations or ():
+        matcher = sub.get("matcher")
+        if matcher is not None and sub["status"] == TRANSLATED:
+            tally.nested[matcher["id"]] += 1
+        _count_nested(sub.get("translations"), tally)
+
+
+def evaluate_row(translator: Translator, language: str, pk: int, source: str, content: str,
+                 tally: _Tally) -> None:
+    cat = translator.categories.get(source)
+    if cat is None:
+        return
+
+    # 1) 어떤 matcher 들이 맞는가
+    raw = cat.raw.get(content)
+    if raw is not None:
+        tally.hits[raw.source["id"]] += 1
+    allowed = cat.index.allowed(content) if cat.index is not None else None
+    for i, m in enumerate(cat.matchers):
+        if (allowed is None or i in allowed) and m.regex.compiled.search(content):
+            tally.hits[m.source["id"]] += 1
+
+    # 2) 실제로 번역을 맡은 matcher + 재귀 안에서 쓰인 matcher
+    result = translator.translate(content, language, source)
+    if result["status"] == TRANSLATED:
+        winner = result["matcher"]["id"]
+        tally.wins[winner] += 1
+        tally.example(winner, pk, content)
+    _count_nested(result.get("translations"), tally)
+
+
+def _run_range(pk_range: tuple[int, int]) -> _Tally:
+    translator, language, top_k = _worker
+    tally = _Tally(top_k)
+    qs = TranslationData.objects.filter(pk__gte=pk_range[0], pk__lt=pk_range[1]).order_by("pk")
+    last_pk = pk_range[0] - 1
+    while True:
+        rows = list(qs.filter(pk__gt=last_pk).values_list("pk", "source__name", "content")[:FETCH])
+        if not rows:
+            return tally
+        for pk, source, content in rows:
+            evaluate_row(translator, language, pk, source, content, tally)
+        last_pk = rows[-1][0]
+
+
+# ────────────────────────────────────────────────────────
+# 공개 API
+# ────────────────────────────────────────────────────────
+def compute_matcher_stats(*, workers: int = 1, chunk: int = DEFAULT_CHUNK,
+                          top_k: int = DEFAULT_TOP_K, progress=None) -> _Tally:
+    """전체 코퍼스 집계 후 MatcherStats 교체 (모든 matcher 한 행씩 — 안 쓰인 것도 0 으로)"""
+    matchers = matcher_dicts()
+    generation = read_generation()
+    ranges = plan_ranges(chunk)
+
+    total = _Tally(top_k)
+    for n, (_, tally) in enumerate(run_ranges(_run_range, ranges, workers=workers,
+                                              initializer=_init_worker, initargs=(matchers, top_k)), 1):
+        total.merge(tally)
+        if progress is not None:
+            progress(n, len(ranges))
+
+    now = timezone.now()
+    ids = set(Matcher.objects.values_list("pk", flat=True))       # 계산 중 삭제된 matcher 제외
+    rows = [
+        MatcherStats(matcher_id=m["id"], hits=total.hits[m["id"]], wins=total.wins[m["id"]],
+                     shadowed=max(total.hits[m["id"]] - total.wins[m["id"]], 0),
+                     nested=total.nested[m["id"]], examples=total.examples_of(m["id"]),
+                     generation=generation, computed_at=now)
+        for m in matchers if m["id"] in ids
+    ]
+    with transaction.atomic():
+        MatcherStats.objects.all().delete()
+        MatcherStats.objects.bulk_create(rows, batch_size=FETCH)
+    return total
@@ -0,0 +1,135 @@
+# core/impact.py
+"""
+matcher 저장 전 영향 분석 — 어떤 TranslationData 의 번역이 바뀌는지
+
+• 후보: 바뀐 matcher 의 category(이전/이후) + 그것을 groups 로 참조하는 category 의 행
+  (Source 를 거쳐 (source, status) 인덱스로 category 별 pk 구간 조회, 후보 수는 Source.rows)
+• raw matcher 만 바뀐 category 는 raw 문자열 그 자체만 영향 → (source, content_digest) 유니크 인덱스로 바로 찾음
+• 현재 DB 의 matcher 목록 vs 수정본으로 바꾼 목록, 두 Translator 로 전/후 비교
+• budget(초)을 넘기면 멈추고 complete=False — 어드민에서 바로 돌려도 응답이 늦지 않게
+"""
+import time
+
+from django.conf import settings
+
+from .models import Matcher, Source, TranslationData, content_digest
+from .status import affected_categories
+from .translator import TRANSLATED, Translator, get_translator
+from .views import _to_dict, matcher_dicts
+
+CHUNK = 500
+KINDS = ("newly_translated", "newly_broken", "changed")
+
+
+def _replace(matchers: list[dict], new: dict | None, old_id: int | None) -> list[dict]:
+    """old_id 자리를 new 로 (없으면 끝에 추가, new=None 이면 삭제) — id 순서 유지"""
+    result = [m for m in matchers if old_id is None or m["id"] != old_id]
+    if new is not None:
+        result.append(new)
+        result.sort(key=lambda m: (m["id"] is None, m["id"] or 0))
+    return result
+
+
+def _raw_only(before: list[dict], after: list[dict], category: str) -> set[str] | None:
+    """category 안에서 바뀐 게 raw matcher 뿐이면 그 raw 문자열들, 아니면 None"""
+    old = {id(m): m for m in before if m["category"] == category}
+    new = {id(m): m for m in after if m["category"] == category}
+    changed = [m for k, m in old.items() if k not in new] + [m for k, m in new.items() if k not in old]
+    if all("raw" in m for m in changed):
+        return {m["raw"] for m in changed}
+    return None
+
+
+def _candidate_chunks(category: str, raws: set[str] | None):
+    """category(=source) 의 후보 행을 CHUNK 개씩 (pk, content)"""
+    qs = TranslationData.objects.filter(source__name=category)
+    if raws is not None:
+        yield list(qs.filter(content_digest__in=[content_digest(r) for r in raws]).values_list("pk", "content"))
+        return
+    last_pk = 0
+    while True:
+        rows = list(qs.filter(pk__gt=last_pk).order_by("pk").values_list("pk", "content")[:CHUNK])
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1][0]
+
+
+def analyze(matcher: Matcher | None, *, old_id: int | None = None,
+            budget: float | None = None, limit: int = 50) -> dict:
+    """
+    matcher: 저장하려는 (아직 저장 안 된) 인스턴스, None 이면 old_id 삭제
+    old_id : 수정 중인 기존 matcher pk (새로 추가면 None)
+    반환: {"categories", "candidates", "scanned", "complete", "elapsed",
+           "counts": {종류: 개수}, 종류: [{"id","source","content","before","after",...}]}
+    """
+    start = time.monotonic()
+    budget = getattr(settings, "MATCHER_IMPACT_BUDGET", 3.0) if budget is None else budget
+    deadline = start + budget
+
+    before = matcher_dicts()
+    new = _to_dict(matcher) if matcher is not None else None
+    after = _replace(before, new, old_id)
+
+    roots = {m["category"] for m in before if m["id"] == old_id}
+    if new is not None:
+        roots.add(new["category"])
+    categories = affected_categories(after, roots) | affected_categories(before, roots)
+
+    language = getattr(settings, "TRANSLATION_STATUS_LANGUAGE", "ko")
+    old_translator, new_translator = get_translator(), Translator(after)
+
+    report = {"categories": sorted(categories), "candidates": 0, "scanned": 0, "complete": True,
+              "counts": dict.fromkeys(KINDS, 0), **{k: [] for k in KINDS},
+              # JS 처럼 컴파일 안 되는 정규식은 통째로 빠진다 → 미리 알려 준다
+              "error": next((e for m, e in new_translator.errors if m is new), None)}
+
+    # 직접 바뀐 category 부터 (raw 만 바뀌었으면 해당 행만)
+    plan = []
+    for category in sorted(categories, key=lambda c: (c not in roots, c)):
+        raws = _raw_only(before, after, category) if category in roots else None
+        plan.append((category, raws))
+        if raws is not None:
+            report["candidates"] += TranslationData.objects.filter(
+                source__name=category, content_digest__in=[content_digest(r) for r in raws]).count()
+        else:                               # category 전체 → 세지 않고 Source.rows
+            report["candidates"] += sum(Source.objects.filter(name=category).values_list("rows", flat=True))
+
+    for category, raws in plan:
+        for rows in _candidate_chunks(category, raws):
+            for pk, content in rows:
+                old = old_translator.translate(content, language, category)
+                cur = new_translator.translate(content, language, category)
+                if old["translation"] == cur["translation"] and old["totalStatus"] == cur["totalStatus"]:
+                    continue
+                if cur["totalStatus"] == TRANSLATED and old["totalStatus"] != TRANSLATED:
+                    kind = "newly_translated"
+                elif old["totalStatus"] == TRANSLATED and cur["totalStatus"] != TRANSLATED:
+                    kind = "newly_broken"
+                else:
+                    kind = "changed"
+                report["counts"][kind] += 1
+                if len(report[kind]) < limit:
+                    report[kind].append({
+                        "id": pk, "source": category, "content": content,
+                        "before": old["translation"], "after": cur["translation"],
+                        "before_status": old["totalStatus"], "after_status": cur["totalStatus"],
+                    })
+            report["scanned"] += len(rows)
+            if time.monotonic() > deadline:
+                report["complete"] = False
+                break
+        if not report["complete"]:
+            break
+
+    report["elapsed"] = time.monotonic() - start
+    return report
+
+
+def summarize(report: dict) -> str:
+    """어드민 메시지 한 줄"""
+    c = report["counts"]
+    text = (f"Impact: +{c['newly_translated']:,} translated, -{c['newly_broken']:,} broken, "
+            f"{c['changed']:,} changed ({report['scanned']:,}/{report['candidates']:,} rows in "
+            f"{', '.join(report['categories']) or '–'}")
+    return text + (", time budget reached)" if not report["complete"] else ")")
@@ -0,0 +1,363 @@
+# core/jsregex.py
+"""
+JavaScript RegExp → Python re 호환 계층 (core/translator.py 용)
+
+matcher 의 regex 는 브라우저(translator.js)의 RegExp 기준으로 작성되므로
+Python re 와 뜻이 다른 부분만 골라 바꿔 컴파일한다.
+
+• (?<name>…) / \\k<name>         → (?P<name>…) / (?P=name)
+• \\d \\w \\b (ASCII 기준)          → [0-9] / [A-Za-z0-9_] / ASCII 단어 경계
+• .  (줄바꿈 4종 제외)            → [^\\n\\r\\u2028\\u2029]   (s 플래그면 그대로)
+• $  (m 없으면 입력 끝만)         → \\Z  /  ^ $ (m) 도 줄바꿈 4종 기준
+• \\p{L} \\p{Script=Hangul} 등 (u) → unicodedata 로 만든 문자 범위
+• [^] / []                      → 아무 문자 / 매치 불가
+• \\u{…} \\cX \\/ 같은 JS 전용 이스케이프
+• 플래그: i m s 는 대응, g 는 JsRegex.global, y 는 시작 위치 고정, u v d 는 무시
+
+Python 에서 표현할 수 없는 패턴(가변 길이 lookbehind 등)은 re.error 를 그대로 낸다.
+(translator.js 도 컴파일 실패한 matcher 는 건너뛴다)
+"""
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+_WORD = "A-Za-z0-9_"
+_LINE_TERMINATORS = "\\n\\r\\u2028\\u2029"
+_NOT_LINE_TERMINATOR = f"[^{_LINE_TERMINATORS}]"
+
+_WORD_BOUNDARY = f"(?:(?<=[{_WORD}])(?![{_WORD}])|(?<![{_WORD}])(?=[{_WORD}]))"
+_NOT_WORD_BOUNDARY = f"(?:(?<=[{_WORD}])(?=[{_WORD}])|(?<![{_WORD}])(?![{_WORD}]))"
+
+# 클래스 밖 / 안에서의 ASCII 축약 문자
+_SHORTHAND = {"d": "[0-9]", "D": "[^0-9]", "w": f"[{_WORD}]", "W": f"[^{_WORD}]"}
+_SHORTHAND_IN_CLASS = {"d": "0-9", "w": _WORD}
+
+# Script=… 는 자주 쓰는 것만 (블록 범위 근사)
+_SCRIPTS = {
+    "hangul": "ᄀ-ᇿ㄰-㆏ꥠ-꥿가-힯ힰ-퟿ﾠ-ￜ",
+    "han": "⺀-⿟々〇〡-〩〸-〻㐀-䶿一-鿿"
+           "豈-﫿\U00020000-\U0003134f",
+    "hiragana": "ぁ-ゟ",
+    "katakana": "゠-ヿㇰ-ㇿｦ-ﾟ",
+    "latin": "A-Za-zªºÀ-ÖØ-öø-ɏḀ-ỿ",
+    "greek": "Ͱ-ͳ͵-ͷͺ-ͽ΄ΆΈ-ϡϰ-Ͽἀ-῿",
+    "cyrillic": "Ѐ-ԯᲀ-᲏ⷠ-ⷿꙀ-ꚟ",
+}
+_SCRIPT_ALIASES = {"hang": "hangul", "hani": "han", "hira": "hiragana", "kana": "katakana",
+                   "latn": "latin", "grek": "greek", "cyrl": "cyrillic"}
+_CATEGORY_ALIASES = {
+    "letter": "L", "uppercase_letter": "Lu", "lowercase_letter": "Ll", "number": "N",
+    "decimal_number": "Nd", "digit": "Nd", "punctuation": "P", "punct": "P", "symbol": "S",
+    "separator": "Z", "mark": "M", "combining_mark": "M", "other": "C", "control": "Cc",
+}
+
+
+class JsRegex:
+    """컴파일된 패턴 + JS 전용 플래그 (g: 전체 치환 / match 결과 형태)"""
+    __slots__ = ("source", "flags", "compiled", "global_", "sticky")
+
+    def __init__(self, source: str, flags: str, compiled: re.Pattern):
+        self.source = source
+        self.flags = flags
+        self.compiled = compiled
+        self.global_ = "g" in flags
+        self.sticky = "y" in flags
+
+    def __repr__(self):
+        return f"/{self.source}/{self.flags}"
+
+
+@lru_cache(maxsize=None)
+def _category_ranges(prop: str) -> str:
+    """\\p{…} → 문자 클래스 안에 넣을 범위 문자열 (처음 한 번만 계산)"""
+    name, _, value = prop.partition("=")
+    if value:
+        key = name.strip().lower()
+        if key in ("script", "sc", "script_extensions", "scx"):
+            script = value.strip().lower()
+            script = _SCRIPT_ALIASES.get(script, script)
+            if script not in _SCRIPTS:
+                raise re.error(f"unsupported script: {value}")
+            return _SCRIPTS[script]
+        if key not in ("general_category", "gc"):
+            raise re.error(f"unsupported property: {prop}")
+        prop = value
+    cat = _CATEGORY_ALIASES.get(prop.strip().lower(), prop.strip())
+    if not (1 <= len(cat) <= 2 and cat[0] in "LMNPSZC"):
+        raise re.error(f"unsupported property: {prop}")
+
+    parts, start, prev = [], None, None
+    for cp in range(sys.maxunicode + 1):
+        hit = unicodedata.category(chr(cp)).startswith(cat)
+        if hit and start is None:
+            start = cp
+        elif not hit and start is not None:
+            parts.append((start, prev))
+            start = None
+        prev = cp
+    if start is not None:
+        parts.append((start, prev))
+    return "".join(
+        _escape_cp(a) if a == b else f"{_escape_cp(a)}-{_escape_cp(b)}" for a, b in parts
+    )
+
+
+def _escape_cp(cp: int) -> str:
+    return f"\\U{cp:08x}"
+
+
+def _read_braced(src: str, i: int) -> tuple[str, int]:
+    """src[i] == '{' → ('…', '}' 다음 위치)"""
+    end = src.find("}", i)
+    if end == -1:
+        raise re.error("unterminated \\p{…} / \\u{…}", src, i)
+    return src[i + 1:end], end + 1
+
+
+def _escape(src: str, i: int, in_class: bool, unicode: bool) -> tuple[str, int]:
+    """src[i] == '\\\\' 인 이스케이프 하나 번역 → (python 조각, 다음 위치)"""
+    if i + 1 >= len(src):
+        raise re.error("trailing backslash", src, i)
+    c = src[i + 1]
+    j = i + 2
+    if c in "dw" and in_class:
+        return _SHORTHAND_IN_CLASS[c], j
+    if c in "dDwW" and not in_class:
+        return _SHORTHAND[c], j
+    if c in "DW":
+        return f"\\{c}", j                 # 클래스 안 부정형은 근사 (Unicode 기준)
+    if c == "b":
+        return ("\\x08" if in_class else _WORD_BOUNDARY), j
+    if c == "B" and not in_class:
+        return _NOT_WORD_BOUNDARY, j
+    if c in "pP" and j < len(src) and src[j] == "{" and unicode:   # u 없으면 그냥 "p"
+        prop, j = _read_braced(src, j)
+        ranges = _category_ranges(prop)
+        if in_class:
+            if c == "P":
+                raise re.error("\\P{…} inside a character class is not supported", src, i)
+            return ranges, j
+        return (f"[^{ranges}]" if c == "P" else f"[{ranges}]"), j
+    if c == "u":
+        if j < len(src) and src[j] == "{" and unicode:
+            hexa, j = _read_braced(src, j)
+            return _escape_cp(int(hexa, 16)), j
+        if re.fullmatch(r"[0-9A-Fa-f]{4}", src[j:j + 4]):
+            return f"\\u{src[j:j + 4]}", j + 4
+        return "u", j                      # JS(비 u 모드): 잘못된 \u 는 문자 'u'
+    if c == "x":
+        if re.fullmatch(r"[0-9A-Fa-f]{2}", src[j:j + 2]):
+            return f"\\x{src[j:j + 2]}", j + 2
+        return "x", j
+    if c == "c" and j < len(src) and src[j].isascii() and src[j].isalpha():
+        return f"\\x{ord(src[j]) % 32:02x}", j + 1
+    if c == "k" and j < len(src) and src[j] == "<" and not in_class:
+        end = src.find(">", j)
+        if end != -1:
+            return f"(?P={src[j + 1:end]})", end + 1
+    if c == "0" and not (j < len(src) and src[j].isdigit()):
+        return "\\x00", j
+    if c.isdigit():
+        # 역참조 \1 … (클래스 안이면 8진수) — re 와 뜻이 같다
+        k = j
+        while k < len(src) and src[k].isdigit():
+            k += 1
+        return src[i:k], k
+    if c in "fnrtvsS":
+        return ("\\x0b" if c == "v" else f"\\{c}"), j
+    if c.isascii() and c.isalpha():
+        return c, j                         # JS(비 u 모드): 모르는 문자 이스케이프는 그 문자
+    return re.escape(c), j
+
+
+def translate_pattern(src: str, flags: str = "") -> str:
+    """JS 패턴 문자열 → Python re 패턴 문자열"""
+    dotall = "s" in flags
+    multiline = "m" in flags
+    unicode = "u" in flags or "v" in flags
+    out = []
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if c == "\\":
+            piece, i = _escape(src, i, False, unicode)
+            out.append(piece)
+            continue
+        if c == "[":
+            piece, i = _translate_class(src, i, unicode)
+            out.append(piece)
+            continue
+        if c == "(" and src.startswith("(?<", i) and not src.startswith(("(?<=", "(?<!"), i):
+            out.append("(?P<")
+            i += 3
+            continue
+        if c == "." and not dotall:
+            out.append(_NOT_LINE_TERMINATOR)
+        elif c == "$":
+            out.append(f"(?=[{_LINE_TERMINATORS}]|\\Z)" if multiline else "\\Z")
+        elif c == "^" and multiline:
+            out.append(f"(?:(?<=[{_LINE_TERMINATORS}])|\\A)")
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def _translate_class(src: str, i: int, unicode: bool) -> tuple[str, int]:
+    """src[i] == '[' → 문자 클래스 하나"""
+    j = i + 1
+    negate = j < len(src) and src[j] == "^"
+    if negate:
+        j += 1
+    if j < len(src) and src[j] == "]":      # JS: [] = 매치 불가, [^] = 아무 문자
+        return ("(?s:.)" if negate else "(?!)"), j + 1
+
+    body = []
+    while j < len(src) and src[j] != "]":
+        c = src[j]
+        if c == "\\":
+            piece, j = _escape(src, j, True, unicode)
+            body.append(piece)
+            continue
+        # Python 이 집합 연산/중첩으로 볼 수 있는 문자는 이스케이프
+        if c == "[" or (c in "&~|-" and j + 1 < len(src) and src[j + 1] == c):
+            body.append("\\" + c)
+        else:
+            body.append(c)
+        j += 1
+    if j >= len(src):
+        raise re.error("unterminated character set", src, i)
+    return ("[^" if negate else "[") + "".join(body) + "]", j + 1
+
+
+_compiled: dict[tuple[str, str], JsRegex] = {}
+
+
+def compile_js(source: str, flags: str = "") -> JsRegex:
+    """JS RegExp(source, flags) 에 해당하는 JsRegex (같은 패턴은 한 번만 컴파일)"""
+    key = (source, flags)
+    cached = _compiled.get(key)
+    if cached is not None:
+        return cached
+    unknown = set(flags) - set("dgimsuvy")
+    if unknown or len(set(flags)) != len(flags):
+        raise re.error(f"invalid flags: {flags!r}")
+
+    pattern = translate_pattern(source, flags)
+    if "y" in flags:
+        pattern = f"\\A(?:{pattern})"
+    re_flags = (re.IGNORECASE if "i" in flags else 0) | (re.DOTALL if "s" in flags else 0)
+    result = _compiled[key] = JsRegex(source, flags, re.compile(pattern, re_flags))
+    return result
+
+
+# ────────────────────────────────────────────────────────
+# String.prototype.match / replace
+# ────────────────────────────────────────────────────────
+def js_match(rx: JsRegex, text: str) -> list | None:
+    """
+    text.match(rx) — g 가 없으면 [전체, 그룹1, …] (참여 안 한 그룹은 None),
+    g 가 있으면 전체 매치 문자열 목록 (없으면 None)
+    """
+    if rx.global_:
+        found = [m.group(0) for m in rx.compiled.finditer(text)]
+        return found or None
+    m = rx.compiled.search(text)
+    if m is None:
+        return None
+    return [m.group(0), *m.groups()]
+
+
+_TEMPLATE_TOKEN = re.compile(r"\$(\$|&|`|'|\d{1,2}|<[^>]*>)")
+
+
+@lru_cache(maxsize=65536)
+def _parse_template(template: str, group_count: int, names: tuple) -> tuple:
+    """
+    치환 문자열의 $1 / $& / $<name> … 을 미리 해석
+    → (글자 그대로 str | 그룹 번호 int | ("&",) ("`",) ("'",) ("name", 이름)) 튜플
+    """
+    parts, pos = [], 0
+    for m in _TEMPLATE_TOKEN.finditer(template):
+        tok = m.group(1)
+        if tok == "$":
+            piece = "$"
+        elif tok in ("&", "`", "'"):
+            piece = (tok,)
+        elif tok.startswith("<"):
+            if not names:                      # 이름 있는 그룹이 없으면 글자 그대로
+                continue
+            piece = ("name", tok[1:-1])
+        else:
+            # $nn: 두 자리가 유효하면 두 자리, 아니면 한 자리 + 숫자 글자
+            num, rest = int(tok), ""
+            if len(tok) == 2 and not (1 <= num <= group_count):
+                num, rest = int(tok[0]), tok[1]
+            if not (1 <= num <= group_count):
+                continue                       # 없는 그룹 → 글자 그대로
+            piece = num
+            if rest:
+                parts.append(template[pos:m.start()])
+                parts.extend((piece, rest))
+                pos = m.end()
+                continue
+        parts.append(template[pos:m.start()])
+        parts.append(piece)
+        pos = m.end()
+    parts.append(template[pos:])
+    return tuple(p for p in parts if p != "")
+
+
+def _expand(parts: tuple, m: re.Match, text: str) -> str:
+    out = []
+    for p in parts:
+        if isinstance(p, int):
+            out.append(m.group(p) or "")
+        elif isinstance(p, str):
+            out.append(p)
+        elif p[0] == "name":
+            try:
+                out.append(m.group(p[1]) or "")
+            except IndexError:
+                pass
+        elif p[0] == "&":
+            out.append(m.group(0))
+        elif p[0] == "`":
+            out.append(text[:m.start()])
+        else:
+            out.append(text[m.end():])
+    return "".join(out)
+
+
+def js_replace(rx: JsRegex, text: str, template: str) -> str:
+    """text.replace(rx, template) — g 면 전체, 아니면 첫 매치만"""
+    compiled = rx.compiled
+    parts = _parse_template(template, compiled.groups, tuple(compiled.groupindex))
+    count = 0 if rx.global_ else 1
+    if all(isinstance(p, str) for p in parts):
+        literal = "".join(parts)             # 특수 토큰 없음 → 그대로
+        return compiled.sub(lambda m: literal, text, count=count)
+    return compiled.sub(lambda m: _expand(parts, m, text), text, count=count)
+
+
+def js_replace_match(rx: JsRegex, text: str, template: str, m: re.Match) -> str:
+    """js_replace() 와 같지만 g 가 없으면 이미 찾은 첫 매치 m 을 재사용"""
+    if rx.global_:
+        return js_replace(rx, text, template)
+    compiled = rx.compiled
+    parts = _parse_template(template, compiled.groups, tuple(compiled.groupindex))
+    return text[:m.start()] + _expand(parts, m, text) + text[m.end():]
+
+
+def js_replace_string(text: str, needle: str, replacement: str) -> str:
+    """text.replace('needle', replacement) — 첫 위치만, $$ $& $` $' 해석"""
+    idx = text.find(needle)
+    if idx == -1:
+        return text
+    if "$" in replacement:
+        def sub(m):
+            tok = m.group(1)
+            return {"$": "$", "&": needle, "`": text[:idx], "'": text[idx + len(needle):]}.get(tok, m.group(0))
+        replacement = re.sub(r"\$(\$|&|`|')", sub, replacement)
+    return text[:idx] + replacement + text[idx + len(needle):]
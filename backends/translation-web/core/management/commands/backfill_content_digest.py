@@ -0,0 +1,129 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.batch import plan_ranges
+from core.models import TranslationData, content_digest
+
+BENCH = 1000    # 조회 시간 비교에 쓸 행 수
+
+
+def index_sizes(table: str) -> dict[str, int]:
+    """색인 이름 → 바이트 (MySQL InnoDB 통계, 다른 DB 는 {})"""
+    if connection.vendor != "mysql":
+        return {}
+    with connection.cursor() as cur:
+        cur.execute(f"ANALYZE TABLE {connection.ops.quote_name(table)}")
+        cur.fetchall()
+        cur.execute(
+            """
+            SELECT index_name, stat_value * @@innodb_page_size
+              FROM mysql.innodb_index_stats
+             WHERE database_name = DATABASE() AND table_name = %s AND stat_name = 'size'
+            """,
+            [table],
+        )
+        return {name: int(size) for name, size in cur.fetchall()}
+
+
+class Command(BaseCommand):
+    """
+    TranslationData.content_digest 채우기 — migrate core 0011 뒤 서비스 중에 돌리고, 끝나면 migrate (0012)
+    pk 구간마다 짧은 트랜잭션 (hex 열이 있으면 그것으로, 없으면 content 로 계산), 끝에 색인 크기·조회 시간 비교
+    """
+
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=5000, help="트랜잭션 하나가 맡는 pk 구간 크기")
+        parser.add_argument("--sleep", type=float, default=0.0,
+                            help="배치 사이에 쉬는 시간(초) — 서비스 부하·복제 지연 조절")
+
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        self.table = TranslationData._meta.db_table
+        self.qn = connection.ops.quote_name
+        with connection.cursor() as cur:
+            columns = {c.name for c in connection.introspection.get_table_description(cur, self.table)}
+        self.has_hex = "content_hash" in columns       # 0012 를 적용하기 전이면 아직 있다
+        # 0011 시점에는 source 가 아직 문자열 열 (0013/0014 에서 source_id FK) — 모델이 아니라 실제 열 이름으로
+        self.source_col = "source_id" if "source_id" in columns else "source"
+        before = index_sizes(self.table)
+
+        ranges = plan_ranges(max(opts["batch"], 1))
+        filled, start_ts = 0, time.time()
+        for n, (lo, hi) in enumerate(ranges, 1):
+            filled += self._fill(lo, hi)
+            elapsed = max(time.time() - start_ts, 1e-9)
+            self.stdout.write(f"\r▶ 구간 {n:,}/{len(ranges):,} ({n / len(ranges) * 100:5.1f} %) "
+                              f"▸ {filled:,}행 ▸ {filled / elapsed:,.0f} rows/s", ending="")
+            if opts["sleep"]:
+                time.sleep(opts["sleep"])
+        self.stdout.write(self.style.SUCCESS(
+            f"\n완료! {filled:,}행 채움, 경과 {time.time() - start_ts:,.1f}초"))
+
+        self._report(before, index_sizes(self.table))
+
+    # --------------------------------------------------
+    def _fill(self, lo, hi):
+        """[lo, hi) 의 빈 digest 를 채운다 → 채운 행 수"""
+        table, qn = self.qn(self.table), self.qn
+        done = 0
+        with transaction.atomic(), connection.cursor() as cur:
+            if self.has_hex and connection.vendor == "mysql":
+                # 서버에서 바로 UNHEX — 값이 네트워크를 오가지 않는다
+                cur.execute(
+                    f"UPDATE {table} SET {qn('content_digest')} = UNHEX({qn('content_hash')}) "
+                    f"WHERE {qn('id')} >= %s AND {qn('id')} < %s "
+                    f"AND {qn('content_digest')} IS NULL AND {qn('content_hash')} IS NOT NULL",
+                    [lo, hi],
+                )
+                done += cur.rowcount
+            hex_col = qn("content_hash") if self.has_hex else "NULL"
+            # hex 가 없는 행만 content 를 읽는다
+            cur.execute(
+                f"SELECT {qn('id')}, {hex_col}, CASE WHEN {hex_col} IS NULL THEN {qn('content')} END "
+                f"FROM {table} WHERE {qn('id')} >= %s AND {qn('id')} < %s AND {qn('content_digest')} IS NULL",
+                [lo, hi],
+            )
+            rows = [
+                TranslationData(pk=pk, content_digest=bytes.fromhex(hex_) if hex_ else content_digest(content))
+                for pk, hex_, content in cur.fetchall()
+            ]
+            if rows:
+                TranslationData.objects.bulk_update(rows, ["content_digest"], batch_size=1000)
+        return done + len(rows)
+
+    # --------------------------------------------------
+    def _report(self, before, after):
+        if before or after:
+            self.stdout.write("색인 크기 (MB, 채우기 전 → 후):")
+            for name in sorted(set(before) | set(after)):
+                self.stdout.write(f"  {name:<24}{before.get(name, 0) / 1e6:>10,.1f} → {after.get(name, 0) / 1e6:,.1f}")
+
+        # 같은 행들을 (source, digest) 와 (source, hex) 로 찾아 본다
+        table, qn, source_col = self.qn(self.table), self.qn, self.qn(self.source_col)
+        timings = {}
+        with connection.cursor() as cur:
+            cur.execute(f"SELECT {source_col}, {qn('content_digest')} FROM {table} "
+                        f"WHERE {qn('content_digest')} IS NOT NULL ORDER BY {qn('id')} LIMIT %s", [BENCH])
+            sample = cur.fetchall()
+            if not sample:
+                return
+            t0 = time.perf_counter()
+            for source, digest in sample:
+                cur.execute(f"SELECT 1 FROM {table} WHERE {source_col} = %s AND {qn('content_digest')} = %s",
+                            [source, digest])
+                cur.fetchall()
+            timings["content_digest (16 B)"] = time.perf_counter() - t0
+            if self.has_hex:
+                t0 = time.perf_counter()
+                for source, digest in sample:
+                    cur.execute(f"SELECT 1 FROM {table} WHERE {source_col} = %s AND {qn('content_hash')} = %s",
+                                [source, bytes(digest).hex()])
+                    cur.fetchall()
+                timings["content_hash (hex 32)"] = time.perf_counter() - t0
+        self.stdout.write(f"조회 {len(sample):,}회 평균:")
+        for name, sec in timings.items():
+            self.stdout.write(f"  {name:<24}{sec / len(sample) * 1e6:>10,.1f} µs")
@@ -0,0 +1,42 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.coverage import DEFAULT_CHUNK, MatchersChanged, compute_coverage
+
+
+class Command(BaseCommand):
+    """source 별 번역 커버리지 집계 → CoverageSummary (중단되면 체크포인트부터 재개)"""
+
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="평가 프로세스 수 (1 이면 현재 프로세스에서)")
+        parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK,
+                            help="한 작업이 맡는 pk 구간 크기")
+        parser.add_argument("--restart", action="store_true",
+                            help="체크포인트를 무시하고 처음부터")
+
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        start_ts = time.time()
+
+        def progress(done, total):
+            self.stdout.write(f"\r▶ 구간 {done:,}/{total:,} ({done / total * 100:5.1f} %)", ending="")
+
+        try:
+            counts = compute_coverage(workers=max(opts["workers"], 1), chunk=max(opts["chunk"], 1),
+                                      restart=opts["restart"], progress=progress)
+        except MatchersChanged as e:
+            raise CommandError(str(e))
+
+        per_status = {}
+        for (_, status), n in counts.items():
+            per_status[status or "pending"] = per_status.get(status or "pending", 0) + n
+        summary = ", ".join(f"{k} {v:,}" for k, v in sorted(per_status.items()))
+        sources = len({source for source, _ in counts})
+        self.stdout.write(self.style.SUCCESS(
+            f"\n완료! source {sources:,}개, {summary or '행 없음'}, 경과 {time.time() - start_ts:,.1f}초"
+        ))
@@ -1,154 +1,313 @@
-import json
-import time
 import hashlib
-from itertools import islice
+import os
+import time
+from collections import Counter
+from contextlib import nullcontext
+from itertools import batched
 from pathlib import Path
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import F
 
-from core.models import TranslationData
+from core.batching import bulk_signals
+from core.models import PackManifest, Source, TranslationData, adjust_row_counts
+from core.packs import hashed_batches, pack_files, source_name
+from core.packsync import HashSpill, delete_ids, samples, stale_ids
+from core.rebuild import read_generation
+from core.status import recompute
+from core.translator import get_translator
 
 # ────────────────────────────────────────────────────────
 # 튜닝 파라미터
 # ────────────────────────────────────────────────────────
-BATCH      = 1000    # bulk_create 한 번당 레코드 수
-IN_CHUNK   = 900     # content__in 분할 크기 (SQLite 999 제한 대비)
+BATCH      = 1000    # 작업자 → 쓰기 한 번에 넘기는 레코드 수 (메모리도 이 정도만 잡는다)
+IN_CHUNK   = 900     # content_digest__in 분할 크기 (SQLite 999 제한 대비)
 LOG_EVERY  = 1.0     # 진행률 최소 간격(초)
+INSERT_RETRIES = 3   # 조회와 INSERT 사이에 다른 곳에서 같은 행이 들어와 제약 위반 → 다시 조회해 재시도
 # ────────────────────────────────────────────────────────
 
 
 class Command(BaseCommand):
-    """packs/*.json → TranslationData 고속 삽입 + 진행률"""
+    """
+    packs/*.json|ndjson|jsonl[.gz|.zst] → TranslationData 스트리밍 삽입 + 진행률 (읽은 바이트 기준)
+    PackManifest 에 파일마다 크기·mtime·sha256·체크포인트 → 바뀌지 않은 파일은 건너뛰고, 중단된 파일은 이어서
+    --sync: 모든 pack 을 읽어 pack 에서 사라진 행도 지운다 (--dry-run 이면 보고만)
+    """
 
     help = __doc__.strip()
 
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="파싱·해시 프로세스 수 (1 이면 현재 프로세스에서, 쓰기는 항상 현재 프로세스)")
+        parser.add_argument("--force", action="store_true",
+                            help="manifest 를 무시하고 모든 파일을 처음부터 다시 읽음")
+        parser.add_argument("--sync", action="store_true",
+                            help="pack 에 없는 행을 그 source 에서 삭제 (모든 파일을 읽음, 요약 웹훅 한 건)")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="아무것도 쓰지 않고 삽입·삭제될 수만 보고")
+
     # --------------------------------------------------
     @staticmethod
-    def _load_json(path: Path):
-        """JSON 파일 파싱. 실패하면 None."""
-        try:
-            with open(path, encoding="utf-8") as fp:
-                return json.load(fp)
-        except json.JSONDecodeError as e:
-            print(f"⚠️  {path.name}: JSONDecodeError pos {e.pos} → 건너뜀")
-            return None
+    def _plan(files, force, dry_run):
+        """
+        manifest 와 비교 → [(파일, manifest)] 중 읽어야 할 것만, 건너뛴 파일 수
+        크기·mtime 이 같으면 파일을 열지 않는다. 다르면 sha256 으로 내용이 정말 바뀌었는지 확인
+        """
+        manifests = PackManifest.objects.in_bulk([f.name for f in files], field_name="path")
+        todo, unchanged = [], 0
+        for f in files:
+            st = f.stat()
+            m = manifests.get(f.name) or PackManifest(path=f.name, size=-1, mtime_ns=0)
+            if force or (m.size, m.mtime_ns) != (st.st_size, st.st_mtime_ns):
+                with open(f, "rb") as fp:
+                    sha = hashlib.file_digest(fp, "sha256").hexdigest()
+                if force or sha != m.sha256:                 # 내용이 바뀜 → 처음부터 (중복은 해시로 걸러짐)
+                    m.records_done, m.completed, m.last_error = 0, False, ""
+                m.size, m.mtime_ns, m.sha256 = st.st_size, st.st_mtime_ns, sha
+                if not dry_run:
+                    m.save()
+            if m.completed:
+                unchanged += 1
+            else:
+                todo.append((f, m))
+        return todo, unchanged
 
     # --------------------------------------------------
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **opts):
         # packs 디렉터리 → 필요에 맞게 경로 조정
         packs_dir = (
                 Path(settings.BASE_DIR)
                 / "packs"
         )
 
-        json_files = sorted(packs_dir.glob("*.json"))
-        if not json_files:
+        files = pack_files(packs_dir)
+        if not files:
             self.stdout.write(
-                self.style.WARNING("packs 디렉터리에 JSON 파일이 없습니다.")
+                self.style.WARNING("packs 디렉터리에 pack 파일이 없습니다.")
             )
             return
 
-        # ── 1차 패스: 총 레코드 수 집계 ───────────────────
-        total_records = 0
-        for f in json_files:
-            data = self._load_json(f)
-            if data is None:
-                continue
-            recs = data if isinstance(data, list) else data.get("messages", [])
-            total_records += len(recs)
-
-        if total_records == 0:
-            self.stdout.write(
-                self.style.WARNING("삽입할 유효 레코드가 없습니다.")
-            )
+        sync, self.dry_run = opts["sync"], opts["dry_run"]
+        # --sync 는 source 의 해시 전체가 필요 → manifest 와 상관없이 모든 파일을 처음부터
+        todo, unchanged = self._plan(files, opts["force"] or sync, self.dry_run)
+        if not todo:
+            self.stdout.write(self.style.SUCCESS(f"바뀐 pack 없음 ({unchanged}개 파일 건너뜀)"))
             return
+        files = [f for f, _ in todo]
+        manifests = [m for _, m in todo]
+        resumed = sum(1 for m in manifests if m.records_done)
 
-        self.stdout.write(f"총 {total_records:,}개 레코드 삽입 시작…")
+        # 미리 세지 않는다 — 진행률은 디스크에서 읽은 바이트 / 전체 파일 크기
+        self.total_bytes = sum(f.stat().st_size for f in files) or 1
+        workers = max(opts["workers"], 1)
+        self.stdout.write(f"{len(files)}개 파일 ({self.total_bytes / 1e6:,.1f} MB) 삽입 시작… "
+                          f"(변경 없음 {unchanged}, 이어서 {resumed}, 파싱 작업자 {min(workers, len(files))})"
+                          + (" [dry-run]" if self.dry_run else ""))
 
-        # ── 2차 패스: 실제 삽입 ───────────────────────────
-        processed = 0
-        start_ts  = time.time()
-        next_log  = start_ts + LOG_EVERY
+        self.records  = 0                    # 읽은 레코드
+        self.inserted = 0                    # 새로 넣은 행 (dry-run 이면 넣을 행)
+        self.seconds  = dict.fromkeys(("parse", "hash", "lookup", "insert"), 0.0)
+        hashed        = 0
+        file_bytes    = {}                   # 파일 index → 지금까지 읽은 바이트 (여러 파일이 동시에 진행)
+        touched       = {source_name(f) for f, m in todo if m.records_done}   # 새 행 / 중단 전에 넣은 행 → 상태 계산
+        self.start_ts = time.time()
+        self.next_log = self.start_ts + LOG_EVERY
 
-        for f in json_files:
-            data = self._load_json(f)
-            if data is None:
-                continue
+        # --sync: source 별 pack digest 임시 파일, 남은 파일 수, 오류가 난 source, 결과
+        sources = [source_name(f) for f in files]
+        spills = {s: HashSpill() for s in sources} if sync else {}
+        remaining = Counter(sources)
+        broken = set()
+        self.report = []                     # (source, pack digest 수, 지울 pk 목록)
+        # source 이름 → Source pk, 파일마다 한 번 (dry-run 은 만들지 않음 → 없으면 None)
+        self.source_ids = self._resolve_sources(set(sources))
+
+        skips = [m.records_done for m in manifests]
+        scope = bulk_signals("Sync packs", atomic=False) if sync and not self.dry_run else nullcontext()
+        try:
+            with scope:
+                for batch in hashed_batches(files, workers=workers, batch_size=BATCH, skips=skips):
+                    source = sources[batch.index]
+                    self.records += batch.records
+                    hashed += len(batch.rows)
+                    self.seconds["parse"] += batch.parse_seconds
+                    self.seconds["hash"] += batch.hash_seconds
+                    if self.dry_run:
+                        self._count_new(self.source_ids[source], batch.rows)
+                    elif self._commit(self.source_ids[source], batch, manifests[batch.index]):
+                        touched.add(source)
+                    file_bytes[batch.index] = files[batch.index].stat().st_size if batch.done else batch.bytes_read
+                    if batch.error:
+                        broken.add(source)
+                        self.stdout.write("")
+                        self.stdout.write(self.style.WARNING(
+                            f"⚠️  {files[batch.index].name}: {batch.error.strip()} → 나머지 건너뜀 (앞부분은 삽입)"))
+                    if sync:
+                        spills[source].add(h for _, h in batch.rows)
+                        if batch.done:
+                            remaining[source] -= 1
+                            if not remaining[source]:
+                                self._sync_source(source, spills.pop(source), broken)
+                    self._progress(sum(file_bytes.values()))
+        finally:
+            for spill in spills.values():
+                spill.close()
 
-            source = f.stem                      # 파일 이름이 source
-            recs   = data if isinstance(data, list) else data.get("messages", [])
-
-            # 이미 존재하는 content 값 미리 조회
-            existing = set()
-            it = iter(recs)
-            chunk = list(islice(it, IN_CHUNK))
-            while chunk:
-                existing.update(
-                    TranslationData.objects.filter(
-                        source=source, content__in=chunk
-                    ).values_list("content", flat=True)
-                )
-                chunk = list(islice(it, IN_CHUNK))
-
-            # 배치 생성
-            batch = []
-            for text in recs:
-                if text in existing:
-                    continue
-
-                batch.append(
-                    TranslationData(
-                        source=source,
-                        content=text,
-                        content_hash=hashlib.md5(text.encode()).hexdigest(),
-                    )
-                )
-
-                if len(batch) >= BATCH:
-                    processed, next_log = self._flush(
-                        batch, processed, total_records, start_ts, next_log
-                    )
-                    batch.clear()
-
-            if batch:
-                processed, next_log = self._flush(
-                    batch, processed, total_records, start_ts, next_log
-                )
+        self._progress(sum(file_bytes.values()), final=True)
 
         # ── 요약 출력 ─────────────────────────────────────
-        elapsed = time.time() - start_ts
+        elapsed = max(time.time() - self.start_ts, 1e-9)
+        verb = "삽입 예정" if self.dry_run else "삽입"
         self.stdout.write(
             self.style.SUCCESS(
-                f"\n완료! {total_records:,}개 삽입, 경과 {elapsed:,.1f}초, "
-                f"평균 {total_records/elapsed:,.0f} rows/s"
+                f"\n완료! {self.records:,}개 읽음, {self.inserted:,}개 {verb}, 경과 {elapsed:,.1f}초, "
+                f"평균 {self.records/elapsed:,.0f} rows/s"
             )
         )
+        # 단계별 처리량 — parse / hash 는 작업자들의 시간 합, lookup / insert 는 쓰기 프로세스 시간
+        for stage, count in (("parse", self.records), ("hash", hashed),
+                             ("lookup", hashed), ("insert", self.inserted)):
+            sec = self.seconds[stage]
+            rate = f"{count / sec:,.0f} rows/s" if sec else "-"
+            self.stdout.write(f"  {stage:<7}{count:>12,} rows {sec:>9,.2f}s  {rate}")
+
+        if sync:
+            self._sync_report(set(sources))
+
+        # ── 새 행 번역 상태 계산 (아직 계산 안 된 행만) ─────
+        if touched and not self.dry_run and getattr(settings, "TRANSLATION_STATUS_AUTO", True):
+            counts = recompute(translator=get_translator(), generation=read_generation(),
+                               sources=touched, pending_only=True)
+            summary = ", ".join(f"{k} {v:,}" for k, v in sorted(counts.items()))
+            self.stdout.write(f"번역 상태 계산: {summary or '없음'}")
+
+    # --------------------------------------------------
+    def _resolve_sources(self, names):
+        """{이름: Source pk} — 행마다가 아니라 이름마다 한 번 (없는 이름은 dry-run 이 아니면 만든다)"""
+        ids = dict(Source.objects.filter(name__in=names).values_list("name", "pk"))
+        missing = names - ids.keys()
+        if missing and not self.dry_run:
+            Source.objects.bulk_create([Source(name=n) for n in sorted(missing)], ignore_conflicts=True)
+            ids = dict(Source.objects.filter(name__in=names).values_list("name", "pk"))
+        return {n: ids.get(n) for n in names}
+
+    def _sync_source(self, source, spill, broken):
+        """source 의 pack 을 다 읽었을 때: DB 와 비교해 사라진 행 삭제 (dry-run 이면 기록만)"""
+        try:
+            if source in broken:                         # digest 집합이 불완전 → 지우면 안 된다
+                self.report.append((source, spill.count, None))
+                return
+            source_id = self.source_ids[source]
+            ids = stale_ids(source_id, spill) if source_id is not None else []
+            self.report.append((source, spill.count, ids if self.dry_run else len(ids)))
+            if ids and not self.dry_run:
+                delete_ids(ids)
+        finally:
+            spill.close()
+
+    def _sync_report(self, pack_sources):
+        verb = "삭제 예정" if self.dry_run else "삭제"
+        self.stdout.write(f"sync ({verb}):")
+        total = 0
+        for source, count, stale in sorted(self.report):
+            if stale is None:
+                self.stdout.write(self.style.WARNING(f"  {source}: pack 읽기 오류 → 삭제 안 함"))
+                continue
+            n = len(stale) if isinstance(stale, list) else stale
+            total += n
+            self.stdout.write(f"  {source}: pack {count:,}개, {verb} {n:,}개")
+            if isinstance(stale, list):
+                for text in samples(stale):
+                    self.stdout.write(f"      - {text!r}")
+        self.stdout.write(self.style.SUCCESS(f"  합계 {verb} {total:,}개"))
+        orphans = list(Source.objects.filter(rows__gt=0).exclude(name__in=pack_sources)
+                       .values_list("name", flat=True))
+        if orphans:
+            self.stdout.write(f"  packs 에 파일이 없는 source (건드리지 않음): {', '.join(orphans)}")
 
     # --------------------------------------------------
     @transaction.atomic
-    def _flush(self, rows, processed, total_records, start_ts, next_log):
-        """bulk_create 후 진행률 표시; 다음 로그 시각을 반환."""
-        TranslationData.objects.bulk_create(
-            rows, batch_size=len(rows), ignore_conflicts=True
-        )
-        processed += len(rows)
+    def _commit(self, source_id, batch, manifest):
+        """배치 하나 삽입 + 같은 트랜잭션에서 체크포인트·Source.rows (새 행은 pending) 전진 → 넣은 행 수"""
+        inserted = self._insert(source_id, batch.rows) if batch.rows else 0
+        adjust_row_counts({(source_id, TranslationData.STATUS_PENDING): inserted})
+        fields = {"records_done": F("records_done") + batch.records}
+        if batch.done and not batch.retry:              # 형식 오류는 파일이 바뀌기 전까지 다시 읽어도 같다
+            fields.update(completed=True, last_error=batch.error.strip())
+        elif batch.retry:
+            fields["last_error"] = batch.error.strip()
+        PackManifest.objects.filter(pk=manifest.pk).update(**fields)
+        return inserted
 
-        now = time.time()
-        if now >= next_log or processed == total_records:
-            pct   = processed / total_records * 100
-            speed = processed / (now - start_ts)
-            eta   = (total_records - processed) / speed if speed else 0
-            m, s  = divmod(int(eta), 60)
+    def _new_rows(self, source_id, rows, *, locking=False):
+        """
+        (source, content_digest) unique 색인으로 이미 있는 digest 를 뺀 {digest: content}
+        locking → 잠그는 읽기 (MySQL REPEATABLE READ 에서도 방금 commit 된 행까지 보인다)
+        """
+        by_hash = {h: text for text, h in rows}          # 배치 안 중복 제거
+        if source_id is None:                            # dry-run 의 새 source → 전부 새 행
+            return by_hash
+        t0 = time.perf_counter()
+        existing = set()
+        for chunk in batched(by_hash, IN_CHUNK):
+            qs = TranslationData.objects.filter(source_id=source_id, content_digest__in=chunk)
+            if locking:
+                qs = qs.select_for_update()
+            existing.update(bytes(h) for h in qs.values_list("content_digest", flat=True))
+        self.seconds["lookup"] += time.perf_counter() - t0
+        return {h: text for h, text in by_hash.items() if h not in existing}
 
-            self.stdout.write(
-                f"\r▶ {processed:,}/{total_records:,} "
-                f"({pct:5.1f} %) ▸ {speed:,.0f} rows/s ▸ ETA {m:02d}:{s:02d}",
-                ending="",
-            )
-            if processed == total_records:
-                self.stdout.write("")  # 줄바꿈
-            next_log = now + LOG_EVERY
+    def _count_new(self, source_id, rows):
+        """dry-run — 넣을 행 수만 센다"""
+        if rows:
+            self.inserted += len(self._new_rows(source_id, rows))
 
-        return processed, next_log
+    def _insert(self, source_id, rows):
+        """
+        새 해시만 여러 행 INSERT → 넣은 행 수 (Source.rows·상태별 개수가 이 값으로 전진하므로 정확해야 한다)
+        ignore_conflicts 로 조용히 건너뛰지 않는다 — 그 사이 다른 곳에서 들어온 행이 있으면
+        savepoint 를 되돌리고 다시 조회해서 재시도
+        """
+        for attempt in range(INSERT_RETRIES):
+            new = self._new_rows(source_id, rows, locking=attempt > 0)
+            t1 = time.perf_counter()
+            objs = [
+                TranslationData(source_id=source_id, content=text, content_digest=h)
+                for h, text in new.items()
+            ]
+            try:
+                with transaction.atomic():
+                    if objs:
+                        TranslationData.objects.bulk_create(objs, batch_size=len(objs))
+            except IntegrityError:
+                if attempt + 1 == INSERT_RETRIES:
+                    raise
+                continue
+            finally:
+                self.seconds["insert"] += time.perf_counter() - t1
+            self.inserted += len(objs)
+            return len(objs)
+
+    # --------------------------------------------------
+    def _progress(self, done_bytes, final=False):
+        """진행률 표시 (LOG_EVERY 초마다, final 이면 항상)"""
+        now = time.time()
+        if not final and now < self.next_log:
+            return
+        elapsed = max(now - self.start_ts, 1e-9)
+        pct   = min(done_bytes / self.total_bytes, 1.0) * 100
+        speed = done_bytes / elapsed
+        eta   = (self.total_bytes - done_bytes) / speed if speed else 0
+        m, s  = divmod(int(max(eta, 0)), 60)
+
+        self.stdout.write(
+            f"\r▶ {done_bytes / 1e6:,.1f}/{self.total_bytes / 1e6:,.1f} MB "
+            f"({pct:5.1f} %) ▸ {self.records / elapsed:,.0f} rows/s ▸ "
+            f"{speed / 1e6:,.1f} MB/s ▸ ETA {m:02d}:{s:02d}",
+            ending="",
+        )
+        if final:
+            self.stdout.write("")  # 줄바꿈
+        self.next_log = now + LOG_EVERY
@@ -0,0 +1,39 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.hitstats import DEFAULT_CHUNK, DEFAULT_TOP_K, compute_matcher_stats
+from core.models import MatcherStats
+
+
+class Command(BaseCommand):
+    """matcher 별 코퍼스 hit / win / shadowed / nested 횟수와 예시 → MatcherStats"""
+
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="평가 프로세스 수 (1 이면 현재 프로세스에서)")
+        parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK,
+                            help="한 작업이 맡는 pk 구간 크기")
+        parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K,
+                            help="matcher 마다 저장할 예시 문자열 수")
+
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        start_ts = time.time()
+
+        def progress(done, total):
+            self.stdout.write(f"\r▶ 구간 {done:,}/{total:,} ({done / total * 100:5.1f} %)", ending="")
+
+        compute_matcher_stats(workers=max(opts["workers"], 1), chunk=max(opts["chunk"], 1),
+                              top_k=max(opts["top_k"], 0), progress=progress)
+
+        stats = MatcherStats.objects
+        dead = stats.filter(hits=0, nested=0).count()
+        shadowed = stats.filter(hits__gt=0, wins=0, nested=0).count()
+        self.stdout.write(self.style.SUCCESS(
+            f"\n완료! matcher {stats.count():,}개 — 안 쓰임 {dead:,}, 완전히 가려짐 {shadowed:,}, "
+            f"경과 {time.time() - start_ts:,.1f}초"
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.facets import rebuild
+
+
+class Command(BaseCommand):
+    """admin 목록 필터 개수(Source.rows, category·status FacetCount)를 원본에서 다시 세기"""
+
+    help = __doc__.strip()
+
+    def handle(self, *args, **opts):
+        counts = rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"완료! source {counts['source']:,}개, category {counts['category']:,}개, "
+            f"status {counts['status']:,}개"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.grouprefs import rebuild_refs
+
+
+class Command(BaseCommand):
+    """Matcher.groups 역색인(MatcherGroupRef) 전체 재작성"""
+
+    help = __doc__.strip()
+
+    def handle(self, *args, **opts):
+        count = rebuild_refs()
+        self.stdout.write(self.style.SUCCESS(f"완료! 참조 {count:,}개"))
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.coverage import ATTEMPTS, matcher_state, unchanged_since
+from core.models import TranslationData
+from core.prefilter import literal_report
+from core.status import recompute, save_index
+from core.translator import Translator
+
+LOG_EVERY = 1.0     # 진행률 최소 간격(초)
+PREFILTER_TOP = 10  # 사전 필터 통계를 보여 줄 category 수
+
+
+class Command(BaseCommand):
+    """TranslationData 번역 상태(status / matched_matcher) 재계산"""
+
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", action="append", default=None,
+                            help="이 source 만 (여러 번 지정 가능)")
+        parser.add_argument("--pending-only", action="store_true",
+                            help="아직 계산되지 않은 행만")
+
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        sources, pending_only = opts["source"], opts["pending_only"]
+        qs = base = TranslationData.objects.all()
+        if sources:
+            qs = base = qs.filter(source__name__in=sources)
+        if pending_only:
+            qs = qs.filter(status=TranslationData.STATUS_PENDING)
+        total = qs.count()
+        if total == 0:
+            self.stdout.write(self.style.WARNING("계산할 행이 없습니다."))
+            return
+
+        self.stdout.write(f"총 {total:,}개 행 상태 계산 시작…")
+        start_ts = time.time()
+        state = {"done": 0, "next_log": start_ts + LOG_EVERY}
+
+        def progress(n, counts):
+            state["done"] += n
+            now = time.time()
+            if now < state["next_log"] and state["done"] < total:
+                return
+            speed = state["done"] / max(now - start_ts, 1e-9)
+            m, s = divmod(int((total - state["done"]) / speed) if speed else 0, 60)
+            self.stdout.write(
+                f"\r▶ {state['done']:,}/{total:,} ({state['done'] / total * 100:5.1f} %) "
+                f"▸ {speed:,.0f} rows/s ▸ ETA {m:02d}:{s:02d}",
+                ending="",
+            )
+            state["next_log"] = now + LOG_EVERY
+
+        # 빌드 락은 matcher 를 읽을 때와 기준(index)을 남길 때만 — 그사이 재빌드가 있었으면 새 목록으로 다시
+        for _ in range(ATTEMPTS):
+            matchers, generation, signature = matcher_state()
+            translator = Translator(matchers, debug=True)
+            state["done"] = 0
+            counts = recompute(translator=translator, generation=generation,
+                               sources=sources, pending_only=pending_only, progress=progress)
+            with unchanged_since(generation, signature) as unchanged:
+                if unchanged:
+                    if not sources and not pending_only:
+                        save_index(matchers)
+                    break
+            self.stdout.write(self.style.WARNING("\n계산 중에 matcher 가 바뀌어 다시 계산합니다…"))
+            if pending_only:            # 방금 계산한 행은 더 이상 pending 이 아니다 → 고른 source 전체를 다시
+                pending_only, total = False, base.count()
+        else:
+            raise CommandError(f"계산하는 동안 matcher 가 계속 바뀌었습니다 ({ATTEMPTS}회) — 나중에 다시 실행하세요")
+
+        elapsed = time.time() - start_ts
+        summary = ", ".join(f"{k} {v:,}" for k, v in sorted(counts.items()))
+        self.stdout.write(self.style.SUCCESS(f"\n완료! {summary}, 경과 {elapsed:,.1f}초"))
+
+        # 사전 필터 효과 (건너뛴 정규식 실행 수 많은 순)
+        report = literal_report(matchers)
+        top = sorted(translator.prefilter_stats.items(), key=lambda kv: -kv[1][1])[:PREFILTER_TOP]
+        for category, (tried, skipped) in top:
+            row = report.get(category, {"regex": 0, "filtered": 0})
+            self.stdout.write(
+                f"  prefilter {category}: regex {row['filtered']:,}/{row['regex']:,} 색인, "
+                f"실행 {tried:,} / 건너뜀 {skipped:,} ({skipped / max(tried + skipped, 1) * 100:.1f} %)"
+            )
@@ -0,0 +1,73 @@
+import datetime
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.encodings import remove_compressed_siblings
+from core.snapshots import collect_garbage, store_snapshot
+
+
+class Command(BaseCommand):
+    """스냅샷 저장소 관리: 예전 translation_file_* 파일 가져오기 + 보관 정책 GC"""
+
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--import-legacy", action="store_true",
+                            help="build/translation_file_*.json|svg 를 저장소로 옮기고 원본 삭제")
+        parser.add_argument("--gc", action="store_true",
+                            help="SNAPSHOT_KEEP_LAST / SNAPSHOT_KEEP_DAYS 밖의 스냅샷 + 고아 파일 정리")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="--gc 와 함께: 지울 개수만 출력")
+
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        if opts["import_legacy"]:
+            self._import_legacy()
+        if opts["gc"]:
+            result = collect_garbage(dry_run=opts["dry_run"], sweep=True)
+            verb = "삭제 예정" if opts["dry_run"] else "삭제"
+            self.stdout.write(self.style.SUCCESS(
+                f"GC: 스냅샷 {result['snapshots']:,}개, blob {result['blobs']:,}개 {verb}"
+            ))
+
+    # --------------------------------------------------
+    def _import_legacy(self):
+        root = Path(settings.BUILD_ROOT)
+        # 오래된 것부터 넣어야 다음 스냅샷이 delta 로 이어진다
+        files = sorted(root.glob("translation_file_*.json"))
+        if not files:
+            self.stdout.write(self.style.WARNING("가져올 translation_file_*.json 이 없습니다."))
+            return
+
+        for json_path in files:
+            svg_path = json_path.with_suffix(".svg")
+            data = json_path.read_bytes()
+            try:
+                payload = json.loads(data)
+            except json.JSONDecodeError as e:
+                self.stdout.write(f"⚠️  {json_path.name}: JSONDecodeError pos {e.pos} → 건너뜀")
+                continue
+
+            try:
+                ts = datetime.datetime.strptime(json_path.stem[len("translation_file_"):], "%Y%m%d_%H%M%S")
+                created_at = timezone.make_aware(ts)
+            except ValueError:
+                created_at = datetime.datetime.fromtimestamp(json_path.stat().st_mtime, tz=datetime.timezone.utc)
+
+            snap = store_snapshot(
+                data,
+                svg_path.read_bytes() if svg_path.exists() else None,
+                generation=payload.get("generation", 0),
+                matcher_count=len(payload.get("matchers", [])),
+                created_at=created_at,
+            )
+            for p in (json_path, svg_path):
+                p.unlink(missing_ok=True)
+                remove_compressed_siblings(p)
+            self.stdout.write(f"▶ {json_path.name} → {snap.name} ({snap.json_blob.hash[:12]})")
+
+        self.stdout.write(self.style.SUCCESS(f"완료! {len(files):,}개 파일 가져옴"))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import WebhookMessage
+from core.outbox import deliver_pending, outbox_stats
+
+
+class Command(BaseCommand):
+    """Discord 웹훅 outbox 상태 확인 / 즉시 전송 / dead 재시도"""
+
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drain", action="store_true",
+                            help="지금 보낼 수 있는 메시지를 이 프로세스에서 전송")
+        parser.add_argument("--requeue", action="store_true",
+                            help="dead 메시지를 대기 상태로 되돌림 (시도 횟수 초기화)")
+
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        if opts["requeue"]:
+            count = WebhookMessage.objects.filter(status=WebhookMessage.STATUS_DEAD).update(
+                status=WebhookMessage.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now())
+            self.stdout.write(f"dead → pending: {count:,}개")
+        if opts["drain"]:
+            self.stdout.write(self.style.SUCCESS(f"전송: {deliver_pending():,}개"))
+
+        stats = outbox_stats()
+        self.stdout.write(
+            f"대기 {stats['pending']:,} (가장 오래된 {stats['oldest_pending_seconds'] or 0:,.0f}초) · "
+            f"dead {stats['dead']:,} · 24시간 전송 {stats['sent_24h']:,} · "
+            f"지연 p50 {stats['latency_p50'] or 0:.2f}s / p95 {stats['latency_p95'] or 0:.2f}s / "
+            f"max {stats['latency_max'] or 0:.2f}s"
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 12:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationdata',
+            name='matched_matcher',
+            field=models.ForeignKey(blank=True, db_constraint=False, editable=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.matcher'),
+        ),
+        migrations.AddField(
+            model_name='translationdata',
+            name='status',
+            field=models.CharField(blank=True, choices=[('', 'Pending'), ('translated', 'Translated'), ('part-translated', 'Part-translated'), ('untranslated', 'Untranslated')], db_index=True, default='', editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='translationdata',
+            name='status_generation',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='translationdata',
+            index=models.Index(fields=['source', 'status'], name='td_source_status'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_translationdata_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoverageSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('', 'Pending'), ('translated', 'Translated'), ('part-translated', 'Part-translated'), ('untranslated', 'Untranslated')], max_length=16)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+                ('generation', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ('source', 'status'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='coveragesummary',
+            constraint=models.UniqueConstraint(fields=('source', 'status'), name='uniq_coverage_source_status'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0 on 2026-10-18 12:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_coverage_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatcherStats',
+            fields=[
+                ('matcher', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='core.matcher')),
+                ('hits', models.PositiveIntegerField(db_index=True, default=0)),
+                ('wins', models.PositiveIntegerField(db_index=True, default=0)),
+                ('shadowed', models.PositiveIntegerField(db_index=True, default=0)),
+                ('nested', models.PositiveIntegerField(default=0)),
+                ('examples', models.JSONField(blank=True, default=list)),
+                ('generation', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
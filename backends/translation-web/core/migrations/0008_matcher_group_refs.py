@@ -0,0 +1,64 @@
+# Generated by Django 5.0 on 2026-10-18 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _refs(groups):
+    """core/grouprefs.group_refs 와 같은 규칙 (마이그레이션은 앱 코드에 의존하지 않는다)"""
+    found = []
+
+    def walk(g, position):
+        if isinstance(g, str):
+            if g and (position, g) not in found:
+                found.append((position, g))
+        elif isinstance(g, list):
+            for sub in g:
+                walk(sub, position)
+
+    for position, g in enumerate(groups if isinstance(groups, list) else ()):
+        walk(g, position)
+    return found
+
+
+def backfill(apps, schema_editor):
+    Matcher = apps.get_model("core", "Matcher")
+    MatcherGroupRef = apps.get_model("core", "MatcherGroupRef")
+    rows = [
+        MatcherGroupRef(matcher_id=pk, position=position, category=category)
+        for pk, groups in Matcher.objects.values_list("pk", "groups").iterator(chunk_size=1000)
+        for position, category in _refs(groups)
+    ]
+    MatcherGroupRef.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_matcher_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatcherGroupRef',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('category', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='matchergroupref',
+            name='matcher',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_refs', to='core.matcher'),
+        ),
+        migrations.AddIndex(
+            model_name='matchergroupref',
+            index=models.Index(fields=['category', 'matcher'], name='groupref_category'),
+        ),
+        migrations.AddConstraint(
+            model_name='matchergroupref',
+            constraint=models.UniqueConstraint(fields=('matcher', 'position', 'category'), name='uniq_group_ref'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_webhook_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PackManifest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('mtime_ns', models.BigIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('records_done', models.PositiveBigIntegerField(default=0)),
+                ('completed', models.BooleanField(default=False)),
+                ('last_error', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('path',),
+            },
+        ),
+    ]
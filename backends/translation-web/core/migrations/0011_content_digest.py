@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 13:05
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    확장 단계 — 16바이트 content_digest 를 nullable 로 추가하고 새 unique 제약을 건다.
+    서비스 중에 manage.py backfill_content_digest 로 채운 뒤 0012 (나머지 채우기 + hex 열 삭제)
+    """
+
+    dependencies = [
+        ('core', '0010_pack_manifest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationdata',
+            name='content_digest',
+            field=core.models.DigestField(editable=False, max_length=16, null=True),
+        ),
+        # 새 코드는 hex 를 쓰지 않는다 → 0012 전까지도 INSERT 가 되도록
+        migrations.AlterField(
+            model_name='translationdata',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=32, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='translationdata',
+            constraint=models.UniqueConstraint(fields=('source', 'content_digest'), name='uniq_source_digest'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0 on 2026-10-18 13:05
+
+import hashlib
+
+import core.models
+from django.db import migrations
+
+
+def backfill_rest(apps, schema_editor):
+    """backfill_content_digest 이후에 들어온 행 (또는 명령을 건너뛴 작은 DB) — pk 순서로 배치"""
+    TranslationData = apps.get_model("core", "TranslationData")
+    todo = TranslationData.objects.filter(content_digest__isnull=True).order_by("pk")
+    last_pk = 0
+    while True:
+        rows = list(todo.filter(pk__gt=last_pk).only("pk", "content", "content_hash")[:2000])
+        if not rows:
+            return
+        for row in rows:
+            row.content_digest = (bytes.fromhex(row.content_hash) if row.content_hash
+                                  else hashlib.md5(row.content.encode()).digest())
+        TranslationData.objects.bulk_update(rows, ["content_digest"])
+        last_pk = rows[-1].pk
+
+
+class Migration(migrations.Migration):
+    """축소 단계 — 남은 행을 채우고 hex 열과 그 제약을 지운다"""
+
+    dependencies = [
+        ('core', '0011_content_digest'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rest, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='translationdata',
+            name='uniq_source_hash',
+        ),
+        migrations.RemoveField(
+            model_name='translationdata',
+            name='content_hash',
+        ),
+        migrations.AlterField(
+            model_name='translationdata',
+            name='content_digest',
+            field=core.models.DigestField(editable=False, max_length=16),
+        ),
+    ]
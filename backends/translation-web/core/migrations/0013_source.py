@@ -0,0 +1,58 @@
+# Generated by Django 5.0 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+from django.db.models import Max, Min, OuterRef, Subquery
+
+BATCH = 5000    # UPDATE 한 번이 맡는 pk 구간
+
+
+def backfill(apps, schema_editor):
+    """이름마다 Source 한 행, 그다음 pk 구간마다 UPDATE 한 번 (구간마다 commit — 긴 잠금 없음)"""
+    Source = apps.get_model("core", "Source")
+    TranslationData = apps.get_model("core", "TranslationData")
+    names = TranslationData.objects.order_by().values_list("source", flat=True).distinct()
+    Source.objects.bulk_create([Source(name=n) for n in names], batch_size=1000, ignore_conflicts=True)
+
+    agg = TranslationData.objects.aggregate(lo=Min("pk"), hi=Max("pk"))
+    if agg["lo"] is None:
+        return
+    source_id = Subquery(Source.objects.filter(name=OuterRef("source")).values("pk")[:1])
+    for lo in range(agg["lo"], agg["hi"] + 1, BATCH):
+        with transaction.atomic():
+            TranslationData.objects.filter(pk__gte=lo, pk__lt=lo + BATCH, source_ref__isnull=True) \
+                .update(source_ref=source_id)
+
+
+class Migration(migrations.Migration):
+    """
+    확장 단계 — Source 표를 만들고 nullable source_ref 를 채운다 (배치마다 commit 하도록 atomic=False).
+    0014 가 남은 행을 채우고 행 수를 센 뒤 문자열 열을 지우고 source_ref → source 로 바꾼다
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0012_drop_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Source',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('rows', models.IntegerField(default=0, editable=False)),
+            ],
+            options={
+                'ordering': ('name',),
+            },
+        ),
+        migrations.AddField(
+            model_name='translationdata',
+            name='source_ref',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT,
+                                    related_name='+', to='core.source'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
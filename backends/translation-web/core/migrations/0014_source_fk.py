@@ -0,0 +1,59 @@
+# Generated by Django 5.0 on 2026-10-18 15:40
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def finish(apps, schema_editor):
+    """0013 뒤에 들어온 행을 마저 채우고 Source.rows 를 센다"""
+    import_module("core.migrations.0013_source").backfill(apps, schema_editor)
+    Source = apps.get_model("core", "Source")
+    TranslationData = apps.get_model("core", "TranslationData")
+    counts = TranslationData.objects.order_by().values_list("source_ref").annotate(n=Count("pk"))
+    Source.objects.bulk_update([Source(pk=pk, rows=n) for pk, n in counts], ["rows"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    """축소 단계 — 문자열 source 와 그 색인을 지우고 정수 FK 로 같은 제약·색인을 다시 건다"""
+
+    dependencies = [
+        ('core', '0013_source'),
+    ]
+
+    operations = [
+        migrations.RunPython(finish, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='translationdata',
+            name='uniq_source_digest',
+        ),
+        migrations.RemoveIndex(
+            model_name='translationdata',
+            name='td_source_status',
+        ),
+        migrations.RemoveField(
+            model_name='translationdata',
+            name='source',
+        ),
+        migrations.RenameField(
+            model_name='translationdata',
+            old_name='source_ref',
+            new_name='source',
+        ),
+        migrations.AlterField(
+            model_name='translationdata',
+            name='source',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT,
+                                    related_name='+', to='core.source'),
+        ),
+        migrations.AddConstraint(
+            model_name='translationdata',
+            constraint=models.UniqueConstraint(fields=('source', 'content_digest'), name='uniq_source_digest'),
+        ),
+        migrations.AddIndex(
+            model_name='translationdata',
+            index=models.Index(fields=['source', 'status'], name='td_source_status'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-18 16:20
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_categories(apps, schema_editor):
+    """Matcher.category 별 행 수 — 이후로는 시그널이 증감으로 맞춘다"""
+    FacetCount = apps.get_model("core", "FacetCount")
+    Matcher = apps.get_model("core", "Matcher")
+    counts = Matcher.objects.order_by().values_list("category").annotate(n=Count("pk"))
+    FacetCount.objects.bulk_create([FacetCount(facet="category", value=c, rows=n) for c, n in counts],
+                                   batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    """admin 목록 필터용 값별 행 수 (source 는 Source.rows, 여기는 category)"""
+
+    dependencies = [
+        ('core', '0014_source_fk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=32)),
+                ('value', models.CharField(max_length=255)),
+                ('rows', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ('facet', 'value'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='uniq_facet_value'),
+        ),
+        migrations.RunPython(fill_categories, migrations.RunPython.noop),
+    ]
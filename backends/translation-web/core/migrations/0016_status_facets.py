@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-18 18:05
+
+from collections import Counter
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def fill_statuses(apps, schema_editor):
+    """(source, status) 별 행 수 — 이후로는 시그널·상태 재계산이 증감으로 맞춘다"""
+    FacetCount = apps.get_model("core", "FacetCount")
+    TranslationData = apps.get_model("core", "TranslationData")
+    per_status = list(TranslationData.objects.order_by().values_list("source", "status").annotate(n=Count("pk")))
+    total = Counter()
+    for _, status, n in per_status:
+        total[status] += n
+    FacetCount.objects.bulk_create(
+        [FacetCount(facet="status", value=status, rows=n) for status, n in total.items()]
+        + [FacetCount(facet="source_status", value=f"{s}:{status}", rows=n) for s, status, n in per_status],
+        batch_size=1000,
+    )
+
+
+def drop_statuses(apps, schema_editor):
+    apps.get_model("core", "FacetCount").objects.filter(facet__in=["status", "source_status"]).delete()
+
+
+class Migration(migrations.Migration):
+    """번역 상태 필터 개수를 FacetCount 로 (admin 목록마다 GROUP BY 하지 않도록)"""
+
+    dependencies = [
+        ('core', '0015_facet_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_statuses, drop_statuses),
+    ]
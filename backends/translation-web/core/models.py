@@ -2,9 +2,11 @@
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q
+from django.db.models import F, Q
+from django.utils import timezone
 from django.db.models import Index
 import hashlib
+from collections import Counter
 
 
 import hashlib
@@ -21,23 +23,90 @@ class AdminFastLink(models.Model):
         verbose_name = 'Translation data (fast)'
         verbose_name_plural = 'Translation data (fast)'
 
+def content_digest(text: str) -> bytes:
+    """TranslationData.content_digest — save() 와 import_packs 작업자가 같은 함수로 계산"""
+    return hashlib.md5(text.encode()).digest()
+
+
+class DigestField(models.BinaryField):
+    """고정 길이 바이너리 — MySQL 에서 BinaryField 기본형(longblob)은 색인에 못 넣는다 → binary(N)"""
+
+    def db_type(self, connection):
+        if connection.vendor == "mysql":
+            return f"binary({self.max_length})"
+        return super().db_type(connection)
+
+
+class Source(models.Model):
+    """TranslationData.source 이름 — 행마다 문자열 대신 정수 키, rows 는 행 수 (admin 필터·자동완성이 이 표만 읽음)"""
+    id   = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=255, unique=True)
+    # 저장·삭제 시그널과 import_packs 가 증감으로 맞춘다 (core/signals.py, adjust_source_rows)
+    rows = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        ordering = ("name",)
+
+    def __str__(self):
+        return self.name
+
+
+def adjust_source_rows(deltas) -> None:
+    """{source_id: 증감} 을 Source.rows 에 더한다 — 호출부의 트랜잭션 안에서"""
+    for source_id, n in deltas.items():
+        if n:
+            Source.objects.filter(pk=source_id).update(rows=F("rows") + n)
+
+
 class TranslationData(models.Model):
-    source       = models.CharField(max_length=255, db_index=True)
+    # 번역 상태 (core/status.py 가 서버 측 Translator 로 계산해 저장)
+    STATUS_PENDING = ""
+    STATUS_TRANSLATED = "translated"
+    STATUS_PART = "part-translated"
+    STATUS_UNTRANSLATED = "untranslated"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_TRANSLATED, "Translated"),
+        (STATUS_PART, "Part-translated"),
+        (STATUS_UNTRANSLATED, "Untranslated"),
+    ]
+
+    # 정수 FK — 단독 색인은 두지 않는다 ((source, content_digest) unique 색인이 source 로 시작)
+    source       = models.ForeignKey(Source, on_delete=models.PROTECT, related_name="+", db_index=False)
     content      = models.TextField()
-    content_hash = models.CharField(max_length=32, editable=False)
+    # md5(content) 16바이트 — 예전 32자 hex CharField 대신 (source, content_digest) 색인이 좁아진다
+    content_digest = DigestField(max_length=16, editable=False)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING,
+                              blank=True, editable=False, db_index=True)
+    # 마지막으로 매치된 matcher — 삭제돼도 행을 건드리지 않고 재계산 때 바로잡는다
+    matched_matcher = models.ForeignKey("Matcher", null=True, blank=True, editable=False,
+                                        on_delete=models.DO_NOTHING, db_constraint=False,
+                                        related_name="+")
+    status_generation = models.PositiveIntegerField(default=0, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        row = super().from_db(db, field_names, values)
+        row._loaded_source_id = row.__dict__.get("source_id")   # source 를 바꿔 저장하면 양쪽 rows 를 옮긴다
+        row._loaded_status = row.__dict__.get("status")         # 상태별 개수도 같이 (adjust_row_counts)
+        return row
 
     def save(self, *args, **kwargs):
-        self.content_hash = hashlib.md5(self.content.encode()).hexdigest()
+        self.content_digest = content_digest(self.content)
         super().save(*args, **kwargs)
 
     class Meta:
         # ――― 중복 방지 ―――
         constraints = [
             models.UniqueConstraint(
-                fields=["source", "content_hash"],
-                name="uniq_source_hash",
+                fields=["source", "content_digest"],
+                name="uniq_source_digest",
             )
         ]
+        indexes = [
+            Index(fields=["source", "status"], name="td_source_status"),
+        ]
         verbose_name = "Translation data"
         verbose_name_plural = "Translation data"
 
@@ -57,6 +126,8 @@ class Matcher(models.Model):
     groups = models.JSONField(default=list, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # 증분 빌드용 변경 스탬프 (queryset.update() 시에는 직접 넣어 줄 것)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     memo = models.TextField(blank=True)
 
     priority = models.IntegerField(
@@ -82,6 +153,12 @@ class Matcher(models.Model):
             return text
         return text.replace("\r\n", "\n").replace("\r", "\n")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        row = super().from_db(db, field_names, values)
+        row._loaded_category = row.__dict__.get("category")     # category facet 개수 옮기기 (core/signals.py)
+        return row
+
     def save(self, *args, **kwargs):
         # 저장 직전 줄바꿈 정리
         self.raw = self._normalize_newlines(self.raw)
@@ -110,3 +187,207 @@ class Matcher(models.Model):
                 name="uniq_regex_pair",
             ),
         ]
+
+
+# ─────────────────────────────────────────────────────────────
+# 스냅샷 저장소 (core/snapshots.py)
+#   • SnapshotBlob: 내용 해시(sha256)로 주소가 정해지는 파일 — 같은 빌드는 한 번만 저장
+#   • Snapshot:     "Generate translation file" 한 번 = 한 행 (이름·메타데이터)
+# ─────────────────────────────────────────────────────────────
+class SnapshotBlob(models.Model):
+    KIND_JSON = "json"
+    KIND_SVG = "svg"
+
+    hash = models.CharField(max_length=64, primary_key=True)      # 원본 바이트 sha256
+    kind = models.CharField(max_length=8)
+    size = models.BigIntegerField()                                # 원본 크기
+    stored_size = models.BigIntegerField()                         # 디스크에 저장된 크기
+    # 직전 스냅샷 대비 delta 로 저장된 경우 그 기준 blob (체인 깊이 = depth)
+    base = models.ForeignKey("self", null=True, blank=True,
+                             on_delete=models.PROTECT, related_name="+")
+    depth = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.kind}:{self.hash[:12]}"
+
+
+class Snapshot(models.Model):
+    name = models.CharField(max_length=100, unique=True)           # translation_file_YYYYMMDD_HHMMSS
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    generation = models.PositiveIntegerField(default=0)
+    matcher_count = models.PositiveIntegerField(default=0)
+    json_blob = models.ForeignKey(SnapshotBlob, on_delete=models.PROTECT, related_name="+")
+    svg_blob = models.ForeignKey(SnapshotBlob, null=True, blank=True,
+                                 on_delete=models.PROTECT, related_name="+")
+
+    class Meta:
+        ordering = ("-created_at", "-id")
+
+    def __str__(self):
+        return self.name
+
+
+# ─────────────────────────────────────────────────────────────
+# source 별 번역 커버리지 (manage.py coverage 가 채움, 대시보드는 이 표만 읽음)
+# ─────────────────────────────────────────────────────────────
+class CoverageSummary(models.Model):
+    source = models.CharField(max_length=255)
+    status = models.CharField(max_length=16, choices=TranslationData.STATUS_CHOICES)
+    count = models.PositiveBigIntegerField(default=0)
+    generation = models.PositiveIntegerField(default=0)            # 계산에 쓴 latest.json generation
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source", "status"], name="uniq_coverage_source_status"),
+        ]
+        ordering = ("source", "status")
+
+    def __str__(self):
+        return f"{self.source}:{self.status or 'pending'}={self.count}"
+
+
+# ─────────────────────────────────────────────────────────────
+# matcher 별 코퍼스 사용 통계 (manage.py matcher_stats 가 채움)
+#   hits     : 자기 category 의 행 중 패턴이 맞는 수
+#   wins     : 그중 실제로 번역을 맡은 수 (나머지 = shadowed, 앞선 matcher 에 가려짐)
+#   nested   : 다른 matcher 의 groups 재귀 번역 안에서 쓰인 수
+# ─────────────────────────────────────────────────────────────
+class MatcherStats(models.Model):
+    matcher = models.OneToOneField(Matcher, primary_key=True, on_delete=models.CASCADE,
+                                   related_name="stats")
+    hits = models.PositiveIntegerField(default=0, db_index=True)
+    wins = models.PositiveIntegerField(default=0, db_index=True)
+    shadowed = models.PositiveIntegerField(default=0, db_index=True)
+    nested = models.PositiveIntegerField(default=0)
+    examples = models.JSONField(default=list, blank=True)         # 번역을 맡은 짧은 문자열 top-k
+    generation = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.matcher_id}: {self.wins}/{self.hits}"
+
+
+# ─────────────────────────────────────────────────────────────
+# Matcher.groups 역색인 (core/grouprefs.py 가 저장 때마다 맞춘다)
+#   position : groups 최상위 인덱스 (= 캡처 그룹 번호 - 1), 그 안의 중첩 목록은 같은 position
+#   category : 그 위치에서 참조하는 category
+# ─────────────────────────────────────────────────────────────
+class MatcherGroupRef(models.Model):
+    matcher = models.ForeignKey(Matcher, on_delete=models.CASCADE, related_name="group_refs")
+    position = models.PositiveSmallIntegerField()
+    category = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["matcher", "position", "category"], name="uniq_group_ref"),
+        ]
+        indexes = [
+            models.Index(fields=["category", "matcher"], name="groupref_category"),
+        ]
+
+    def __str__(self):
+        return f"{self.matcher_id}[{self.position}] → {self.category}"
+
+
+# ─────────────────────────────────────────────────────────────
+# Discord 웹훅 outbox (core/outbox.py 가 백그라운드로 전송)
+#   저장과 같은 트랜잭션에 기록 → commit 된 것만, 실패해도 사라지지 않음
+# ─────────────────────────────────────────────────────────────
+class WebhookMessage(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"        # 재시도 한도 초과 / 잘못된 요청 (manage.py webhook_outbox --requeue)
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_DEAD, "Dead"),
+    ]
+
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="webhook_due"),
+        ]
+        ordering = ("-id",)
+
+    def __str__(self):
+        return f"#{self.pk} {self.status}"
+
+
+class PackManifest(models.Model):
+    """import_packs 가 읽은 pack 파일 — 바뀌지 않았으면 건너뛰고, 중단됐으면 records_done 부터 이어서"""
+    path = models.CharField(max_length=255, unique=True)         # packs 디렉터리 기준
+    size = models.PositiveBigIntegerField()
+    mtime_ns = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64)                    # 파일 바이트 (압축된 그대로)
+    records_done = models.PositiveBigIntegerField(default=0)    # commit 된 레코드 수 (체크포인트)
+    completed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("path",)
+
+    def __str__(self):
+        return self.path
+
+
+# ─────────────────────────────────────────────────────────────
+# admin 목록 필터의 값별 행 수 (core/facets.py)
+#   Matcher.category 처럼 별도 표가 없는 값만 — source 는 Source.rows
+#   TranslationData.status 는 "status" (전체) + "source_status" (source 별)
+# ─────────────────────────────────────────────────────────────
+class FacetCount(models.Model):
+    facet = models.CharField(max_length=32)
+    value = models.CharField(max_length=255)
+    rows = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["facet", "value"], name="uniq_facet_value"),
+        ]
+        ordering = ("facet", "value")
+
+    def __str__(self):
+        return f"{self.facet}:{self.value}={self.rows}"
+
+
+def adjust_facet(facet: str, deltas) -> None:
+    """{값: 증감} 을 FacetCount.rows 에 더한다 (처음 보는 값이면 행을 만든다) — 호출부의 트랜잭션 안에서"""
+    for value, n in deltas.items():
+        if not n:
+            continue
+        rows = FacetCount.objects.filter(facet=facet, value=value)
+        if not rows.update(rows=F("rows") + n):
+            FacetCount.objects.get_or_create(facet=facet, value=value)
+            rows.update(rows=F("rows") + n)
+
+
+def adjust_status_counts(deltas) -> None:
+    """
+    {(source_id, status): 증감} → FacetCount "status" (값 = status, 전체)
+    와 "source_status" (값 = "<source_id>:<status>", source 필터를 건 목록용) — 호출부의 트랜잭션 안에서
+    """
+    total = Counter()
+    for (source_id, status), n in deltas.items():
+        total[status] += n
+    adjust_facet("status", total)
+    adjust_facet("source_status", {f"{source_id}:{status}": n for (source_id, status), n in deltas.items()})
+
+
+def adjust_row_counts(deltas) -> None:
+    """TranslationData 행을 넣거나 지울 때 — {(source_id, status): 증감} 으로 Source.rows 와 상태별 개수를 함께"""
+    per_source = Counter()
+    for (source_id, status), n in deltas.items():
+        per_source[source_id] += n
+    adjust_source_rows(per_source)
+    adjust_status_counts(deltas)
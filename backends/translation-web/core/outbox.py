@@ -0,0 +1,280 @@
+# core/outbox.py
+"""
+Discord 웹훅 outbox — 저장 요청은 WebhookMessage 행만 쓰고, 전송은 백그라운드
+
+• enqueue(): 호출한 트랜잭션 안에서 행 추가 → commit 후 sender 를 깨움 (롤백되면 메시지도 없음)
+• sender: 프로세스당 데몬 스레드 하나, BUILD_ROOT/.outbox.lock (flock, 비차단) 을 잡은 프로세스만 전송
+  - requests.Session 재사용 (keep-alive)
+  - 429 → retry_after 만큼 쉬고 같은 메시지 재전송 (시도 횟수에 안 셈)
+    연달아 MAX_RATE_RETRIES 번을 넘으면 5xx 처럼 백오프 (sender 스레드가 한 메시지에 묶이지 않게)
+  - X-RateLimit-Remaining 이 0 이면 X-RateLimit-Reset-After 만큼 쉬었다가 다음 전송
+  - 네트워크 오류·5xx → 지수 백오프, WEBHOOK_MAX_ATTEMPTS 회 실패하면 dead
+  - 그 밖의 4xx → dead (다시 보내도 같은 결과)
+• 밀린 메시지는 Discord 한도(embed 10개, content 2000자, embed 합 6000자) 안에서 한 번에 합쳐 보냄
+• outbox_stats(): 대기 수·가장 오래된 대기·dead 수·최근 24시간 전송 지연 (manage.py webhook_outbox, admin)
+• 프로세스 시작 때 (CoreConfig.ready → resume_pending) 남은 대기 행이 있으면 sender 를 깨운다
+• WEBHOOK_OUTBOX_ASYNC=False → sender 를 깨우지 않음 (명령·테스트에서 deliver_pending 직접 호출)
+"""
+import fcntl
+import random
+import threading
+import time
+import traceback
+from datetime import timedelta
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from .models import WebhookMessage
+
+LOCK_NAME = ".outbox.lock"
+MAX_EMBEDS = 10         # Discord 메시지 하나당 한도
+MAX_CONTENT = 2000
+MAX_EMBED_CHARS = 6000
+SCAN = 50               # 한 번에 살펴볼 대기 행 수 (합치기 후보)
+IDLE_POLL = 30.0        # 재시도 예정 행이 있을 때 다시 볼 최대 간격(초)
+MAX_RATE_WAIT = 60.0    # rate limit 으로 한 번에 쉬는 최대 시간(초)
+MAX_RATE_RETRIES = 5    # 연속 429 를 이만큼 넘게 받으면 백오프로 넘긴다
+LATENCY_SAMPLE = 5000   # 지연 백분위를 계산할 최근 전송 수
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def enqueue(payload: dict) -> WebhookMessage | None:
+    """웹훅 메시지 예약 (WEBHOOK_URL 이 비어 있으면 아무것도 안 함)"""
+    if not _setting("WEBHOOK_URL", None):
+        return None
+    msg = WebhookMessage.objects.create(payload=payload)
+    if _setting("WEBHOOK_OUTBOX_ASYNC", True):
+        transaction.on_commit(_sender.wake)
+    return msg
+
+
+# ────────────────────────────────────────────────────────
+# 합치기
+# ────────────────────────────────────────────────────────
+def _embed_chars(embeds: list[dict]) -> int:
+    return sum(len(e.get("title") or "") + len(e.get("description") or "") for e in embeds)
+
+
+def merge_payloads(payloads: list[dict]) -> tuple[dict, int]:
+    """앞에서부터 한 메시지로 합칠 수 있는 만큼 → (합친 payload, 사용한 개수 ≥ 1)"""
+    content, embeds = "", []
+    for n, payload in enumerate(payloads):
+        text = payload.get("content") or ""
+        more = payload.get("embeds") or []
+        joined = f"{content}\n{text}" if content and text else content or text
+        if n and (len(joined) > MAX_CONTENT or len(embeds) + len(more) > MAX_EMBEDS
+                  or _embed_chars(embeds + more) > MAX_EMBED_CHARS):
+            return {"content": content, "embeds": embeds}, n
+        content, embeds = joined, embeds + more
+    return {"content": content, "embeds": embeds}, len(payloads)
+
+
+# ────────────────────────────────────────────────────────
+# 전송
+# ────────────────────────────────────────────────────────
+def _seconds(value, default: float) -> float:
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+def _retry_after(resp: requests.Response) -> float:
+    try:
+        body = resp.json()
+    except ValueError:
+        body = {}
+    value = body.get("retry_after") if isinstance(body, dict) else None
+    if value is None:
+        value = resp.headers.get("Retry-After") or resp.headers.get("X-RateLimit-Reset-After")
+    return min(_seconds(value, 1.0), MAX_RATE_WAIT)
+
+
+def _respect_bucket(resp: requests.Response) -> None:
+    """남은 요청이 0 이면 버킷이 찰 때까지 쉰다"""
+    if resp.headers.get("X-RateLimit-Remaining") == "0":
+        time.sleep(min(_seconds(resp.headers.get("X-RateLimit-Reset-After"), 1.0), MAX_RATE_WAIT))
+
+
+def _backoff(attempts: int) -> float:
+    base = _setting("WEBHOOK_RETRY_BASE", 5.0)
+    delay = min(base * 2 ** (attempts - 1), _setting("WEBHOOK_RETRY_MAX", 3600.0))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _retry(group: list[WebhookMessage], error: str) -> None:
+    now = timezone.now()
+    for msg in group:
+        msg.attempts += 1
+        msg.last_error = error
+        if msg.attempts >= _setting("WEBHOOK_MAX_ATTEMPTS", 8):
+            msg.status = WebhookMessage.STATUS_DEAD
+        else:
+            msg.next_attempt_at = now + timedelta(seconds=_backoff(msg.attempts))
+    WebhookMessage.objects.bulk_update(group, ["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def _deliver(url: str, session: requests.Session) -> int:
+    sent, merge, limited = 0, True, 0
+    while True:
+        due = list(WebhookMessage.objects.filter(
+            status=WebhookMessage.STATUS_PENDING, next_attempt_at__lte=timezone.now(),
+        ).order_by("id")[:SCAN])
+        if not due:
+            break
+        payload, n = merge_payloads([m.payload for m in due]) if merge else (due[0].payload, 1)
+        group = due[:n]
+        try:
+            resp = session.post(url, json=payload, timeout=_setting("WEBHOOK_TIMEOUT", 10))
+        except requests.RequestException as exc:
+            _retry(group, repr(exc)[:500])
+            break                                   # 연결 문제 → 나머지도 나중에
+        if resp.status_code == 429:
+            limited += 1
+            if limited > MAX_RATE_RETRIES:
+                _retry(group, f"HTTP 429: rate limited {limited} times in a row")
+                break                               # 전역 한도일 수 있다 → 나머지도 나중에
+            time.sleep(_retry_after(resp))
+            continue
+        limited = 0
+        if resp.ok:
+            WebhookMessage.objects.filter(pk__in=[m.pk for m in group]).update(
+                status=WebhookMessage.STATUS_SENT, sent_at=timezone.now(),
+                attempts=F("attempts") + 1, last_error="",
+            )
+            sent += n
+            _respect_bucket(resp)
+            continue
+        error = f"HTTP {resp.status_code}: {resp.text[:500]}"
+        if resp.status_code >= 500:
+            _retry(group, error)
+            break
+        if n > 1:
+            merge = False                           # 합친 것이 거절됨 → 이번에는 하나씩
+            continue
+        WebhookMessage.objects.filter(pk=group[0].pk).update(
+            status=WebhookMessage.STATUS_DEAD, attempts=F("attempts") + 1, last_error=error)
+
+    keep = timezone.now() - timedelta(days=_setting("WEBHOOK_OUTBOX_KEEP_DAYS", 7))
+    WebhookMessage.objects.filter(status=WebhookMessage.STATUS_SENT, sent_at__lt=keep).delete()
+    return sent
+
+
+def deliver_pending(*, session: requests.Session | None = None) -> int:
+    """지금 보낼 수 있는 메시지를 모두 전송 → 보낸 행 수 (다른 프로세스가 전송 중이면 0)"""
+    url = _setting("WEBHOOK_URL", None)
+    if not url:
+        return 0
+    root = Path(settings.BUILD_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / LOCK_NAME, "a") as fp:
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0
+        try:
+            if session is not None:
+                return _deliver(url, session)
+            with requests.Session() as own:
+                return _deliver(url, own)
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+
+def _next_due() -> float | None:
+    """다음 재시도까지 남은 초 (대기 행이 없으면 None)"""
+    due = WebhookMessage.objects.filter(status=WebhookMessage.STATUS_PENDING).aggregate(
+        at=Min("next_attempt_at"))["at"]
+    if due is None:
+        return None
+    return min(max((due - timezone.now()).total_seconds(), 1.0), IDLE_POLL)
+
+
+class _Sender:
+    """프로세스당 하나의 데몬 스레드 — 깨우거나 재시도 시각이 되면 대기 행을 전송"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._guard = threading.Lock()
+        self._thread = None
+
+    def wake(self) -> None:
+        with self._guard:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="webhook-outbox", daemon=True)
+                self._thread.start()
+        self._event.set()
+
+    def _run(self) -> None:
+        timeout = None
+        with requests.Session() as session:
+            while True:
+                self._event.wait(timeout)
+                self._event.clear()
+                try:
+                    deliver_pending(session=session)
+                    timeout = _next_due()
+                except Exception:
+                    traceback.print_exc()
+                    timeout = IDLE_POLL
+                finally:
+                    connection.close()
+
+
+_sender = _Sender()
+
+
+def resume_pending() -> None:
+    """
+    재시작 전에 남은 대기 행(백오프 중 / 죽기 직전 commit)이 있으면 sender 를 깨운다 (CoreConfig.ready)
+    앱 초기화 중에는 DB 를 건드리지 않도록 확인은 별도 스레드에서
+    """
+    if not _setting("WEBHOOK_URL", None) or not _setting("WEBHOOK_OUTBOX_ASYNC", True):
+        return
+
+    def check():
+        try:
+            if WebhookMessage.objects.filter(status=WebhookMessage.STATUS_PENDING).exists():
+                _sender.wake()
+        except Exception:
+            traceback.print_exc()           # migrate 전 등
+        finally:
+            connection.close()
+
+    threading.Thread(target=check, name="webhook-outbox-resume", daemon=True).start()
+
+
+# ────────────────────────────────────────────────────────
+# 관측
+# ────────────────────────────────────────────────────────
+def outbox_stats() -> dict:
+    """대기 / dead 개수, 가장 오래된 대기(초), 최근 24시간 전송 수와 지연(초) p50·p95·max (최근 LATENCY_SAMPLE 건)"""
+    now = timezone.now()
+    pending = WebhookMessage.objects.filter(status=WebhookMessage.STATUS_PENDING)
+    oldest = pending.aggregate(at=Min("created_at"))["at"]
+    recent = WebhookMessage.objects.filter(status=WebhookMessage.STATUS_SENT,
+                                           sent_at__gte=now - timedelta(days=1))
+    latency = sorted((sent - created).total_seconds()
+                     for created, sent in recent.order_by("-sent_at")
+                     .values_list("created_at", "sent_at")[:LATENCY_SAMPLE])
+
+    def pct(p):
+        return round(latency[min(int(len(latency) * p), len(latency) - 1)], 3) if latency else None
+
+    return {
+        "pending": pending.count(),
+        "dead": WebhookMessage.objects.filter(status=WebhookMessage.STATUS_DEAD).count(),
+        "oldest_pending_seconds": round((now - oldest).total_seconds(), 1) if oldest else None,
+        "sent_24h": recent.count(),
+        "latency_p50": pct(0.5),
+        "latency_p95": pct(0.95),
+        "latency_max": round(latency[-1], 3) if latency else None,
+    }
@@ -0,0 +1,335 @@
+# core/packs.py
+"""
+packs 파일 스트리밍 읽기 — import_packs 가 쓴다
+
+• 형식: *.json (배열 또는 {"messages": [...]}), *.ndjson / *.jsonl (한 줄에 값 하나)
+  뒤에 .gz / .zst 를 붙이면 압축을 풀면서 읽음 (zstandard 패키지가 없으면 .zst 는 건너뜀)
+• JSON 은 CHUNK 글자씩 읽어 json.JSONDecoder.raw_decode 로 원소 하나씩 꺼낸다
+  → 파일 크기와 상관없이 메모리는 버퍼 + 원소 하나
+• bytes_read: 디스크에서 읽은 (압축된) 바이트 → 미리 세는 패스 없이 진행률 계산
+• hashed_batches(): 파싱 + content_digest 를 fork 된 작업자 프로세스들이 파일 단위로 나눠 하고
+  (content, digest) 배치를 제한된 큐로 넘긴다 → 쓰기는 호출한 프로세스 하나만
+"""
+import gzip
+import io
+import json
+import multiprocessing
+import queue
+import re
+import time
+import traceback
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+
+from django.db import connections
+
+from .models import content_digest
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 선택 의존성
+    zstandard = None
+
+CHUNK = 1 << 16                         # 한 번에 디코드할 글자 수
+FORMATS = (".json", ".ndjson", ".jsonl")
+COMPRESSIONS = ("", ".gz") + ((".zst",) if zstandard else ())
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+class PackFormatError(ValueError):
+    """pack 구조가 예상과 다름 — pos 는 디코드한 글자 기준 위치"""
+
+    def __init__(self, msg: str, pos: int):
+        super().__init__(f"{msg} (pos {pos})")
+        self.pos = pos
+
+
+def _split(path: Path) -> tuple[str, str, str]:
+    """a.ndjson.gz → ("a", ".ndjson", ".gz") — 지원하지 않는 이름이면 ("", "", "")"""
+    name = path.name
+    for comp in COMPRESSIONS:
+        if comp and not name.endswith(comp):
+            continue
+        base = name[:len(name) - len(comp)] if comp else name
+        for fmt in FORMATS:
+            if base.endswith(fmt) and len(base) > len(fmt):
+                return base[:-len(fmt)], fmt, comp
+    return "", "", ""
+
+
+def source_name(path: Path) -> str:
+    """파일 이름에서 형식·압축 확장자를 뗀 것 = TranslationData.source"""
+    return _split(path)[0]
+
+
+def pack_files(directory: Path) -> list[Path]:
+    """directory 안의 지원하는 pack 파일 (이름순)"""
+    if not directory.is_dir():
+        return []
+    return sorted(p for p in directory.iterdir() if p.is_file() and _split(p)[0])
+
+
+# ────────────────────────────────────────────────────────
+# 읽기
+# ────────────────────────────────────────────────────────
+class PackReader:
+    """
+    with PackReader(path) as reader:
+        for text in reader: …          # 레코드 하나씩
+        reader.bytes_read              # 지금까지 디스크에서 읽은 바이트
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.source, self.format, self.compression = _split(self.path)
+        if not self.source:
+            raise ValueError(f"지원하지 않는 pack 파일: {self.path.name}")
+        self.size = self.path.stat().st_size
+        self._raw = None
+        self._text = None
+
+    def __enter__(self):
+        self._raw = open(self.path, "rb")
+        if self.compression == ".gz":
+            stream = gzip.GzipFile(fileobj=self._raw, mode="rb")
+        elif self.compression == ".zst":
+            stream = zstandard.ZstdDecompressor().stream_reader(self._raw, read_across_frames=True)
+        else:
+            stream = self._raw
+        self._text = io.TextIOWrapper(stream, encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc):
+        self._text.close()
+        self._raw.close()
+
+    @property
+    def bytes_read(self) -> int:
+        return self._raw.tell() if self._raw is not None and not self._raw.closed else self.size
+
+    def __iter__(self) -> Iterator:
+        if self.format == ".json":
+            return self._iter_json()
+        return self._iter_lines()
+
+    # ── NDJSON ────────────────────────────────────────────
+    def _iter_lines(self) -> Iterator:
+        pos = 0
+        for line in self._text:
+            pos += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise PackFormatError(e.msg, pos - len(line) + e.pos) from None
+
+    # ── JSON (배열 / {"messages": 배열}) ───────────────────
+    def _iter_json(self) -> Iterator:
+        scanner = _Scanner(self._text)
+        head = scanner.peek()
+        if head == "[":
+            yield from scanner.array()
+        elif head == "{":
+            yield from scanner.messages()
+        elif head != "":
+            raise PackFormatError("배열 또는 객체가 아님", scanner.offset)
+
+
+class _Scanner:
+    """텍스트 스트림 위의 최소 JSON 토크나이저 — 최상위 구조만 직접 걷고 값은 raw_decode 에 맡긴다"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buf = ""
+        self.pos = 0
+        self.base = 0                       # buf[0] 의 전체 스트림 위치
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    @property
+    def offset(self) -> int:
+        return self.base + self.pos
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(CHUNK)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:                        # 이미 읽은 앞부분은 버린다 → 버퍼는 원소 하나 + CHUNK 정도
+            self.base += self.pos
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 글자 (끝이면 "")"""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise PackFormatError(f"'{char}' 가 와야 함", self.offset)
+        self.pos += 1
+
+    def value(self):
+        """값 하나 — 버퍼 끝에서 잘렸을 수 있으면 더 읽고 다시 시도"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise PackFormatError(e.msg, self.base + e.pos) from None
+            # 숫자·리터럴이 버퍼 끝에 딱 붙어 있으면 뒤가 더 있을 수 있다
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def array(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            sep = self.peek()
+            if sep == "]":
+                self.pos += 1
+                return
+            if sep != ",":
+                raise PackFormatError("',' 또는 ']' 가 와야 함", self.offset)
+            self.pos += 1
+
+    def messages(self) -> Iterator:
+        """{"messages": [...] , …} 의 messages 배열만 — 다른 키의 값은 읽고 버린다"""
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if key == "messages" and self.peek() == "[":
+                yield from self.array()
+            else:
+                self.value()
+            sep = self.peek()
+            if sep == "}":
+                return
+            if sep != ",":
+                raise PackFormatError("',' 또는 '}' 가 와야 함", self.offset)
+            self.pos += 1
+
+
+# ────────────────────────────────────────────────────────
+# 파싱 + 해시 파이프라인 (import_packs)
+# ────────────────────────────────────────────────────────
+QUEUE_DEPTH = 4                         # 작업자당 쌓아 둘 수 있는 배치 수 → 메모리 상한
+POLL = 1.0                              # 작업자 생존 확인 간격(초)
+
+
+@dataclass
+class HashedBatch:
+    """작업자 → 쓰기 쪽으로 넘어가는 단위 (파일 하나의 연속된 레코드 묶음)"""
+    index: int                          # files 안 위치
+    rows: list[tuple[str, bytes]]       # (content, content_digest) — 문자열 레코드만
+    records: int                        # 읽은 레코드 수 (문자열이 아닌 것 포함)
+    bytes_read: int                     # 이 파일에서 지금까지 읽은 바이트
+    parse_seconds: float
+    hash_seconds: float
+    done: bool = False                  # 파일 끝 (rows 는 비어 있을 수 있다)
+    error: str = ""                     # 형식 오류 → 그 파일의 나머지는 건너뜀
+    retry: bool = False                 # 형식 오류가 아닌 실패 (다음 실행에서 다시 시도)
+
+
+def _hash_file(index: int, path: Path, batch_size: int, skip: int = 0) -> Iterator[HashedBatch]:
+    with PackReader(path) as reader:
+        it = iter(reader)
+        if skip:                            # 체크포인트까지는 파싱만 하고 버린다
+            t0 = time.perf_counter()
+            try:
+                for _ in islice(it, skip):
+                    pass
+            except PackFormatError as e:
+                yield HashedBatch(index, [], 0, reader.bytes_read, time.perf_counter() - t0, 0.0, True, str(e))
+                return
+            yield HashedBatch(index, [], 0, reader.bytes_read, time.perf_counter() - t0, 0.0)
+        while True:
+            t0 = time.perf_counter()
+            chunk, error = [], ""
+            try:
+                for text in islice(it, batch_size):
+                    chunk.append(text)
+            except PackFormatError as e:
+                error = str(e)              # 오류 앞까지 읽은 레코드는 그대로 보낸다
+            t1 = time.perf_counter()
+            rows = [(t, content_digest(t)) for t in chunk if isinstance(t, str)]
+            t2 = time.perf_counter()
+            done = error != "" or len(chunk) < batch_size
+            yield HashedBatch(index, rows, len(chunk), reader.bytes_read, t1 - t0, t2 - t1, done, error)
+            if done:
+                return
+
+
+def _worker(tasks, out, batch_size: int) -> None:
+    while (task := tasks.get()) is not None:
+        index, path, skip = task
+        try:
+            for batch in _hash_file(index, Path(path), batch_size, skip):
+                out.put(batch)
+        except Exception:
+            out.put(HashedBatch(index, [], 0, 0, 0.0, 0.0, True, traceback.format_exc(limit=3), retry=True))
+
+
+def hashed_batches(files: list[Path], *, workers: int = 1, batch_size: int = 1000,
+                   skips: list[int] | None = None) -> Iterator[HashedBatch]:
+    """
+    files 를 파싱·해시한 배치를 만들어지는 대로 yield (파일끼리는 섞이고, 파일 안에서는 순서대로)
+    workers > 1 이면 fork 된 자식 프로세스들이 파일을 나눠 읽는다 → 호출한 프로세스는 쓰기만
+    skips[i]: files[i] 의 앞 레코드 몇 개를 건너뛸지 (이어서 가져오기)
+    """
+    skips = skips or [0] * len(files)
+    workers = min(workers, len(files))
+    if workers <= 1:
+        for index, path in enumerate(files):
+            yield from _hash_file(index, path, batch_size, skips[index])
+        return
+
+    connections.close_all()                 # fork 전에 닫아야 자식과 소켓을 공유하지 않는다
+    ctx = multiprocessing.get_context("fork")
+    tasks, out = ctx.Queue(), ctx.Queue(maxsize=QUEUE_DEPTH * workers)
+    for index, path in enumerate(files):
+        tasks.put((index, str(path), skips[index]))
+    for _ in range(workers):
+        tasks.put(None)
+    procs = [ctx.Process(target=_worker, args=(tasks, out, batch_size), daemon=True) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    try:
+        remaining = len(files)
+        while remaining:
+            try:
+                batch = out.get(timeout=POLL)
+            except queue.Empty:
+                if any(p.exitcode not in (None, 0) for p in procs):
+                    raise RuntimeError("pack 파싱 작업자가 비정상 종료") from None
+                continue
+            remaining -= batch.done
+            yield batch
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+            p.join()
@@ -0,0 +1,92 @@
+# core/packsync.py
+"""
+import_packs --sync — pack 에서 사라진 TranslationData 행 찾기 / 지우기
+
+• pack 을 읽으면서 content_digest 를 첫 4비트로 16 개 임시 파일에 나눠 적는다 (HashSpill)
+• 파티션 하나씩: pack digest set ↔ DB (source, content_digest 범위) → 차집합
+  메모리는 파티션 하나 (전체의 1/16), 작은 source 는 파티션을 합쳐 쿼리 한 번
+• 지우기는 DELETE_CHUNK 개씩 각자 트랜잭션, 호출부가 전체를 bulk_signals 범위 하나로 → 요약 웹훅 한 건
+"""
+import tempfile
+from itertools import batched
+from pathlib import Path
+
+from django.db import transaction
+
+from .batching import current_batch
+from .models import TranslationData
+
+PARTS = 16              # digest 첫 바이트의 상위 4비트로 나눈다
+DIGEST = 16             # content_digest 길이
+SMALL = 200_000         # 이보다 적으면 파티션을 합쳐 한 번에 비교
+DELETE_CHUNK = 1000
+SAMPLES = 3             # dry-run 보고서에 보여 줄 예시 수
+
+
+class HashSpill:
+    """source 하나의 pack digest 를 파티션별 임시 파일로 — close() 하면 지워진다"""
+
+    def __init__(self):
+        self._dir = tempfile.TemporaryDirectory(prefix="packsync-")
+        self.count = 0
+
+    def close(self) -> None:
+        self._dir.cleanup()
+
+    def add(self, digests) -> None:
+        """배치 하나씩 — 파일은 쓸 때만 연다 (source 가 많아도 열린 파일 수는 그대로)"""
+        parts: dict[int, list[bytes]] = {}
+        for d in digests:
+            parts.setdefault(d[0] >> 4, []).append(d)
+        for part, items in parts.items():
+            with open(Path(self._dir.name) / str(part), "ab") as fp:
+                fp.write(b"".join(items))           # 고정 길이 레코드
+            self.count += len(items)
+
+    def _read(self, part: int) -> set[bytes]:
+        try:
+            data = (Path(self._dir.name) / str(part)).read_bytes()
+        except FileNotFoundError:
+            return set()
+        return {data[i:i + DIGEST] for i in range(0, len(data), DIGEST)}
+
+    def partitions(self):
+        """(파티션 번호 또는 None=전체, pack digest set) — 작으면 하나로 합친다"""
+        if self.count < SMALL:
+            yield None, set().union(*(self._read(p) for p in range(PARTS)))
+            return
+        for part in range(PARTS):
+            yield part, self._read(part)
+
+
+def stale_ids(source_id: int, spill: HashSpill) -> list[int]:
+    """DB 에는 있는데 pack 에는 없는 행 pk (파티션마다 DB 결과만 훑고 버린다)"""
+    stale = []
+    for part, pack_digests in spill.partitions():
+        qs = TranslationData.objects.filter(source_id=source_id)
+        if part is not None:
+            # (source, content_digest) 색인의 범위 조회 — 바이트 비교는 MySQL binary / SQLite blob 모두 memcmp
+            qs = qs.filter(content_digest__gte=bytes([part << 4]))
+            if part + 1 < PARTS:
+                qs = qs.filter(content_digest__lt=bytes([(part + 1) << 4]))
+        stale += [pk for pk, d in qs.values_list("pk", "content_digest").iterator(chunk_size=5000)
+                  if bytes(d) not in pack_digests]
+    return stale
+
+
+def samples(ids: list[int]) -> list[str]:
+    """dry-run 보고서용 — 앞쪽 몇 개의 content"""
+    rows = TranslationData.objects.filter(pk__in=ids[:SAMPLES]).values_list("content", flat=True)
+    return [c if len(c) <= 80 else c[:79] + "…" for c in rows]
+
+
+def delete_ids(ids: list[int]) -> int:
+    """DELETE_CHUNK 개씩 조각마다 commit → 지운 수 (bulk_signals(..., atomic=False) 범위 안에서 부를 것)"""
+    deleted, batch = 0, current_batch()
+    for chunk in batched(ids, DELETE_CHUNK):
+        with transaction.atomic():
+            # 시그널에는 pk·source_id·status 만 필요 → content 는 읽지 않는다
+            deleted += TranslationData.objects.filter(pk__in=chunk).only("pk", "source", "status").delete()[0]
+            if batch is not None:
+                batch.apply_counts()            # Source.rows·상태별 개수도 이 조각과 같이 commit
+    return deleted
@@ -0,0 +1,318 @@
+# core/prefilter.py
+"""
+regex matcher 사전 필터 — 반드시 들어 있어야 하는 리터럴로 후보를 줄인다
+
+• required_literals(): JS 정규식 원문에서 "매치되려면 이 중 하나는 꼭 있어야 하는" 문자열 목록
+  (최상위 | 가지마다 가장 긴 필수 리터럴, 하나라도 못 찾으면 None = 항상 실행)
+  - i / v 플래그, 알 수 없는 문법은 None (대소문자 접기·집합 연산까지 흉내 내지 않음)
+• LiteralIndex: category 하나의 리터럴 → 트라이 정규식 하나 (Aho-Corasick 대용)
+  target 을 한 번 훑어 나온 리터럴의 주인 matcher 만 실행 — priority 순서는 그대로
+• build_translation_payload() 가 matcher 마다 "literals" 로 내보낸다 (클라이언트도 같은 규칙으로 사용)
+"""
+import re
+from functools import lru_cache
+from itertools import chain
+
+MAX_LITERAL = 64        # 필수 리터럴의 부분 문자열도 필수 → 길면 앞부분만
+MIN_FILTERED = 4        # category 안에 리터럴 있는 regex 가 이보다 적으면 색인 안 함
+
+_QUANT = re.compile(r"\{(\d+)(?:,(\d*))?\}")
+_HEX2 = re.compile(r"[0-9A-Fa-f]{2}")
+_HEX4 = re.compile(r"[0-9A-Fa-f]{4}")
+_CODE_POINT = re.compile(r"\{([0-9A-Fa-f]+)\}")
+_ESCAPE_CHARS = {"n": "\n", "r": "\r", "t": "\t", "f": "\f", "v": "\v"}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class _Parser:
+    """JS 정규식 원문을 훑으며 가지별 필수 리터럴만 모은다 (매칭 엔진이 아님)"""
+
+    def __init__(self, source: str, unicode: bool):
+        self.s = source
+        self.pos = 0
+        self.unicode = unicode
+
+    def peek(self, k: int = 0) -> str:
+        i = self.pos + k
+        return self.s[i] if i < len(self.s) else ""
+
+    # ── 선택 (a|b|c) → 가지마다 필수 리터럴 목록 ─────────────
+    def alternation(self) -> list[list[str]]:
+        branches = [self.sequence()]
+        while self.peek() == "|":
+            self.pos += 1
+            branches.append(self.sequence())
+        return branches
+
+    def sequence(self) -> list[str]:
+        runs, current = [], []
+
+        def flush():
+            if current:
+                runs.append("".join(current))
+                current.clear()
+
+        while self.pos < len(self.s) and self.peek() not in "|)":
+            kind, value = self.atom()
+            least = self.quantifier()
+            if kind == "char":
+                # 서로게이트는 Python 문자열과 단위가 달라 리터럴로 쓰지 않는다
+                if 0xD800 <= ord(value) <= 0xDFFF:
+                    flush()
+                elif least is None:
+                    current.append(value)
+                elif least >= 1:
+                    current.append(value)
+                    flush()
+                else:
+                    flush()
+            else:
+                flush()
+                if kind == "group" and (least is None or least >= 1):
+                    runs.extend(value)
+        flush()
+        return runs
+
+    def quantifier(self) -> int | None:
+        """최소 반복 횟수 (수량자가 없으면 None)"""
+        c = self.peek()
+        if c in ("*", "?"):
+            least = 0
+        elif c == "+":
+            least = 1
+        elif c == "{":
+            m = _QUANT.match(self.s, self.pos)
+            if m is None:
+                return None                 # 수량자가 아닌 { → 다음 atom 에서 문자로
+            least = int(m.group(1))
+            self.pos = m.end() - 1
+        else:
+            return None
+        self.pos += 1
+        if self.peek() == "?":              # lazy
+            self.pos += 1
+        return least
+
+    def atom(self) -> tuple[str, object]:
+        c = self.peek()
+        self.pos += 1
+        if c in "^$":
+            return "assert", None
+        if c == ".":
+            return "other", None
+        if c == "[":
+            self._skip_class()
+            return "other", None
+        if c == "(":
+            return self._group()
+        if c == "\\":
+            return self._escape()
+        if c in "*+?":
+            raise _Unsupported(c)
+        if c in "{}]" and self.unicode:
+            raise _Unsupported(c)
+        return "char", c
+
+    def _skip_class(self) -> None:
+        # JS 는 [] / [^] 도 유효 → 첫 ] 에서 닫힌다
+        if self.peek() == "^":
+            self.pos += 1
+        while self.peek() != "]":
+            if not self.peek():
+                raise _Unsupported("[")
+            self.pos += 2 if self.peek() == "\\" else 1
+        self.pos += 1
+
+    def _group(self) -> tuple[str, object]:
+        lookaround = False
+        if self.peek() == "?":
+            head = self.s[self.pos:self.pos + 3]
+            if head[:2] == "?:":
+                self.pos += 2
+            elif head in ("?<=", "?<!"):
+                self.pos += 3
+                lookaround = True
+            elif head[:2] in ("?=", "?!"):
+                self.pos += 2
+                lookaround = True
+            elif head[:2] == "?<":
+                end = self.s.find(">", self.pos)
+                if end == -1:
+                    raise _Unsupported("(?<")
+                self.pos = end + 1
+            else:
+                raise _Unsupported("(?")
+        branches = self.alternation()
+        if self.peek() != ")":
+            raise _Unsupported("(")
+        self.pos += 1
+        if lookaround:
+            return "assert", None
+        # 가지가 여럿이면 그중 어느 것도 필수가 아니다
+        return "group", branches[0] if len(branches) == 1 else []
+
+    def _escape(self) -> tuple[str, object]:
+        c = self.peek()
+        if not c:
+            raise _Unsupported("\\")
+        self.pos += 1
+        if c in "bB":
+            return "assert", None
+        if c in "dDwWsS":
+            return "other", None
+        if c in "pP" and self.unicode:
+            end = self.s.find("}", self.pos)
+            if self.peek() != "{" or end == -1:
+                raise _Unsupported("\\p")
+            self.pos = end + 1
+            return "other", None
+        if c == "k":
+            if self.peek() == "<":
+                end = self.s.find(">", self.pos)
+                self.pos = end + 1 if end != -1 else self.pos
+            return "other", None
+        if c.isdigit() and c != "0" or (c == "0" and self.peek().isdigit()):
+            while self.peek().isdigit():
+                self.pos += 1
+            return "other", None            # 역참조 / 옛 8진수
+        if c == "0":
+            return "char", "\0"
+        if c in _ESCAPE_CHARS:
+            return "char", _ESCAPE_CHARS[c]
+        if c == "c":
+            if self.peek().isascii() and self.peek().isalpha():
+                self.pos += 1
+                return "char", chr(ord(self.s[self.pos - 1]) % 32)
+            return "other", None
+        if c == "x":
+            m = _HEX2.match(self.s, self.pos)
+            if m:
+                self.pos = m.end()
+                return "char", chr(int(m.group(), 16))
+            return "char", "x"
+        if c == "u":
+            if self.unicode and self.peek() == "{":
+                m = _CODE_POINT.match(self.s, self.pos)
+                if m is None:
+                    raise _Unsupported("\\u{")
+                self.pos = m.end()
+                return "char", chr(int(m.group(1), 16))
+            m = _HEX4.match(self.s, self.pos)
+            if m:
+                self.pos = m.end()
+                return "char", chr(int(m.group(), 16))
+            return "char", "u"
+        return "char", c                    # \. \/ \- 등 그대로
+
+
+@lru_cache(maxsize=8192)
+def _required(source: str, flags: str) -> tuple[str, ...] | None:
+    if "i" in flags or "v" in flags:
+        return None
+    parser = _Parser(source, "u" in flags)
+    try:
+        branches = parser.alternation()
+    except _Unsupported:
+        return None
+    if parser.pos != len(source):
+        return None                         # 짝 없는 ) 등
+    literals = []
+    for runs in branches:
+        if not runs:
+            return None
+        best = max(runs, key=len)[:MAX_LITERAL]
+        if best not in literals:
+            literals.append(best)
+    return tuple(literals)
+
+
+def required_literals(source: str, flags: str = "") -> list[str] | None:
+    """매치되려면 이 중 하나는 target 에 반드시 들어 있어야 하는 문자열들 (모르면 None)"""
+    result = _required(source, flags or "")
+    return None if result is None else list(result)
+
+
+def matcher_literals(m: dict) -> list[str] | None:
+    """payload matcher dict → required_literals (raw 면 None)"""
+    spec = m.get("regex")
+    if isinstance(spec, dict):
+        return required_literals(spec.get("pattern") or "", spec.get("flags") or "")
+    if isinstance(spec, str):
+        return required_literals(spec)
+    return None
+
+
+# ────────────────────────────────────────────────────────
+# category 단위 색인
+# ────────────────────────────────────────────────────────
+def _trie_pattern(words) -> str:
+    """문자열 집합 → 트라이 모양 정규식 (같은 위치에서는 가장 긴 것이 먼저 잡힌다)"""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if "" in node:
+            alts.append("")
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return emit(trie)
+
+
+class LiteralIndex:
+    """
+    entries: [(matcher 위치, 리터럴 목록), …] — 목록이 None 인 위치는 항상 실행
+    allowed(text) → 실행해 볼 matcher 위치 집합
+    """
+
+    def __init__(self, entries: list[tuple[int, list[str] | None]]):
+        owners: dict[str, set[int]] = {}
+        always = set()
+        for i, literals in entries:
+            if literals is None:
+                always.add(i)
+            else:
+                for lit in literals:
+                    owners.setdefault(lit, set()).add(i)
+        self.always = frozenset(always)
+        self.filtered = len(entries) - len(always)
+        # 각 위치에서 가장 긴 리터럴만 잡히므로, 그 안에 든 더 짧은 리터럴 주인까지 미리 합쳐 둔다
+        self._hits = {
+            lit: frozenset(chain.from_iterable(
+                owners[lit[a:b]] for a in range(len(lit)) for b in range(a + 1, len(lit) + 1)
+                if lit[a:b] in owners))
+            for lit in owners
+        }
+        self._rx = re.compile("(?=(" + _trie_pattern(owners) + "))")
+
+    def allowed(self, text: str) -> frozenset[int]:
+        found = {m.group(1) for m in self._rx.finditer(text)}
+        if not found:
+            return self.always
+        return self.always.union(*(self._hits[f] for f in found))
+
+
+def build_index(matchers: list[dict]) -> LiteralIndex | None:
+    """priority 순으로 정렬된 한 category 의 regex matcher 들 → 색인 (효과 없으면 None)"""
+    index = LiteralIndex([(i, matcher_literals(m)) for i, m in enumerate(matchers)])
+    return index if index.filtered >= MIN_FILTERED else None
+
+
+def literal_report(matchers: list[dict]) -> dict[str, dict]:
+    """category → {"regex": regex 개수, "filtered": 리터럴로 거를 수 있는 개수}"""
+    report: dict[str, dict] = {}
+    for m in matchers:
+        if "regex" not in m:
+            continue
+        row = report.setdefault(str(m.get("category")), {"regex": 0, "filtered": 0})
+        row["regex"] += 1
+        if matcher_literals(m) is not None:
+            row["filtered"] += 1
+    return report
@@ -0,0 +1,212 @@
+# core/rebuild.py
+"""
+latest.json / latest.svg 재빌드 스케줄러
+
+• 저장·삭제 시그널은 commit 후 mark_dirty() 만 호출 → 요청 스레드는 빌드하지 않음
+• 프로세스마다 데몬 스레드 하나가 debounce 창 안의 요청을 모아 한 번만 빌드
+• 빌드는 BUILD_ROOT/.rebuild.lock (flock) 으로 gunicorn 워커 간 단일 실행
+• 결과물은 write-then-rename 으로 교체, 내용이 바뀐 빌드마다 generation 1 씩 증가
+• 번역 상태 재계산(core/status.py)은 락 안에서 대상만 정하고, 행 평가는 락을 놓은 뒤 별도 스레드에서
+"""
+import fcntl
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+from .delta import record_delta
+from .etags import load_manifest
+from .graphrender import schedule_render
+from .status import plan_after_build, run_pending
+from .views import build_translation_payload, content_digest, snapshot_latest, write_payload
+
+LOCK_NAME = ".rebuild.lock"
+DIRTY_NAME = ".rebuild.dirty"
+GENERATION_NAME = "generation"
+
+
+def _root() -> Path:
+    root = Path(settings.BUILD_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+@contextmanager
+def build_lock():
+    """프로세스 간 배타 락 (빌드/게시 구간 전체를 감싼다)"""
+    with open(_root() / LOCK_NAME, "a") as fp:
+        fcntl.flock(fp, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+
+# ────────────────────────────────────────────────────────
+# dirty 표시: 파일 내용 = 첫 요청 시각, mtime = 마지막 요청 시각
+# ────────────────────────────────────────────────────────
+def mark_dirty() -> None:
+    path = _root() / DIRTY_NAME
+    now = time.time()
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        os.utime(path, (now, now))
+    else:
+        with os.fdopen(fd, "w") as fp:
+            fp.write(repr(now))
+
+    if getattr(settings, "REBUILD_ASYNC", True):
+        _worker.wake()
+
+
+def _pending() -> tuple[float, float] | None:
+    """(첫 요청 시각, 마지막 요청 시각) — 요청이 없으면 None"""
+    path = _root() / DIRTY_NAME
+    try:
+        last = path.stat().st_mtime
+        text = path.read_text()
+    except FileNotFoundError:
+        return None
+    try:
+        first = float(text)
+    except ValueError:  # 막 생성돼 아직 내용이 없는 경우
+        first = last
+    return first, max(first, last)
+
+
+def read_generation() -> int:
+    try:
+        return int((_root() / GENERATION_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _write_generation(generation: int) -> None:
+    path = _root() / GENERATION_NAME
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(str(generation))
+    os.replace(tmp, path)
+
+
+def _publish(*, snapshot: bool, full: bool = False) -> int:
+    """
+    락을 잡은 상태에서 호출: 빌드 1회 + generation 증가.
+    내용(time / generation 제외)이 직전 게시본과 같으면 파일을 건드리지 않는다
+    → ETag 가 그대로라 폴링 클라이언트는 계속 304 를 받는다.
+    """
+    (_root() / DIRTY_NAME).unlink(missing_ok=True)
+    payload = build_translation_payload(full=full)
+    content = content_digest(payload)
+    if content == load_manifest().get("content") and (_root() / "latest.json").exists():
+        generation = read_generation()
+        schedule_render(payload["matchers"], generation=generation)    # 직전 SVG 렌더가 실패했으면 재시도
+        if snapshot:
+            snapshot_latest(generation=generation, matcher_count=len(payload["matchers"]))
+        return generation
+
+    generation = read_generation() + 1
+    payload["generation"] = generation
+    record_delta(generation, payload)      # latest.json 보다 먼저 → 새 generation 의 delta 는 항상 존재
+    write_payload(payload, snapshot=snapshot, content=content)
+    _write_generation(generation)
+    try:
+        plan_after_build(payload, generation)       # 바뀐 matcher 가 닿는 source 만 — 평가는 schedule_status
+    except Exception:
+        traceback.print_exc()
+    return generation
+
+
+def schedule_status() -> None:
+    """대기 중인 상태 재계산을 백그라운드로 (STATUS_ASYNC=False 면 이 스레드에서) — 빌드 락 밖에서 부른다"""
+    if getattr(settings, "TRANSLATION_STATUS_ASYNC", True):
+        _status_worker.wake()
+    else:
+        run_pending()
+
+
+# ────────────────────────────────────────────────────────
+# 공개 API
+# ────────────────────────────────────────────────────────
+def rebuild_pending() -> int | None:
+    """
+    대기 중인 요청이 있으면 debounce 후 한 번 빌드하고 generation 반환.
+    없으면(다른 프로세스가 이미 처리) None.
+    """
+    debounce = getattr(settings, "REBUILD_DEBOUNCE", 2.0)
+    max_delay = getattr(settings, "REBUILD_MAX_DELAY", 30.0)
+
+    def wait_left():
+        pending = _pending()
+        if pending is None:
+            return None
+        first, last = pending
+        # 마지막 요청 후 debounce 만큼 조용해지거나, 첫 요청 후 max_delay 가 지나면 빌드
+        return min(last + debounce, first + max_delay) - time.time()
+
+    while True:
+        # 기다리는 동안은 락을 잡지 않는다 — rebuild_now / coverage 등이 그사이 락을 쓸 수 있게
+        wait = wait_left()
+        if wait is None:
+            return None
+        if wait > 0:
+            time.sleep(wait)
+            continue
+        with build_lock():
+            wait = wait_left()              # 락을 기다리는 사이 다른 프로세스가 빌드했거나 새 요청이 왔을 수 있다
+            if wait is None:
+                return None
+            if wait > 0:
+                continue
+            generation = _publish(snapshot=False)
+        schedule_status()
+        return generation
+
+
+def rebuild_now(*, snapshot: bool = False, full: bool = False) -> int:
+    """debounce 없이 즉시 빌드 (Generate translation file 버튼 등)"""
+    with build_lock():
+        generation = _publish(snapshot=snapshot, full=full)
+    schedule_status()
+    return generation
+
+
+class _RebuildWorker:
+    """프로세스당 하나의 데몬 스레드 — 깨울 때마다 drain() 이 None 을 돌려줄 때까지 대기 요청을 소진"""
+
+    def __init__(self, drain, name: str):
+        self._drain = drain
+        self._name = name
+        self._event = threading.Event()
+        self._guard = threading.Lock()
+        self._thread = None
+
+    def wake(self) -> None:
+        with self._guard:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True
+                )
+                self._thread.start()
+        self._event.set()
+
+    def _run(self) -> None:
+        while True:
+            self._event.wait()
+            self._event.clear()
+            try:
+                while self._drain() is not None:
+                    pass
+            except Exception:
+                traceback.print_exc()
+            finally:
+                connection.close()
+
+
+_worker = _RebuildWorker(rebuild_pending, "translation-rebuild")
+_status_worker = _RebuildWorker(run_pending, "translation-status")     # 빌드 스레드가 코퍼스 평가를 기다리지 않게
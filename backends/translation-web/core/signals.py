@@ -1,19 +1,20 @@
 # core/signals.py
-import requests, datetime, json
+import datetime, json
+from collections import Counter
 from django.conf import settings
 from django.dispatch import receiver
 from django.db.models.signals import post_save, post_delete
 from django.utils.timezone import now
 
-from .models import Matcher, TranslationData
+from .models import Matcher, Source, TranslationData, adjust_facet, adjust_row_counts
 from .utils import matcher_to_dict, td_to_dict
 from django.contrib.contenttypes.models import ContentType  # ✔
 from django.contrib.admin.models import LogEntry  # ✔ 이 줄 추가
 from django.db.models.signals import pre_delete, post_delete, post_save
 from django.dispatch import receiver
 from .middleware import get_current_username
+from .outbox import enqueue
 
-WEBHOOK = settings.WEBHOOK_URL
 BASE = settings.EXTERNAL_URL.rstrip("/")
 
 
@@ -42,13 +43,8 @@ def td_deleted(sender, instance, **kwargs):
 
 
 def _send_to_discord(data: dict):
-    if not WEBHOOK:
-        return
-    try:
-        r = requests.post(WEBHOOK, json=data, timeout=3)
-        r.raise_for_status()
-    except Exception as e:
-        print("Discord webhook error:", e)
+    # 요청 안에서 보내지 않고 outbox 에 기록 → 백그라운드 sender 가 전송 (core/outbox.py)
+    enqueue(data)
 
 
 def _td_embed(instance, action):
@@ -131,30 +127,119 @@ def _matcher_embed(instance, action):
         }]
     }
 from django.db import models, transaction
-from .views import build_translation_payload, write_payload
+from .batching import current_batch
+from .grouprefs import sync_refs
+from .rebuild import mark_dirty
+from .status import refresh_rows
+
+SUMMARY_LINES = 25      # 요약 웹훅에 나열할 최대 행 수 (나머지는 개수만)
 # ─────────────────────────────────────────────────────────────
+# 빌드는 rebuild 스케줄러가 모아서 처리 → 여기서는 dirty 표시만
+# bulk_signals() 범위 안이면 기록만 하고 범위 끝에서 한 번에 (core/batching.py)
 @receiver(post_save, sender=Matcher)
-def matcher_saved(sender, instance, created, **kwargs):
+def matcher_saved(sender, instance, created, update_fields=None, **kwargs):
     action = "created" if created else "updated"
+    refs = update_fields is None or "groups" in update_fields
+    deltas = _deltas(instance, created, "category")
+    batch = current_batch()
+    if batch is not None:
+        batch.note_matchers(action, [instance], refs=refs)
+        batch.categories.update(deltas)
+        return
+    # groups 역색인은 같은 트랜잭션 안에서 맞춘다 (삭제는 CASCADE)
+    if refs:
+        sync_refs([instance])
+    adjust_facet("category", deltas)
     _send_to_discord(_matcher_embed(instance, action))
-    payload = build_translation_payload()
-    transaction.on_commit(lambda *args: write_payload(payload, snapshot=False))
+    transaction.on_commit(mark_dirty)
 
 
 @receiver(post_delete, sender=Matcher)
 def matcher_deleted(sender, instance, **kwargs):
+    batch = current_batch()
+    if batch is not None:
+        batch.note_matchers("deleted", [instance])
+        batch.categories[instance.category] -= 1
+        return
+    adjust_facet("category", {instance.category: -1})
     _send_to_discord(_matcher_embed(instance, "deleted"))
-    payload = build_translation_payload()
-    transaction.on_commit(lambda *args: write_payload(payload, snapshot=False))
+    transaction.on_commit(mark_dirty)
 
 # ── TranslationData ───────────────────────────────────────
 @receiver(post_save, sender=TranslationData)
 def td_saved(sender, instance, created, **kwargs):
     verb = "created" if created else "updated"
+    auto = getattr(settings, "TRANSLATION_STATUS_AUTO", True)
+    deltas = _deltas(instance, created, "source_id", "status")
+    batch = current_batch()
+    if batch is not None:
+        batch.note_rows(verb, [instance], refresh=auto)
+        batch.sources.update(deltas)
+        return
+    adjust_row_counts(deltas)
     _send_to_discord(_td_embed(instance, verb))
+    # 내용이 바뀌었을 수 있으니 이 행만 번역 상태 다시 계산
+    if auto:
+        pk = instance.pk
+        transaction.on_commit(lambda: refresh_rows([pk]))
 
 
 @receiver(post_delete, sender=TranslationData)
 def td_deleted(sender, instance, **kwargs):
+    batch = current_batch()
+    if batch is not None:
+        batch.note_rows("deleted", [instance])
+        batch.sources[instance.source_id, instance.status] -= 1
+        return
+    adjust_row_counts({(instance.source_id, instance.status): -1})
     _send_to_discord(_td_embed(instance, 'deleted'))
 
+
+def _deltas(instance, created, *fields) -> Counter:
+    """
+    저장 한 번이 값별 행 수(Source.rows·상태별 개수 / category facet)에 주는 증감
+    새 행 +1, field 를 바꾼 행은 옛 값 -1 / 새 값 +1 (옛 값은 from_db 가 _loaded_<field> 로 남긴다)
+    field 가 여럿이면 키는 그 값들의 tuple
+    """
+    new = tuple(getattr(instance, f) for f in fields)
+    old = None if created else tuple(getattr(instance, f"_loaded_{f}", None) for f in fields)
+    if old is not None and None in old:
+        old = None
+    deltas = Counter()
+    if created or (old is not None and old != new):
+        deltas[new if len(fields) > 1 else new[0]] += 1
+        if old is not None:
+            deltas[old if len(fields) > 1 else old[0]] -= 1
+    for f, value in zip(fields, new):
+        setattr(instance, f"_loaded_{f}", value)
+    return deltas
+
+
+# ── 대량 작업 요약 ────────────────────────────────────────
+def _summary_embed(batch) -> dict:
+    lines, total = [], sum(batch.counts.values())
+    for action, pk, category, pattern in batch.matchers[:SUMMARY_LINES]:
+        short = pattern if len(pattern) <= 60 else pattern[:59] + "…"
+        lines.append(f"[#{pk}]({BASE}/admin/core/matcher/{pk}/change/) {action} `{category}` `{short}`")
+    rows = batch.rows[:max(SUMMARY_LINES - len(lines), 0)]
+    names = dict(Source.objects.filter(pk__in={s for _, _, s in rows}).values_list("pk", "name"))
+    for action, pk, source_id in rows:
+        lines.append(f"[#{pk}]({BASE}/admin/core/translationdata/{pk}/change/) {action} "
+                     f"`{names.get(source_id, source_id)}`")
+    if total > len(lines):
+        lines.append(f"… and {total - len(lines):,} more")
+
+    counts = [f"{n:,} {kind} {action}" for (kind, action), n in batch.counts.items()]
+
+    return {
+        "content": f"{batch.label}: {', '.join(counts)} ({batch.actor})",
+        "embeds": [{
+            "description": "\n".join(lines)[:4000],
+            "timestamp": now().isoformat()
+        }]
+    }
+
+
+def send_batch_summary(batch) -> None:
+    """bulk_signals() 범위 하나 = 웹훅 한 건"""
+    _send_to_discord(_summary_embed(batch))
@@ -0,0 +1,316 @@
+# core/snapshots.py
+"""
+"Generate translation file" 스냅샷 저장소
+
+• 내용 주소(content-addressed): 파일 이름 = 원본 sha256 → 같은 빌드는 한 번만 저장
+  BUILD_ROOT/.objects/<해시 앞 2자리>/<해시>.gz
+• JSON 은 직전 스냅샷 대비 matcher 단위 delta 로 저장 (체인 깊이 SNAPSHOT_DELTA_CHAIN 까지)
+  delta = {"changed": {id: 줄}, "removed": [id], "tail": 마지막 줄}
+• 메타데이터는 Snapshot / SnapshotBlob 테이블 → 목록 페이지가 디렉터리를 훑지 않음
+• 보관 정책: 최근 SNAPSHOT_KEEP_LAST 개 + SNAPSHOT_KEEP_DAYS 일 이내는 유지, 나머지는 GC
+  저장 때는 SNAPSHOT_GC_EVERY 개마다 한 번만 (DB 만), 고아 파일 훑기는 manage.py snapshots --gc 에서만
+• /build/translation_file_*.json|svg 주소는 그대로 (serve_build 가 여기서 복원해 보냄)
+• 압축 전송: delta 가 아닌 blob 의 gzip 은 저장 파일 그대로, 그 밖의 인코딩(delta 면 gzip 도)은
+  처음 요청될 때 한 번 복원·압축해 <해시>.body.br|.zst|.gz 로 캐시 (GC 때 함께 삭제)
+• 압축 없이 / Range 로 받는 요청은 복원한 원본을 <해시>.body 로 한 번 써 두고 seek 해서 보낸다
+"""
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .encodings import SUFFIXES, choose_encoding
+from .models import Snapshot, SnapshotBlob
+
+OBJECTS_DIR = ".objects"
+PAYLOAD_HEAD = '{"matchers":[\n'     # views.dump_payload() 형식: matcher 한 줄에 하나
+MATERIALIZED_CACHE = 4
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _objects_root() -> Path:
+    return Path(settings.BUILD_ROOT) / OBJECTS_DIR
+
+
+def _object_path(digest: str) -> Path:
+    return _objects_root() / digest[:2] / f"{digest}.gz"
+
+
+def _variant_path(digest: str, suffix: str) -> Path:
+    return _objects_root() / digest[:2] / f"{digest}.body{suffix}"
+
+
+def _write_object(digest: str, data: bytes) -> int:
+    path = _object_path(digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    packed = gzip.compress(data, compresslevel=9, mtime=0)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(packed)
+    os.replace(tmp, path)
+    return len(packed)
+
+
+# ────────────────────────────────────────────────────────
+# payload 텍스트 ↔ {id: matcher 줄}
+# ────────────────────────────────────────────────────────
+def _split_payload(text: str) -> tuple[dict[int, str], str] | None:
+    """dump_payload() 형식이 아니면 None (그 경우 delta 없이 통째 저장)"""
+    if not text.startswith(PAYLOAD_HEAD):
+        return None
+    body, sep, tail = text[len(PAYLOAD_HEAD):].rpartition("\n]")
+    if not sep:
+        return None
+    lines = body.split(",\n") if body else []
+    entries = {}
+    for line in lines:
+        try:
+            entries[json.loads(line)["id"]] = line
+        except (ValueError, KeyError, TypeError):
+            return None
+    if len(entries) != len(lines) or list(entries) != sorted(entries):
+        return None
+    return entries, tail
+
+
+def _join_payload(entries: dict[int, str], tail: str) -> str:
+    return PAYLOAD_HEAD + ",\n".join(entries[k] for k in sorted(entries)) + "\n]" + tail
+
+
+def _apply_delta(base: dict[int, str], delta: dict) -> str:
+    entries = {k: v for k, v in base.items() if k not in set(delta["removed"])}
+    entries.update({int(k): v for k, v in delta["changed"].items()})
+    return _join_payload(entries, delta["tail"])
+
+
+def _make_delta(base_data: bytes, data: bytes) -> bytes | None:
+    base = _split_payload(base_data.decode("utf-8"))
+    new = _split_payload(data.decode("utf-8"))
+    if base is None or new is None:
+        return None
+    old_entries, new_entries, tail = base[0], new[0], new[1]
+    delta = {
+        "changed": {str(k): v for k, v in new_entries.items() if old_entries.get(k) != v},
+        "removed": sorted(old_entries.keys() - new_entries.keys()),
+        "tail": tail,
+    }
+    # 복원 결과가 바이트 단위로 같을 때만 delta 사용
+    if _apply_delta(old_entries, delta).encode("utf-8") != data:
+        return None
+    return json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ────────────────────────────────────────────────────────
+# blob 읽기/쓰기
+# ────────────────────────────────────────────────────────
+_materialized: OrderedDict[str, bytes] = OrderedDict()
+_materialized_lock = threading.Lock()        # serve_build 요청 스레드 + 재빌드 스레드가 함께 쓴다
+
+
+def _remember(digest: str, data: bytes) -> None:
+    with _materialized_lock:
+        _materialized[digest] = data
+        _materialized.move_to_end(digest)
+        while len(_materialized) > MATERIALIZED_CACHE:
+            _materialized.popitem(last=False)
+
+
+def _forget(digest: str) -> None:
+    with _materialized_lock:
+        _materialized.pop(digest, None)
+
+
+def read_blob(blob: SnapshotBlob) -> bytes:
+    """delta 체인을 따라가 원본 바이트 복원 (최근 몇 개는 프로세스 캐시)"""
+    with _materialized_lock:
+        data = _materialized.get(blob.hash)
+        if data is not None:
+            _materialized.move_to_end(blob.hash)
+    if data is not None:
+        return data
+
+    raw = gzip.decompress(_object_path(blob.hash).read_bytes())
+    if blob.base_id:
+        base = _split_payload(read_blob(blob.base).decode("utf-8"))
+        data = _apply_delta(base[0], json.loads(raw)).encode("utf-8")
+    else:
+        data = raw
+
+    _remember(blob.hash, data)
+    return data
+
+
+def encoded_object(blob: SnapshotBlob, accept_encoding: str | None) -> tuple[Path, str, str] | None:
+    """
+    Accept-Encoding 에 맞는 압축본 (경로, Content-Encoding, 확장자) — 받는 인코딩이 없으면 None
+    delta 가 아닌 blob 의 gzip 은 저장 파일 그대로, 나머지는 처음 한 번 만들어 캐시
+    """
+    chosen = choose_encoding(accept_encoding)
+    if chosen is None:
+        return None
+    encoding, suffix, compress = chosen
+    if suffix == ".gz" and not blob.base_id:
+        path = _object_path(blob.hash)
+        return (path, encoding, suffix) if path.exists() else None
+
+    return _cached_variant(blob, suffix, compress), encoding, suffix
+
+
+def plain_object(blob: SnapshotBlob) -> Path:
+    """원본 바이트 파일 — Range / 압축 안 받는 요청이 매번 delta 체인을 메모리에 복원하지 않고 seek 해서 읽는다"""
+    return _cached_variant(blob, "", lambda data: data)
+
+
+def _cached_variant(blob: SnapshotBlob, suffix: str, transform) -> Path:
+    path = _variant_path(blob.hash, suffix)
+    if not path.exists():
+        # 같은 변형을 동시에 만들어도 각자 임시 파일 → 마지막 rename 이 이긴다 (내용은 같다)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(transform(read_blob(blob)))
+        os.replace(tmp, path)
+    return path
+
+
+def _store_blob(data: bytes, kind: str, *, base: SnapshotBlob | None = None) -> SnapshotBlob:
+    digest = hashlib.sha256(data).hexdigest()
+    existing = SnapshotBlob.objects.filter(pk=digest).first()
+    if existing is not None and _object_path(digest).exists():
+        return existing                       # 같은 내용 → 재사용
+
+    delta = None
+    if base is not None and base.depth < _setting("SNAPSHOT_DELTA_CHAIN", 10):
+        delta = _make_delta(read_blob(base), data)
+        if delta is not None and len(delta) * 2 > len(data):
+            delta = None                      # 절반 이상 바뀌었으면 통째 저장이 낫다
+
+    if delta is not None:
+        stored = _write_object(digest, delta)
+        fields = dict(base=base, depth=base.depth + 1)
+    else:
+        stored = _write_object(digest, data)
+        fields = dict(base=None, depth=0)
+
+    blob, _ = SnapshotBlob.objects.update_or_create(
+        hash=digest,
+        defaults=dict(kind=kind, size=len(data), stored_size=stored, **fields),
+    )
+    _remember(digest, data)
+    return blob
+
+
+def _unique_name(base_name: str) -> str:
+    name, n = base_name, 1
+    while Snapshot.objects.filter(name=name).exists():
+        n += 1
+        name = f"{base_name}_{n}"
+    return name
+
+
+def store_snapshot(json_data: bytes, svg_data: bytes | None, *,
+                   generation: int = 0, matcher_count: int = 0,
+                   created_at: datetime.datetime | None = None) -> Snapshot:
+    """빌드 결과를 스냅샷으로 등록하고 SNAPSHOT_GC_EVERY 개마다 보관 정책에 따라 정리"""
+    explicit_time = created_at is not None
+    created_at = created_at or timezone.now()
+    with transaction.atomic():
+        prev = Snapshot.objects.select_related("json_blob").first()
+        json_blob = _store_blob(json_data, SnapshotBlob.KIND_JSON,
+                                base=prev.json_blob if prev else None)
+        svg_blob = _store_blob(svg_data, SnapshotBlob.KIND_SVG) if svg_data is not None else None
+
+        local_ts = timezone.localtime(created_at).strftime("%Y%m%d_%H%M%S")
+        snap = Snapshot.objects.create(
+            name=_unique_name(f"translation_file_{local_ts}"),
+            generation=generation,
+            matcher_count=matcher_count,
+            json_blob=json_blob,
+            svg_blob=svg_blob,
+        )
+        if explicit_time:                         # 예전 파일 가져오기 등
+            Snapshot.objects.filter(pk=snap.pk).update(created_at=created_at)
+            snap.created_at = created_at
+    every = _setting("SNAPSHOT_GC_EVERY", 20)
+    if every and snap.pk % every == 0:            # 매번 전체 blob·스냅샷을 훑지 않도록
+        collect_garbage()
+    return snap
+
+
+def attach_svg(snapshot_id: int, svg_data: bytes) -> None:
+    """SVG 없이 등록된 스냅샷에 나중에 끝난 렌더 결과를 붙인다 (core/graphrender.py)"""
+    with transaction.atomic():
+        blob = _store_blob(svg_data, SnapshotBlob.KIND_SVG)
+        Snapshot.objects.filter(pk=snapshot_id, svg_blob__isnull=True).update(svg_blob=blob)
+
+
+def find_snapshot_file(filename: str) -> tuple[Snapshot, SnapshotBlob] | None:
+    """'translation_file_….json' / '.svg' → (Snapshot, blob)"""
+    stem, dot, ext = filename.rpartition(".")
+    if not dot or ext not in ("json", "svg"):
+        return None
+    snap = Snapshot.objects.select_related("json_blob", "svg_blob").filter(name=stem).first()
+    if snap is None:
+        return None
+    blob = snap.json_blob if ext == "json" else snap.svg_blob
+    return (snap, blob) if blob is not None else None
+
+
+# ────────────────────────────────────────────────────────
+# 보관 정책 / GC
+# ────────────────────────────────────────────────────────
+def collect_garbage(*, dry_run: bool = False, sweep: bool = False) -> dict:
+    """
+    • 최근 SNAPSHOT_KEEP_LAST 개, SNAPSHOT_KEEP_DAYS 일 이내 스냅샷은 유지
+    • 어떤 스냅샷도(delta 기준으로도) 쓰지 않는 blob 삭제
+    • sweep=True → .objects 전체를 훑어 DB 에 없는 고아 파일도 (manage.py snapshots --gc)
+    """
+    keep_last = _setting("SNAPSHOT_KEEP_LAST", 100)
+    keep_days = _setting("SNAPSHOT_KEEP_DAYS", 90)
+    cutoff = timezone.now() - datetime.timedelta(days=keep_days)
+
+    recent = list(Snapshot.objects.values_list("pk", flat=True)[:keep_last])
+    doomed = Snapshot.objects.exclude(pk__in=recent).filter(created_at__lt=cutoff)
+    doomed_ids = list(doomed.values_list("pk", flat=True))
+
+    # 살아 있는 blob = 남는 스냅샷이 가리키는 blob + 그 delta 기준 체인
+    bases = dict(SnapshotBlob.objects.values_list("hash", "base_id"))
+    live = set()
+    for json_id, svg_id in Snapshot.objects.exclude(pk__in=doomed_ids) \
+            .values_list("json_blob_id", "svg_blob_id"):
+        for h in (json_id, svg_id):
+            while h and h not in live:
+                live.add(h)
+                h = bases.get(h)
+    dead = [h for h in bases if h not in live]
+
+    if not dry_run:
+        with transaction.atomic():
+            Snapshot.objects.filter(pk__in=doomed_ids).delete()
+            # delta 기준(PROTECT)보다 파생 blob 을 먼저 지운다
+            depth = dict(SnapshotBlob.objects.filter(hash__in=dead).values_list("hash", "depth"))
+            for h in sorted(dead, key=lambda h: -depth.get(h, 0)):
+                SnapshotBlob.objects.filter(pk=h).delete()
+        for h in dead:
+            _object_path(h).unlink(missing_ok=True)
+            for suffix in ("", *SUFFIXES):
+                _variant_path(h, suffix).unlink(missing_ok=True)
+            _forget(h)
+        # DB 에 없는 파일(롤백된 저장 등) 정리 — 진행 중인 저장과 겹치지 않게 1시간 지난 것만
+        root = _objects_root()
+        orphan_before = timezone.now().timestamp() - 3600
+        if sweep and root.exists():
+            for path in root.glob("*/*"):
+                if path.name.partition(".")[0] not in bases and path.stat().st_mtime < orphan_before:
+                    path.unlink(missing_ok=True)
+
+    return {"snapshots": len(doomed_ids), "blobs": len(dead)}
@@ -0,0 +1,34 @@
+// core/static/core/js/matcher_impact.js
+// 저장 전에 "Preview impact" → 폼 내용 그대로 <id>/impact/ 로 POST, 결과 조각을 폼 아래에 표시
+document.addEventListener("DOMContentLoaded", () => {
+    const form = document.getElementById("matcher_form");
+    if (!form) return;
+    const url = location.pathname.replace(/(add|[^/]+\/change)\/$/, (m, p) => p === "add" ? "impact/" : p.replace(/change$/, "impact/"));
+    if (url === location.pathname) return;
+
+    const output = document.createElement("div");
+    output.className = "matcher-impact-output";
+    const button = document.createElement("button");
+    button.type = "button";
+    button.className = "btn btn-outline-secondary";
+    button.textContent = "Preview impact";
+    form.append(button, output);
+
+    button.addEventListener("click", async () => {
+        button.disabled = true;
+        output.textContent = "…";
+        try {
+            const resp = await fetch(url, {method: "POST", body: new FormData(form), credentials: "same-origin"});
+            if (resp.ok) {
+                output.innerHTML = await resp.text();
+            } else {
+                const {errors} = await resp.json();
+                output.textContent = Object.entries(errors || {}).map(([k, v]) => `${k}: ${v.join(" ")}`).join("\n");
+            }
+        } catch (e) {
+            output.textContent = String(e);
+        } finally {
+            button.disabled = false;
+        }
+    });
+});
@@ -20,9 +20,45 @@
     localStorage.SCRIPT_LATEST = localStorage.SCRIPT_LATEST || 'latest';
     window.translatorPromise = import((`https://cdn.jsdelivr.net/gh/refracta/dcss-webtiles-extension-module@${localStorage.SCRIPT_LATEST}/modules/translation-module/translator.js`));
     window.dataManagerPromise = import((`https://cdn.jsdelivr.net/gh/refracta/dcss-webtiles-extension-module@${localStorage.SCRIPT_LATEST}/modules/translation-module/data-manager.js`));
-    window.fetchPromise = fetch('/build/latest.json', {cache: "no-store"}).then((r) => r.json());
+    window.fetchPromise = fetchPayload();
 }()
 
+// latest.json 을 localStorage 에 두고 /build/delta 로 변경분만 받아 갱신
+async function fetchPayload() {
+    const KEY = 'TRANSLATION_PAYLOAD';
+    let cached = null;
+    try {
+        cached = JSON.parse(localStorage[KEY] || 'null');
+    } catch (e) {
+    }
+
+    let payload;
+    if (cached?.generation != null) {
+        try {
+            const delta = await fetch(`/build/delta?since=${cached.generation}`, {cache: "no-store"}).then((r) => r.json());
+            if (delta.full) {
+                payload = delta;
+            } else {
+                const byId = new Map(cached.matchers.map((m) => [m.id, m]));
+                delta.removed.forEach((id) => byId.delete(id));
+                delta.matchers.forEach((m) => byId.set(m.id, m));
+                const {matchers, removed, full, since, ...head} = delta;
+                payload = {...head, matchers: [...byId.values()].sort((a, b) => a.id - b.id)};
+            }
+        } catch (e) {
+        }
+    }
+    payload ||= await fetch('/build/latest.json', {cache: "no-store"}).then((r) => r.json());
+
+    try {
+        localStorage[KEY] = JSON.stringify(payload);
+    } catch (e) {   // 용량 초과 등 → 다음에 전체 다운로드
+        delete localStorage[KEY];
+    }
+    // Translator 가 matcher 객체를 직접 고치므로 캐시와 분리된 사본을 넘긴다
+    return structuredClone(payload);
+}
+
 
 const STATUS_BADGE = {
     "untranslated": {cls: "bg-danger", label: "Untranslated"},
@@ -0,0 +1,329 @@
+# core/status.py
+"""
+TranslationData 번역 상태 저장 (status / matched_matcher / status_generation)
+
+• recompute()        : 서버 측 Translator(core/translator.py)로 행을 평가해 바뀐 것만 저장
+• plan_after_build   : 재빌드 때 (빌드 락 안) 바뀐 matcher 의 category + 그것을 groups 로 참조하는
+                       category(역방향 전이)를 대기 목록(.status-pending.json)에 더하고 기준을 새 matcher 로
+• run_pending        : 대기 목록의 source 행만 다시 평가 — 락을 놓은 뒤 백그라운드에서,
+                       그사이 새 generation 이 게시되면 그만두고 목록은 남겨 둔다 (다음 실행이 합쳐서)
+• refresh_rows       : 새로 저장된 행의 pk 를 대기 목록(.status-pending-rows.json)에 더하고 상태 워커를 깨울 뿐
+                       → 요청 스레드는 Translator 를 컴파일하지 않는다, 평가는 run_pending 이
+• 기준 상태는 BUILD_ROOT/.status-index.json ({id: [category, 조각 해시]})
+  → 없으면 증분 갱신은 건너뛴다 (manage.py recompute_status 로 처음 한 번 전체 계산)
+• 상태를 바꿀 때마다 같은 트랜잭션에서 상태별 개수(FacetCount)도 증감 → admin 필터는 원본을 GROUP BY 하지 않는다
+"""
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from .grouprefs import referrer_map
+from .models import FacetCount, TranslationData, adjust_status_counts
+from .translator import UNTRANSLATED, Translator
+from .views import fragment_digests
+
+INDEX_NAME = ".status-index.json"
+PENDING_NAME = ".status-pending.json"
+PENDING_ROWS_NAME = ".status-pending-rows.json"
+PENDING_LOCK_NAME = ".status-pending.lock"
+CHUNK = 900          # pk__in / bulk_update 한 번당 행 수 (SQLite 변수 제한 대비)
+
+
+def _language() -> str:
+    return getattr(settings, "TRANSLATION_STATUS_LANGUAGE", "ko")
+
+
+def _index_path() -> Path:
+    return Path(settings.BUILD_ROOT) / INDEX_NAME
+
+
+def _load_index() -> dict[int, tuple[str, str]] | None:
+    try:
+        raw = json.loads(_index_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    return {int(k): tuple(v) for k, v in raw.items()}
+
+
+def save_index(matchers: list[dict]) -> None:
+    """이 matcher 집합 기준으로 상태가 계산됐음을 기록 (write-then-rename)"""
+    digests = fragment_digests({"matchers": matchers})
+    index = {str(m["id"]): [m["category"], digests[m["id"]]] for m in matchers}
+    path = _index_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def evaluate(translator: Translator, source: str, content: str) -> tuple[str, int | None]:
+    """한 행의 (totalStatus, 매치된 matcher id)"""
+    result = translator.translate(content, _language(), source)
+    status = result["totalStatus"]
+    matcher = result.get("matcher") if status != UNTRANSLATED else None
+    return status, (matcher or {}).get("id")
+
+
+def recompute(*, translator: Translator, generation: int, sources=None,
+              pending_only: bool = False, pk_range: tuple[int, int] | None = None,
+              per_source: Counter | None = None, progress=None) -> Counter:
+    """
+    행을 pk 순으로 CHUNK 개씩 평가. 상태/matcher 가 바뀐 행만 bulk_update,
+    status_generation 은 구간 UPDATE 한 번으로 일괄 기록.
+    pk_range=(lo, hi) → lo <= pk < hi 만, per_source 에는 (source, status) 별 개수를 더한다.
+    반환: 평가한 행의 상태별 개수
+    """
+    qs = TranslationData.objects.order_by("pk")
+    if pk_range is not None:
+        qs = qs.filter(pk__gte=pk_range[0], pk__lt=pk_range[1])
+    if sources is not None:
+        qs = qs.filter(source__name__in=list(sources))
+    if pending_only:
+        qs = qs.filter(status=TranslationData.STATUS_PENDING)
+
+    counts = Counter()
+    last_pk = 0
+    while True:
+        rows = list(qs.filter(pk__gt=last_pk)
+                    .values_list("pk", "source_id", "source__name", "content", "status", "matched_matcher_id")[:CHUNK])
+        if not rows:
+            break
+        changed, moved = [], Counter()
+        for pk, source_id, source, content, old_status, old_matcher in rows:
+            status, matcher_id = evaluate(translator, source, content)
+            counts[status] += 1
+            if per_source is not None:
+                per_source[source, status] += 1
+            if status != old_status or matcher_id != old_matcher:
+                changed.append(TranslationData(pk=pk, status=status, matched_matcher_id=matcher_id))
+            if status != old_status:
+                moved[source_id, old_status] -= 1
+                moved[source_id, status] += 1
+
+        first, last_pk = rows[0][0], rows[-1][0]
+        with transaction.atomic():
+            if changed:
+                TranslationData.objects.bulk_update(changed, ["status", "matched_matcher"], batch_size=CHUNK)
+                adjust_status_counts(moved)
+            qs.filter(pk__gte=first, pk__lte=last_pk).update(status_generation=generation)
+        if progress is not None:
+            progress(len(rows), counts)
+    return counts
+
+
+def referrers_of(matchers: list[dict]) -> dict[str, set[str]]:
+    """참조되는 category → 그것을 groups 로 참조하는 category (메모리 위 matcher 목록에서)"""
+    referrers: dict[str, set[str]] = {}
+
+    def walk(groups, owner):
+        for g in groups or ():
+            if isinstance(g, list):
+                walk(g, owner)
+            elif isinstance(g, str):
+                referrers.setdefault(g, set()).add(owner)
+
+    for m in matchers:
+        groups = m.get("groups")
+        if isinstance(groups, list):
+            walk(groups, m["category"])
+    return referrers
+
+
+def affected_categories(matchers: list[dict] | None, changed: set[str], *,
+                        referrers: dict[str, set[str]] | None = None) -> set[str]:
+    """
+    changed 와, groups 로 그것을 (직·간접) 참조하는 category 전부.
+    referrers 를 주면 그것을(DB 역색인 core/grouprefs.referrer_map), 없으면 matchers 를 훑는다
+    """
+    if referrers is None:
+        referrers = referrers_of(matchers)
+
+    result, stack = set(changed), list(changed)
+    while stack:
+        for owner in referrers.get(stack.pop(), ()):
+            if owner not in result:
+                result.add(owner)
+                stack.append(owner)
+    return result
+
+
+def _pending_path() -> Path:
+    return Path(settings.BUILD_ROOT) / PENDING_NAME
+
+
+def _load_pending() -> set[str]:
+    try:
+        return set(json.loads(_pending_path().read_text(encoding="utf-8")))
+    except (FileNotFoundError, ValueError):
+        return set()
+
+
+def _save_pending(sources: set[str]) -> None:
+    path = _pending_path()
+    if not sources:
+        path.unlink(missing_ok=True)
+        return
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(sorted(sources), ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _pending_rows_lock():
+    """행 대기 목록 읽기-쓰기 구간만 감싸는 짧은 락 — 요청 스레드가 빌드 락을 기다리지 않게"""
+    root = Path(settings.BUILD_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / PENDING_LOCK_NAME, "a") as fp:
+        fcntl.flock(fp, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+
+def _rows_path() -> Path:
+    return Path(settings.BUILD_ROOT) / PENDING_ROWS_NAME
+
+
+def _add_pending_rows(pks) -> None:
+    with _pending_rows_lock():
+        path = _rows_path()
+        try:
+            queued = set(json.loads(path.read_text(encoding="utf-8")))
+        except (FileNotFoundError, ValueError):
+            queued = set()
+        queued.update(pks)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(sorted(queued)), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def _take_pending_rows() -> list[int]:
+    """행 대기 목록을 비우고 그 pk 들을 반환"""
+    with _pending_rows_lock():
+        path = _rows_path()
+        try:
+            pks = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            pks = []
+        path.unlink(missing_ok=True)
+    return pks
+
+
+def plan_after_build(payload: dict, generation: int) -> set[str] | None:
+    """
+    rebuild._publish 에서 (빌드 락 안) 호출 — 다시 평가할 source 를 대기 목록에 더할 뿐, 행은 읽지 않는다
+    기준 상태가 없으면 None (전체 계산은 명령으로)
+    """
+    if not getattr(settings, "TRANSLATION_STATUS_AUTO", True):
+        return None
+    old = _load_index()
+    if old is None:
+        return None
+
+    matchers = payload["matchers"]
+    digests = fragment_digests(payload)
+    changed = set()
+    for m in matchers:
+        prev = old.pop(m["id"], None)
+        if prev is None or prev[1] != digests[m["id"]]:
+            changed.add(m["category"])
+            if prev is not None:
+                changed.add(prev[0])          # category 를 옮긴 경우 이전 쪽도
+    changed.update(category for category, _ in old.values())     # 삭제된 matcher
+
+    sources = set()
+    if changed:
+        # 방금 DB 에서 만든 payload → 역색인이 같은 상태, groups 를 다시 훑지 않는다
+        sources = affected_categories(None, changed, referrers=referrer_map())
+        _save_pending(_load_pending() | sources)
+    save_index(matchers)
+    return sources
+
+
+class _Superseded(Exception):
+    pass
+
+
+def run_pending() -> Counter | None:
+    """
+    대기 목록의 행·source 를 다시 평가 (빌드 락은 matcher 를 읽을 때와 목록을 비울 때만)
+    → 상태별 개수, 할 일이 없거나 새 generation 이 게시돼 그만뒀으면 None
+    """
+    from .rebuild import build_lock, read_generation
+    from .views import matcher_dicts
+
+    with build_lock():
+        sources, pks = _load_pending(), _take_pending_rows()
+        if not sources and not pks:
+            return None
+        matchers, generation = matcher_dicts(), read_generation()
+    translator = Translator(matchers, debug=True)
+
+    counts = Counter()
+    if pks:
+        try:
+            counts += _evaluate_rows(translator, pks, generation)
+        except Exception:
+            _add_pending_rows(pks)            # 다음 실행이 다시
+            raise
+    if not sources:
+        return counts
+
+    def check(n, counts):
+        if read_generation() != generation:
+            raise _Superseded                 # 다음 빌드가 목록에 더하고 다시 예약했다
+
+    try:
+        counts += recompute(translator=translator, generation=generation, sources=sources, progress=check)
+    except _Superseded:
+        return None
+    with build_lock():
+        if read_generation() != generation:
+            return None
+        _save_pending(_load_pending() - sources)
+    return counts
+
+
+def _evaluate_rows(translator: Translator, pks: list[int], generation: int) -> Counter:
+    """pk 로 고른 행만 평가해 저장 → 상태별 개수"""
+    counts = Counter()
+    for i in range(0, len(pks), CHUNK):
+        rows = (TranslationData.objects.filter(pk__in=pks[i:i + CHUNK])
+                .values_list("pk", "source_id", "source__name", "content", "status"))
+        changed, moved = [], Counter()
+        for pk, source_id, source, content, old_status in rows:
+            status, matcher_id = evaluate(translator, source, content)
+            counts[status] += 1
+            changed.append(TranslationData(pk=pk, status=status, matched_matcher_id=matcher_id,
+                                           status_generation=generation))
+            moved[source_id, old_status] -= 1
+            moved[source_id, status] += 1
+        with transaction.atomic():
+            TranslationData.objects.bulk_update(changed, ["status", "matched_matcher", "status_generation"])
+            adjust_status_counts(moved)
+    return counts
+
+
+def refresh_rows(pks: list[int]) -> None:
+    """새로 추가된 행을 평가 대기 목록에 더한다 (admin 저장 / bulk_signals 뒤) — 평가는 상태 워커가"""
+    from .rebuild import schedule_status
+
+    _add_pending_rows(pks)
+    schedule_status()
+
+
+def status_counts(source_id=None) -> dict[str, int]:
+    """상태별 행 수 — 전체 또는 source 하나, FacetCount 에서 읽는다 (많아야 상태 수만큼의 행)"""
+    statuses = [value for value, _ in TranslationData.STATUS_CHOICES]
+    if source_id is None:
+        rows = FacetCount.objects.filter(facet="status", value__in=statuses).values_list("value", "rows")
+        return dict(rows)
+    keys = {f"{source_id}:{value}": value for value in statuses}
+    rows = FacetCount.objects.filter(facet="source_status", value__in=keys).values_list("value", "rows")
+    return {keys[key]: n for key, n in rows}
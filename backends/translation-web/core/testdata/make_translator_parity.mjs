@@ -0,0 +1,128 @@
+// core/testdata/make_translator_parity.mjs
+// translator.js 결과를 기준값으로 저장 → core/tests.py 가 core/translator.py 와 비교
+//
+//   node core/testdata/make_translator_parity.mjs > core/testdata/translator_parity.json
+//
+import Translator from "../../../../modules/translation-module/translator.js";
+import DataManager from "../../../../modules/translation-module/data-manager.js";
+
+// ── 재현 가능한 의사 난수 (mulberry32) ─────────────────────────
+let seed = 20251018;
+const rand = () => {
+    seed |= 0; seed = seed + 0x6D2B79F5 | 0;
+    let t = Math.imul(seed ^ seed >>> 15, 1 | seed);
+    t = t + Math.imul(t ^ t >>> 7, 61 | t) ^ t;
+    return ((t ^ t >>> 14) >>> 0) / 4294967296;
+};
+const pick = (arr) => arr[Math.floor(rand() * arr.length)];
+
+let nextId = 1;
+const matchers = [];
+const add = (m) => matchers.push({...m, priority: m.priority ?? 0, id: nextId++});
+
+// ── 기본 사전 ──────────────────────────────────────────────
+const MONSTERS = {
+    "goblin": "고블린", "orc": "오크", "ogre": "오거", "hydra": "히드라", "rat": "쥐",
+    "jackal": "자칼", "kobold": "코볼트", "orc priest": "오크 사제", "deep elf": "딥 엘프",
+    "Sigmund": "지그문트", "Grinder": "그라인더", "Ijyb": "이집",
+};
+const ITEMS = {
+    "dagger": "단검", "long sword": "롱소드", "potion of curing": "치유의 물약",
+    "scroll of teleportation": "순간이동의 두루마리", "ring mail": "링 메일", "arrow": "화살",
+};
+for (const [en, ko] of Object.entries(MONSTERS)) add({category: "monster", raw: en, replaceValue: {ko}});
+for (const [en, ko] of Object.entries(ITEMS)) add({category: "item", raw: en, replaceValue: {ko, ja: en.toUpperCase()}});
+add({category: "item", raw: "arrow", replaceValue: {ko: "화살(중복)"}});      // 같은 raw → 뒤의 것
+add({category: "verb", raw: "hits", replaceValue: "때립니다"});
+add({category: "verb", raw: "misses", replaceValue: {ko: "빗나갑니다"}});
+add({category: "number", regex: "^(\\d+)$", replaceValue: "$1"});
+
+// ── 메시지 (재귀 그룹 + 조사) ──────────────────────────────
+add({category: "msg", regex: "^The (.+?) (hits|misses) you[.!]$",
+     replaceValue: {ko: "{$1:이} 당신을 $2."}, groups: ["monster", "verb"]});
+add({category: "msg", regex: "^You see (\\d+) (.+?)s?\\.$",
+     replaceValue: {ko: "{$2:을} $1개 봅니다."}, groups: ["number", ["item", "monster"]]});
+add({category: "msg", regex: "^(.+?) picks up (a|an|the) (.+)\\.$",
+     replaceValue: {ko: "{$1:이} {$3:을} 줍습니다."}, groups: [["monster"], null, ["item"]],
+     ignorePartTranslated: true});
+add({category: "msg", regex: "^(.+?) picks up (.+)\\.$",
+     replaceValue: {ko: "$1: $2 (부분)"}, groups: [["monster"], ["item"]], priority: 5});
+add({category: "msg", regex: "^You (?:feel|are) (.+)(!|\\.)$", replaceValue: {ko: "당신은 $1$2"},
+     groups: [["state"]]});
+add({category: "state", raw: "hungry", replaceValue: {ko: "배고픕니다"}});
+add({category: "msg", regex: {pattern: "^welcome, (\\w+)!$", flags: "i"},
+     replaceValue: {ko: "환영합니다, {$1:아}!"}});
+add({category: "msg", regex: "^(.+) and (.+)$", replaceValue: {ko: "$1 그리고 $2"},
+     groups: [["msg"], ["msg"]], priority: 9});
+
+// ── 정규식 호환 경계 사례 ───────────────────────────────────
+add({category: "edge", regex: "\\bcat\\b", replaceValue: "[고양이]"});
+add({category: "edge", regex: {pattern: "o", flags: "g"}, replaceValue: "0", priority: 1});
+add({category: "edge", regex: "^line$", replaceValue: "한 줄", priority: -1});
+add({category: "edge", regex: {pattern: "^second$", flags: "m"}, replaceValue: "둘째 줄", priority: -1});
+add({category: "edge", regex: "^a.b$", replaceValue: "점", priority: -1});
+add({category: "edge", regex: {pattern: "^x.y$", flags: "s"}, replaceValue: "점s", priority: -1});
+add({category: "edge", regex: "^(?<first>\\w+)-(?<second>\\w+)$", replaceValue: "$<second>/$<first>/$$/$&/$0/$9",
+     priority: -2});
+add({category: "edge", regex: "^\\d+원$", replaceValue: "숫자", priority: -1});
+add({category: "edge", regex: "^\\p{L}+!$", replaceValue: "글자!", priority: -1});
+add({category: "edge", regex: "^pre(.*)post$", replaceValue: "[$`|$'|$1]", priority: -1});
+add({category: "edge", regex: "^[^]{3}$", replaceValue: "세 글자", priority: -1});
+add({category: "edge", regex: {pattern: "^\\p{L}+\\?$", flags: "u"}, replaceValue: "유니코드 글자?", priority: -1});
+add({category: "edge", regex: {pattern: "^\\p{Script=Hangul}+~$", flags: "u"}, replaceValue: "한글~", priority: -1});
+add({category: "edge", regex: {pattern: "^\\u{1F600}$", flags: "u"}, replaceValue: "웃음", priority: -1});
+add({category: "edge", regex: "^(a)|(b)$", replaceValue: "<$1|$2>", groups: ["monster", "monster"], priority: -1});
+add({category: "edge", regex: "^\\u0041\\x42\\/C$", replaceValue: "이스케이프", priority: -1});
+add({category: "edge", regex: "(", replaceValue: "깨진 정규식"});                  // 컴파일 실패 → 건너뜀
+add({category: "edge", regex: "^(?<=x)never$", replaceValue: "lookbehind", priority: -1});
+
+// ── 특수 패턴 함수 ─────────────────────────────────────────
+add({category: "fn", raw: "pad", replaceValue: "[{가나a,6:PAD_END}]"});
+add({category: "fn", raw: "padstart", replaceValue: "[{<b>ab</b>&amp;,5:PAD_START_HTML}]"});
+add({category: "fn", raw: "rune", replaceValue: "{SORR:TO_KOREAN_RUNE}"});
+add({category: "fn", raw: "unknown", replaceValue: "{값:없는함수}"});
+add({category: "fn", raw: "escaped", replaceValue: "{a\\,b\\:c:을}"});
+add({category: "fn", raw: "paren", replaceValue: "{Zot:은} {책:은} {칼:이} {Orb:를} {길:로} {물:로} {산:으로}"});
+add({category: "fn", regex: "^give (.+) to (.+)$", replaceValue: {ko: "{$2:에게} {$1:을} 줍니다"},
+    groups: [["item"], ["monster"]]});
+add({category: "fn", regex: "^name: (.+)$", replaceValue: {ko: "{$1:이}라는 이름"}, groups: [["nomatch"]]});
+add({category: "nomatch", raw: "never", replaceValue: "x"});
+
+// ── 순환 없는 깊은 재귀 ────────────────────────────────────
+add({category: "list", regex: "^(.+?), (.+)$", replaceValue: "$1·$2", groups: [["monster"], ["list"]]});
+add({category: "list", regex: "^(.+)$", replaceValue: "$1", groups: [["monster"]], priority: 1});
+
+const cases = [];
+const push = (target, category, language = "ko") => cases.push({target, language, category});
+
+for (const m of [...Object.keys(MONSTERS), "dragon"]) {
+    push(`The ${m} hits you!`, "msg");
+    push(`The ${m} misses you.`, "msg");
+    push(`${m} picks up a dagger.`, "msg");
+    push(`${m} picks up the wand.`, "msg");
+}
+for (let i = 0; i < 120; i++) {
+    const item = pick([...Object.keys(ITEMS), "gem"]);
+    const n = Math.floor(rand() * 30);
+    push(`You see ${n} ${item}s.`, "msg", pick(["ko", "ko", "ja", "en"]));
+    push(`give ${item} to ${pick([...Object.keys(MONSTERS), "you"])}`, "fn", pick(["ko", "ja"]));
+    push(Array.from({length: 1 + Math.floor(rand() * 4)}, () => pick(Object.keys(MONSTERS))).join(", "), "list");
+}
+for (const t of [
+    "You feel hungry!", "You are confused.", "WELCOME, Bob!", "welcome, 철수!",
+    "The goblin hits you! and You feel hungry!", "cat", "concat", "a cat!", "고양이cat", "cat고양이",
+    "foo boo", "line", "line\n", "first\nsecond", "a\nb", "a\rb", "a b", "axb", "x\ny", "x\ry",
+    "left-right", "123원", "١٢٣원", "abc!", "한글!", "pre-mid-post", "a\nb\nc", "abc", "ab", "a", "b",
+    "AB/C", "never", "abc?", "한글?", "١٢?", "한글~", "abc~", "\u{1F600}",
+]) push(t, "edge");
+for (const t of ["pad", "padstart", "rune", "unknown", "escaped", "paren", "name: never", "name: bob"]) push(t, "fn");
+push("arrow", "item"); push("arrow", "item", "ja"); push("arrow", "item", "fr");
+push("dagger", "missing-category");
+push("12", "number");
+
+const translator = new Translator(structuredClone(matchers), DataManager.functions, false);
+for (const c of cases) {
+    c.expected = translator.translate(c.target, c.language, c.category);
+}
+
+process.stdout.write(JSON.stringify({matchers, cases}, null, 1) + "\n");
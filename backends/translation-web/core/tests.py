@@ -1,7 +1,35 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock, skipUnless
+
 from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import rebuild, views
+from core import (batch, compact, coverage, encodings, facets, graphrender, grouprefs, impact, jsregex, prefilter,
+                  snapshots, status)
+from core.admin import MatcherAdmin, SourceFacetFilter, TranslationStatusFilter
+from core.encodings import parse_accept_encoding
+from core.models import (CoverageSummary, FacetCount, Matcher, MatcherGroupRef, MatcherStats, Snapshot, SnapshotBlob,
+                         Source, TranslationData)
+from core.translator import Translator
+
+
+def make_row(source: str, content: str) -> TranslationData:
+    return TranslationData.objects.create(source=Source.objects.get_or_create(name=source)[0], content=content)
 
 
 class StatisticsEndpointTests(TestCase):
@@ -44,3 +72,1349 @@ class StatisticsEndpointTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["access-control-allow-origin"], "*")
+
+
+
+class BuildDirTestCase(TestCase):
+    """임시 BUILD_ROOT + 동기 재빌드 + 가짜 SVG 렌더"""
+
+    def setUp(self):
+        self.build_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.build_root, ignore_errors=True)
+        overrides = override_settings(
+            BUILD_ROOT=self.build_root, REBUILD_ASYNC=False, REBUILD_DEBOUNCE=0,
+            GRAPH_RENDER_ASYNC=False, TRANSLATION_STATUS_ASYNC=False,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        # Graphviz 바이너리 없이도 돌도록 렌더링만 대체
+        patcher = mock.patch("core.views.generate_category_graph", side_effect=self.fake_render)
+        self.render = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def fake_render(matchers, svg_path, **kwargs):
+        Path(f"{svg_path}.svg").write_text("<svg/>")
+
+    def create_matcher(self, raw):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Matcher.objects.create(category="cat", raw=raw, replace_value={"ko": raw})
+
+
+class RebuildSchedulerTests(BuildDirTestCase):
+
+    def test_save_only_marks_dirty(self):
+        with mock.patch("core.rebuild.build_translation_payload") as build:
+            self.create_matcher("a")
+        build.assert_not_called()
+        self.assertTrue((self.build_root / rebuild.DIRTY_NAME).exists())
+
+    def test_burst_is_coalesced_into_one_build(self):
+        for raw in ("a", "b", "c"):
+            self.create_matcher(raw)
+
+        self.assertEqual(rebuild.rebuild_pending(), 1)
+        self.assertIsNone(rebuild.rebuild_pending())
+        self.assertEqual(self.render.call_count, 1)
+
+        payload = json.loads((self.build_root / "latest.json").read_text())
+        self.assertEqual(payload["generation"], 1)
+        self.assertEqual(len(payload["matchers"]), 3)
+        self.assertTrue((self.build_root / "latest.svg").exists())
+        self.assertEqual([p.name for p in self.build_root.glob(".*.tmp*")], [])
+
+    def test_debounce_waits_outside_the_build_lock(self):
+        import fcntl
+        self.create_matcher("a")
+        held = []
+
+        def sleep(seconds):
+            with open(self.build_root / rebuild.LOCK_NAME, "a") as fp:     # 다른 열린 파일 → 잡혀 있으면 실패
+                try:
+                    fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    held.append(seconds)
+                else:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+            past = time.time() - 120                                        # 기다린 셈 치고 요청 시각을 당긴다
+            dirty = self.build_root / rebuild.DIRTY_NAME
+            dirty.write_text(repr(past))
+            os.utime(dirty, (past, past))
+
+        with override_settings(REBUILD_DEBOUNCE=60), \
+                mock.patch("core.rebuild.time.sleep", side_effect=sleep) as slept:
+            self.assertEqual(rebuild.rebuild_pending(), 1)
+        self.assertEqual((slept.call_count, held), (1, []))
+
+    def test_generation_is_monotonic(self):
+        self.create_matcher("a")
+        self.assertEqual(rebuild.rebuild_pending(), 1)
+        self.assertEqual(rebuild.rebuild_now(), 1)     # 내용이 같으면 재게시하지 않음
+        self.create_matcher("b")
+        self.assertEqual(rebuild.rebuild_pending(), 2)
+        self.assertEqual(rebuild.read_generation(), 2)
+
+
+class IncrementalPayloadTests(TestCase):
+    def setUp(self):
+        views._fragments.clear()
+        self.a = Matcher.objects.create(category="cat", raw="a", replace_value={"ko": "가"})
+        self.b = Matcher.objects.create(category="cat", regexp_source="^(b)$", replace_value={"ko": "나"},
+                                        groups=[["cat"]])
+
+    def build(self):
+        with mock.patch("core.views._to_dict", wraps=views._to_dict) as to_dict:
+            payload = views.build_translation_payload()
+        return payload, to_dict.call_count
+
+    def test_only_changed_rows_are_reserialized(self):
+        _, calls = self.build()
+        self.assertEqual(calls, 2)
+
+        self.a.replace_value = {"ko": "아"}
+        self.a.save()
+        payload, calls = self.build()
+        self.assertEqual(calls, 1)
+        self.assertEqual(payload["matchers"][0]["replaceValue"], {"ko": "아"})
+
+        self.b.delete()
+        payload, calls = self.build()
+        self.assertEqual(calls, 0)
+        self.assertEqual([m["id"] for m in payload["matchers"]], [self.a.pk])
+
+    def test_spliced_document_matches_plain_serialization(self):
+        payload, _ = self.build()
+        self.assertEqual(json.loads(views.dump_payload(payload)), payload)
+        self.assertEqual(payload["matchers"], [views._to_dict(self.a), views._to_dict(self.b)])
+
+    def test_concurrent_full_refresh_is_consistent(self):
+        rows = list(Matcher.objects.order_by("pk"))
+        objects = mock.Mock()                  # 다른 스레드는 테스트 트랜잭션을 못 보므로 DB 대신 메모리 행
+        objects.values_list.return_value = [(m.pk, m.updated_at) for m in rows]
+        objects.filter.side_effect = lambda pk__in: [m for m in rows if m.pk in pk__in]
+
+        original = views._to_dict
+
+        def to_dict(m):
+            time.sleep(0.001)                  # 두 스레드가 갱신 도중에 엇갈리게
+            return original(m)
+
+        results, errors = [], []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    results.append([d["id"] for d in views.matcher_dicts(full=True)])
+            except Exception as exc:
+                errors.append(exc)
+
+        with mock.patch("core.views.Matcher.objects", objects), mock.patch("core.views._to_dict", to_dict):
+            threads = [threading.Thread(target=worker) for _ in range(2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [[self.a.pk, self.b.pk]] * 40)
+
+
+class DeltaFeedTests(BuildDirTestCase):
+    def delta(self, since):
+        response = self.client.get("/build/delta", {"since": since})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_delta_lists_changed_and_removed_matchers(self):
+        a = self.create_matcher("a")
+        b = self.create_matcher("b")
+        for raw in "cefg":
+            self.create_matcher(raw)
+        self.assertEqual(rebuild.rebuild_now(), 1)
+
+        a.replace_value = {"ko": "에이"}
+        a.save()
+        self.assertEqual(rebuild.rebuild_now(), 2)
+        b_pk = b.pk
+        b.delete()
+        d = self.create_matcher("d")
+        self.assertEqual(rebuild.rebuild_now(), 3)
+
+        data = self.delta(1)
+        self.assertFalse(data["full"])
+        self.assertEqual(data["generation"], 3)
+        self.assertEqual([m["id"] for m in data["matchers"]], [a.pk, d.pk])
+        self.assertEqual(data["matchers"][0]["replaceValue"], {"ko": "에이"})
+        self.assertEqual(data["removed"], [b_pk])
+
+        self.assertEqual(self.delta(3)["matchers"], [])
+
+    def test_unknown_version_falls_back_to_full_payload(self):
+        self.create_matcher("a")
+        self.create_matcher("b")
+        rebuild.rebuild_now()
+        rebuild.rebuild_now()
+
+        for since in (0, 99, "x"):
+            data = self.delta(since)
+            self.assertTrue(data["full"])
+            self.assertEqual(len(data["matchers"]), 2)
+
+
+class CompressedArtifactTests(BuildDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for raw in ("a", "b"):
+            self.create_matcher(raw)
+        rebuild.rebuild_now()
+
+    def get(self, path, accept=None):
+        headers = {"HTTP_ACCEPT_ENCODING": accept} if accept is not None else {}
+        return self.client.get(path, **headers)
+
+    def test_siblings_are_written_for_every_artifact(self):
+        for name in ("latest.json", "latest.svg"):
+            self.assertTrue((self.build_root / f"{name}.gz").exists())
+        plain = (self.build_root / "latest.json").read_bytes()
+        self.assertEqual(gzip.decompress((self.build_root / "latest.json.gz").read_bytes()), plain)
+
+    def test_gzip_is_negotiated(self):
+        resp = self.get("/build/latest.json", "gzip, deflate")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(resp["Content-Type"], "application/json")
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        body = gzip.decompress(b"".join(resp.streaming_content))
+        self.assertEqual(body, (self.build_root / "latest.json").read_bytes())
+
+        identity = self.get("/build/latest.json", "gzip;q=0")
+        self.assertFalse(identity.has_header("Content-Encoding"))
+        self.assertNotEqual(identity["ETag"], resp["ETag"])
+
+    @skipUnless(encodings.brotli, "brotli not installed")
+    def test_brotli_preferred_over_gzip(self):
+        resp = self.get("/build/latest.svg", "gzip, br")
+        self.assertEqual(resp["Content-Encoding"], "br")
+        self.assertEqual(resp["Content-Type"], "image/svg+xml")
+
+    def test_snapshot_is_served_from_stored_gzip(self):
+        rebuild.rebuild_now(snapshot=True)
+        snap = Snapshot.objects.first()
+        plain = (self.build_root / "latest.json").read_bytes()
+
+        resp = self.get(f"/build/{snap.name}.json", "gzip")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(resp["ETag"], f'"{snap.json_blob.hash}-gz"')
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        self.assertEqual(gzip.decompress(b"".join(resp.streaming_content)), plain)
+        self.assertEqual(self.client.get(f"/build/{snap.name}.json", HTTP_ACCEPT_ENCODING="gzip",
+                                         HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 304)
+
+        identity = self.get(f"/build/{snap.name}.json", "gzip;q=0")
+        self.assertFalse(identity.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", identity["Vary"])
+        self.assertEqual(b"".join(identity.streaming_content), plain)
+
+        partial = self.client.get(f"/build/{snap.name}.json", HTTP_ACCEPT_ENCODING="gzip", HTTP_RANGE="bytes=0-9")
+        self.assertEqual((partial.status_code, b"".join(partial.streaming_content)), (206, plain[:10]))
+        self.assertFalse(partial.has_header("Content-Encoding"))
+
+    def test_delta_snapshot_is_compressed_once_and_negotiated(self):
+        for i in range(6):
+            self.create_matcher(f"m{i}")
+        rebuild.rebuild_now(snapshot=True)
+        self.create_matcher("c")
+        rebuild.rebuild_now(snapshot=True)
+        snap = Snapshot.objects.first()
+        self.assertIsNotNone(snap.json_blob.base_id)               # delta 체인 위의 스냅샷
+        plain = (self.build_root / "latest.json").read_bytes()
+
+        resp = self.get(f"/build/{snap.name}.json", "gzip")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(resp["ETag"], f'"{snap.json_blob.hash}-gz"')
+        self.assertEqual(gzip.decompress(b"".join(resp.streaming_content)), plain)
+
+        with mock.patch("core.snapshots.read_blob") as restore:     # 두 번째부터는 캐시된 압축본
+            again = self.get(f"/build/{snap.name}.json", "gzip")
+            self.assertEqual(gzip.decompress(b"".join(again.streaming_content)), plain)
+        restore.assert_not_called()
+
+        if encodings.brotli:
+            import brotli
+            resp = self.get(f"/build/{snap.name}.json", "gzip, br")
+            self.assertEqual((resp["Content-Encoding"], resp["ETag"]), ("br", f'"{snap.json_blob.hash}-br"'))
+            self.assertEqual(brotli.decompress(b"".join(resp.streaming_content)), plain)
+
+    def test_snapshot_range_reads_the_materialized_file(self):
+        for i in range(6):
+            self.create_matcher(f"m{i}")
+        rebuild.rebuild_now(snapshot=True)
+        self.create_matcher("c")
+        rebuild.rebuild_now(snapshot=True)
+        snap = Snapshot.objects.first()
+        plain = (self.build_root / "latest.json").read_bytes()
+        url = f"/build/{snap.name}.json"
+
+        first = self.client.get(url, HTTP_RANGE="bytes=0-")
+        self.assertEqual((first.status_code, b"".join(first.streaming_content)), (206, plain))
+        with mock.patch("core.snapshots.read_blob") as restore:     # 이어받기는 풀어 둔 파일에서 seek
+            resume = self.client.get(url, HTTP_RANGE="bytes=5-14")
+            self.assertEqual(b"".join(resume.streaming_content), plain[5:15])
+            identity = self.client.get(url, HTTP_ACCEPT_ENCODING="identity")
+            self.assertEqual(b"".join(identity.streaming_content), plain)
+        restore.assert_not_called()
+
+    def test_stale_sibling_is_ignored(self):
+        latest = self.build_root / "latest.json"
+        os.utime(latest.with_name("latest.json.gz"), ns=(0, 0))
+        resp = self.get("/build/latest.json", "gzip")
+        self.assertFalse(resp.has_header("Content-Encoding"))
+
+    def test_accept_encoding_parsing(self):
+        self.assertEqual(
+            parse_accept_encoding("br;q=0.5, GZIP, *;q=0"),
+            {"br": 0.5, "gzip": 1.0, "*": 0.0},
+        )
+
+
+class CompactPayloadTests(BuildDirTestCase):
+    def setUp(self):
+        super().setUp()
+        Matcher.objects.create(category="items", raw="a potion", replace_value={"ko": "물약", "ja": "ポーション"})
+        Matcher.objects.create(category="msgs", regexp_source=r"^You see (.+)\.$", regexp_flag="i",
+                               replace_value={"ko": "$1 보임"}, groups=["items", ["items", "monsters"], None],
+                               ignore_part_translated=True, priority=3)
+        Matcher.objects.create(category="msgs", regexp_source=r"^Hello$", replace_value={"ko": "안녕"})
+        self.payload = views.build_translation_payload(full=True)
+
+    def test_round_trip_is_lossless(self):
+        doc = compact.encode_compact(self.payload)
+        self.assertEqual(doc["count"], 3)
+        self.assertEqual(doc["strings"].count("items"), 1)
+        self.assertEqual(compact.decode_compact(json.loads(json.dumps(doc))), self.payload)
+
+    def test_nested_groups_round_trip(self):
+        Matcher.objects.create(category="msgs", regexp_source=r"^(.+) and (.+)$", replace_value={"ko": "$1, $2"},
+                               groups=[["items", ["monsters", None, ["items"]]], [], "monsters"])
+        payload = views.build_translation_payload(full=True)
+        doc = compact.encode_compact(payload)
+        self.assertEqual(doc["strings"].count("monsters"), 1)
+        self.assertEqual(compact.decode_compact(json.loads(json.dumps(doc))), payload)
+
+    @skipUnless(compact.msgpack, "msgpack not installed")
+    def test_msgpack_round_trip(self):
+        data = compact.pack(compact.encode_compact(self.payload))
+        self.assertEqual(compact.decode_compact(compact.unpack(data)), self.payload)
+
+    def test_build_writes_and_serves_compact_files(self):
+        rebuild.rebuild_now()
+        resp = self.client.get("/build/latest.compact.json")
+        self.assertEqual(resp.status_code, 200)
+        doc = json.loads(b"".join(resp.streaming_content))
+        decoded = compact.decode_compact(doc)
+        self.assertEqual(decoded["matchers"], self.payload["matchers"])
+        if compact.msgpack:
+            resp = self.client.get("/build/latest.msgpack")
+            self.assertEqual(resp["Content-Type"], "application/vnd.msgpack")
+
+
+class SnapshotStoreTests(BuildDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(6):
+            self.create_matcher(f"m{i}")
+
+    def test_identical_builds_share_one_blob(self):
+        rebuild.rebuild_now(snapshot=True)
+        rebuild.rebuild_now(snapshot=True)
+        first, second = Snapshot.objects.order_by("id")
+        self.assertNotEqual(first.name, second.name)
+        self.assertEqual(first.json_blob_id, second.json_blob_id)
+        self.assertEqual(first.svg_blob_id, second.svg_blob_id)
+        self.assertEqual(SnapshotBlob.objects.count(), 2)
+
+    def test_next_snapshot_is_delta_and_restores_exact_bytes(self):
+        rebuild.rebuild_now(snapshot=True)
+        self.create_matcher("extra")
+        rebuild.rebuild_now(snapshot=True)
+
+        snap = Snapshot.objects.first()
+        self.assertIsNotNone(snap.json_blob.base_id)
+        self.assertEqual(snap.json_blob.depth, 1)
+        expected = (self.build_root / "latest.json").read_bytes()
+        snapshots._materialized.clear()
+        self.assertEqual(snapshots.read_blob(snap.json_blob), expected)
+        self.assertEqual([p.name for p in self.build_root.glob("translation_file_*")], [])
+
+        resp = self.client.get(f"/build/{snap.name}.json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(b"".join(resp.streaming_content), expected)
+        self.assertEqual(resp["ETag"], f'"{snap.json_blob.hash}"')
+        resp = self.client.get(f"/build/{snap.name}.json", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(self.client.get("/build/.objects/").status_code, 404)
+
+    def test_gc_keeps_recent_and_base_chain(self):
+        with self.settings(SNAPSHOT_KEEP_LAST=1, SNAPSHOT_KEEP_DAYS=0):
+            rebuild.rebuild_now(snapshot=True)
+            self.create_matcher("extra")
+            rebuild.rebuild_now(snapshot=True)
+            self.assertEqual(Snapshot.objects.count(), 2)              # 저장할 때마다 GC 하지 않는다
+            call_command("snapshots", "--gc", stdout=io.StringIO())
+
+        # 직전 스냅샷은 지워졌지만 delta 기준 blob 은 남아 복원 가능
+        self.assertEqual(Snapshot.objects.count(), 1)
+        snap = Snapshot.objects.first()
+        snapshots._materialized.clear()
+        self.assertEqual(snapshots.read_blob(snap.json_blob),
+                         (self.build_root / "latest.json").read_bytes())
+        self.assertTrue(SnapshotBlob.objects.filter(pk=snap.json_blob.base_id).exists())
+
+    def test_gc_runs_every_n_snapshots_without_sweeping_files(self):
+        with self.settings(SNAPSHOT_GC_EVERY=2), \
+                mock.patch("core.snapshots.collect_garbage") as gc:
+            for _ in range(4):
+                rebuild.rebuild_now(snapshot=True)
+        self.assertEqual(gc.call_args_list, [mock.call(), mock.call()])
+
+
+class ConditionalBuildRequestTests(BuildDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for raw in ("a", "b"):
+            self.create_matcher(raw)
+        rebuild.rebuild_now()
+
+    def test_unchanged_rebuild_keeps_strong_etag(self):
+        first = self.client.get("/build/latest.json")
+        etag = first["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+        self.assertNotEqual(self.client.get("/build/latest.json", HTTP_ACCEPT_ENCODING="gzip")["ETag"], etag)
+
+        with mock.patch("core.rebuild.write_payload") as write:
+            rebuild.rebuild_now()
+        write.assert_not_called()
+
+        resp = self.client.get("/build/latest.json", HTTP_IF_NONE_MATCH=f'"nope", {etag}')
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(self.client.get("/build/latest.json", HTTP_IF_NONE_MATCH="*").status_code, 304)
+
+        self.create_matcher("c")
+        rebuild.rebuild_now()
+        resp = self.client.get("/build/latest.json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_head_and_range(self):
+        body = (self.build_root / "latest.json").read_bytes()
+        head = self.client.head("/build/latest.json")
+        self.assertEqual(head.status_code, 200)
+        self.assertEqual(head["Content-Length"], str(len(body)))
+        self.assertEqual(head["Accept-Ranges"], "bytes")
+        self.assertEqual(head.content, b"")
+
+        part = self.client.get("/build/latest.json", HTTP_RANGE="bytes=10-19")
+        self.assertEqual(part.status_code, 206)
+        self.assertEqual(b"".join(part.streaming_content), body[10:20])       # 구간만 스트리밍
+        self.assertEqual(part["Content-Range"], f"bytes 10-19/{len(body)}")
+        tail = self.client.get("/build/latest.json", HTTP_RANGE="bytes=-5")
+        self.assertEqual((b"".join(tail.streaming_content), tail["Content-Length"]), (body[-5:], "5"))
+        self.assertEqual(self.client.get("/build/latest.json", HTTP_RANGE=f"bytes={len(body)}-").status_code, 416)
+        (self.build_root / "empty.json").write_bytes(b"")
+        empty = self.client.get("/build/empty.json", HTTP_RANGE="bytes=-5")
+        self.assertEqual((empty.status_code, empty["Content-Range"]), (416, "bytes */0"))
+
+        # If-Range 가 현재 ETag 와 다르면 전체 전송
+        stale = self.client.get("/build/latest.json", HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"old"')
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(self.client.post("/build/latest.json").status_code, 405)
+
+
+class TranslatorParityTests(TestCase):
+    """core/testdata/translator_parity.json = translator.js 가 낸 결과"""
+
+    @staticmethod
+    def strip_none(value):
+        # JSON.stringify 는 undefined 키를 빼므로 None 값은 비교에서 제외
+        if isinstance(value, dict):
+            return {k: TranslatorParityTests.strip_none(v) for k, v in value.items() if v is not None}
+        if isinstance(value, list):
+            return [TranslatorParityTests.strip_none(v) for v in value]
+        return value
+
+    def test_matches_translator_js(self):
+        corpus = json.loads((Path(__file__).parent / "testdata" / "translator_parity.json").read_text())
+        engine = Translator(corpus["matchers"])
+        self.assertEqual(len(engine.errors), 1)        # regex "(" 는 JS 처럼 건너뜀
+        for case in corpus["cases"]:
+            with self.subTest(target=case["target"], category=case["category"]):
+                got = engine.translate(case["target"], case["language"], case["category"])
+                self.assertEqual(self.strip_none(got), case["expected"])
+
+    def test_recursive_cycle_is_cut(self):
+        engine = Translator([
+            {"category": "a", "regex": "^(.+)$", "replaceValue": "[$1]", "groups": ["b"], "id": 1},
+            {"category": "b", "regex": "^(.+)$", "replaceValue": "<$1>", "groups": ["a"], "id": 2},
+        ])
+        result = engine.translate("x", "ko", "a")
+        self.assertEqual(result["translation"], "[<x>]")
+        self.assertEqual(result["totalStatus"], "part-translated")
+
+    def test_js_regex_translation(self):
+        # JS 의 \b \d $ 는 ASCII / 입력 끝 기준
+        self.assertTrue(jsregex.compile_js(r"\bcat\b").compiled.search("고양이cat고양이"))
+        self.assertIsNone(jsregex.compile_js("^line$").compiled.search("line\n"))
+        self.assertIsNone(jsregex.compile_js(r"^\d$").compiled.search("٣"))
+        rx = jsregex.compile_js(r"(?<a>\w)(\w)")
+        self.assertEqual(jsregex.js_replace(rx, "xy", "$<a>$2$$$&$3$10"), "xy$xy$3x0")
+
+
+class TranslationStatusTests(BuildDirTestCase):
+    """TranslationData.status — 전체 계산 후 재빌드마다 영향받는 source 만 갱신"""
+
+    def setUp(self):
+        super().setUp()
+        self.goblin = Matcher.objects.create(category="monster", raw="goblin", replace_value={"ko": "고블린"})
+        self.hits = Matcher.objects.create(category="msg", regexp_source=r"^The (.+) hits$",
+                                           replace_value={"ko": "$1 때림"}, groups=[["monster"]])
+        self.rows = {
+            content: make_row(source, content)
+            for source, content in (("msg", "The goblin hits"), ("msg", "The orc hits"), ("item", "dagger"))
+        }
+
+    def status_of(self, content):
+        row = TranslationData.objects.get(pk=self.rows[content].pk)
+        return row.status, row.matched_matcher_id, row.status_generation
+
+    def test_full_recompute(self):
+        call_command("recompute_status", stdout=io.StringIO())
+        self.assertEqual(self.status_of("The goblin hits"), ("translated", self.hits.pk, 0))
+        self.assertEqual(self.status_of("The orc hits"), ("part-translated", self.hits.pk, 0))
+        self.assertEqual(self.status_of("dagger"), ("untranslated", None, 0))
+        self.assertTrue((self.build_root / status.INDEX_NAME).exists())
+
+    def test_rebuild_updates_only_affected_sources(self):
+        call_command("recompute_status", stdout=io.StringIO())
+        # monster 를 바꾸면 그것을 groups 로 참조하는 msg 도 다시 계산, item 은 그대로
+        Matcher.objects.create(category="monster", raw="orc", replace_value={"ko": "오크"})
+        generation = rebuild.rebuild_now()
+        self.assertEqual(self.status_of("The orc hits"), ("translated", self.hits.pk, generation))
+        self.assertEqual(self.status_of("dagger"), ("untranslated", None, 0))
+
+    def test_rebuild_reevaluates_after_releasing_the_build_lock(self):
+        import fcntl
+        call_command("recompute_status", stdout=io.StringIO())
+        Matcher.objects.create(category="monster", raw="orc", replace_value={"ko": "오크"})
+        held = []
+        real = status.recompute
+
+        def recompute(**kwargs):
+            with open(self.build_root / rebuild.LOCK_NAME, "a") as fp:
+                try:
+                    fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    held.append(kwargs["sources"])
+                else:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+            return real(**kwargs)
+
+        with mock.patch("core.status.recompute", side_effect=recompute) as run:
+            generation = rebuild.rebuild_now()
+        self.assertEqual((run.call_count, held), (1, []))
+        self.assertEqual(self.status_of("The orc hits"), ("translated", self.hits.pk, generation))
+        self.assertFalse((self.build_root / status.PENDING_NAME).exists())
+
+    def test_superseded_reevaluation_keeps_pending_sources(self):
+        call_command("recompute_status", stdout=io.StringIO())
+        Matcher.objects.create(category="monster", raw="orc", replace_value={"ko": "오크"})
+        real = status.recompute
+
+        def newer_build(**kwargs):
+            kwargs["progress"] = mock.Mock(side_effect=status._Superseded)     # 도중에 새 generation 이 게시됨
+            return real(**kwargs)
+
+        with mock.patch("core.status.recompute", side_effect=newer_build):
+            rebuild.rebuild_now()
+        self.assertEqual(status._load_pending(), {"monster", "msg"})
+        self.assertEqual(status.run_pending()["translated"], 2)                # 다음 실행이 이어서
+        self.assertEqual(status._load_pending(), set())
+        self.assertEqual(self.status_of("The orc hits")[0], "translated")
+
+    def test_saved_row_records_matched_matcher(self):
+        # 저장 시그널 → commit 후 refresh_rows → run_pending 도 matcher 를 기록한다
+        with self.captureOnCommitCallbacks(execute=True):
+            row = make_row("monster", "goblin")
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.matched_matcher_id), ("translated", self.goblin.pk))
+
+    def test_saved_row_is_evaluated_by_the_status_worker(self):
+        with override_settings(TRANSLATION_STATUS_ASYNC=True), \
+                mock.patch("core.rebuild._status_worker") as worker, \
+                mock.patch("core.status.Translator", wraps=Translator) as compiled:
+            with self.captureOnCommitCallbacks(execute=True):
+                row = make_row("monster", "goblin")
+            # 요청 스레드는 pk 만 대기 목록에 넣고 워커를 깨운다
+            self.assertEqual((worker.wake.call_count, compiled.call_count), (1, 0))
+            self.assertEqual(status._take_pending_rows(), [row.pk])
+            status._add_pending_rows([row.pk])
+            self.assertEqual(status.run_pending()["translated"], 1)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.matched_matcher_id), ("translated", self.goblin.pk))
+        self.assertFalse((self.build_root / status.PENDING_ROWS_NAME).exists())
+
+    def test_admin_filter_counts_per_source(self):
+        call_command("recompute_status", stdout=io.StringIO())
+        request = RequestFactory().get("/", {"source__id__exact": Source.objects.get(name="msg").pk})
+        with self.assertNumQueries(1):                  # FacetCount 한 번, TranslationData 는 읽지 않는다
+            lookups = dict(TranslationStatusFilter(request, {}, TranslationData, None).lookup_choices)
+        self.assertEqual(lookups["translated"], "Translated (1)")
+        self.assertEqual(lookups["part-translated"], "Part-translated (1)")
+        self.assertEqual(lookups["untranslated"], "Untranslated (0)")
+
+
+    def test_status_counts_follow_every_write_path(self):
+        from core.batching import bulk_signals
+
+        def recount(source_id=None):
+            qs = TranslationData.objects.order_by()
+            if source_id is not None:
+                qs = qs.filter(source_id=source_id)
+            return {k: n for k, n in qs.values_list("status").annotate(n=Count("pk"))}
+
+        def check():
+            self.assertEqual({k: n for k, n in status.status_counts().items() if n}, recount())
+            for source_id in Source.objects.values_list("pk", flat=True):
+                self.assertEqual({k: n for k, n in status.status_counts(source_id).items() if n},
+                                 recount(source_id))
+
+        check()                                                     # 만들 때 pending
+        call_command("recompute_status", stdout=io.StringIO())      # 재계산 bulk_update
+        check()
+        with self.captureOnCommitCallbacks(execute=True):           # 저장 + commit 후 refresh_rows
+            make_row("monster", "orc")
+        check()
+        Matcher.objects.create(category="monster", raw="orc", replace_value={"ko": "오크"})
+        rebuild.rebuild_now()                                       # 증분 갱신
+        check()
+        with bulk_signals("Bulk delete"):
+            TranslationData.objects.filter(source__name="msg").delete()
+        check()
+
+
+class SourceTests(TestCase):
+    """Source.rows — 저장·삭제 시그널이 증감으로 맞춘다 (bulk_signals 범위는 끝에서 한 번)"""
+
+    def rows(self):
+        return dict(Source.objects.values_list("name", "rows"))
+
+    def test_rows_follow_saves_and_deletes(self):
+        from core.batching import bulk_signals
+        row = make_row("msg", "The goblin hits")
+        make_row("msg", "The orc hits")
+        self.assertEqual(self.rows(), {"msg": 2})
+
+        row = TranslationData.objects.get(pk=row.pk)            # DB 에서 읽은 행의 source 를 바꾼다
+        row.source = Source.objects.create(name="item")
+        row.save()
+        self.assertEqual(self.rows(), {"item": 1, "msg": 1})
+
+        with bulk_signals("Bulk delete"):
+            TranslationData.objects.all().delete()
+            self.assertEqual(self.rows(), {"item": 1, "msg": 1})
+        self.assertEqual(self.rows(), {"item": 0, "msg": 0})
+
+
+class FacetTests(TestCase):
+    """admin 목록 필터 — 값·개수를 facet 표에서 (core/facets.py), 원본 표를 DISTINCT 로 훑지 않는다"""
+
+    def categories(self):
+        return dict(FacetCount.objects.filter(facet="category", rows__gt=0).values_list("value", "rows"))
+
+    def test_category_counts_follow_saves_deletes_and_renames(self):
+        goblin = Matcher.objects.create(category="monster", raw="goblin", replace_value={"ko": "고블린"})
+        Matcher.objects.create(category="monster", raw="orc", replace_value={"ko": "오크"})
+        Matcher.objects.create(category="item", raw="dagger", replace_value={"ko": "단검"})
+        self.assertEqual(self.categories(), {"monster": 2, "item": 1})
+
+        goblin = Matcher.objects.get(pk=goblin.pk)
+        goblin.category = "item"
+        goblin.save()
+        self.assertEqual(self.categories(), {"monster": 1, "item": 2})
+
+        grouprefs.rename_category("item", "items")          # queryset.update() 경로
+        self.assertEqual(self.categories(), {"monster": 1, "items": 2})
+        Matcher.objects.filter(category="items").delete()
+        self.assertEqual(self.categories(), {"monster": 1})
+
+        FacetCount.objects.all().delete()
+        self.assertEqual(facets.rebuild()["category"], 1)
+        self.assertEqual(self.categories(), {"monster": 1})
+
+    def test_filter_lists_top_values_with_counts_and_narrows(self):
+        for i in range(facets.LIMIT + 5):
+            source = Source.objects.create(name=f"msgs-{i:02}")
+            for j in range(i + 1):
+                make_row(source.name, f"line {j}")
+        rare = Source.objects.get(name="msgs-00")
+
+        request = RequestFactory().get("/", {"source__id__exact": rare.pk})
+        spec = SourceFacetFilter(request, {"source__id__exact": [str(rare.pk)]}, TranslationData, None)
+        labels = [label for _, label in spec.lookup_choices]
+        self.assertEqual(labels[0], f"msgs-{facets.LIMIT + 4} ({facets.LIMIT + 5})")   # 많은 순
+        self.assertEqual(labels[-1], "msgs-00 (1)")                                     # 선택 값은 목록 밖이어도
+        self.assertEqual(spec.more, 5)
+
+        # select2 입력 → facet 표만 조회해 좁힌다
+        self.client.force_login(get_user_model().objects.create_superuser("admin", "a@example.com", "pw"))
+        url = reverse("admin:core_translationdata_facets", args=["source"])
+        data = self.client.get(url, {"q": "-1"}).json()
+        self.assertEqual([r["text"] for r in data["results"]][:2], ["msgs-19 (20)", "msgs-18 (19)"])
+        self.assertFalse(data["pagination"]["more"])
+        self.assertTrue(self.client.get(url).json()["pagination"]["more"])
+        self.assertEqual(self.client.get(url, {"page": 2}).json()["results"][-1]["text"], "msgs-00 (1)")
+        self.assertEqual(self.client.get(reverse("admin:core_matcher_facets", args=["source"])).status_code, 404)
+
+
+class CoverageTests(BuildDirTestCase):
+    """manage.py coverage — pk 구간 단위 체크포인트 + CoverageSummary 대시보드"""
+
+    def setUp(self):
+        super().setUp()
+        Matcher.objects.create(category="monster", raw="goblin", replace_value={"ko": "고블린"})
+        for source, content in (("monster", "goblin"), ("monster", "orc"), ("item", "dagger"),
+                                ("item", "axe"), ("monster", "rat")):
+            make_row(source, content)
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        real_run = coverage._run_range
+        seen = []
+
+        def flaky(pk_range):
+            seen.append(pk_range)
+            if len(seen) == 2:
+                raise KeyboardInterrupt
+            return real_run(pk_range)
+
+        with mock.patch("core.coverage._run_range", side_effect=flaky):
+            with self.assertRaises(KeyboardInterrupt):
+                coverage.compute_coverage(chunk=2)
+        self.assertTrue((self.build_root / coverage.CHECKPOINT_NAME).exists())
+        self.assertFalse(CoverageSummary.objects.exists())
+
+        seen.clear()
+        with mock.patch("core.coverage._run_range", side_effect=real_run) as run:
+            counts = coverage.compute_coverage(chunk=2)
+        self.assertEqual(run.call_count, len(batch.plan_ranges(2)) - 1)     # 끝난 구간은 건너뜀
+        self.assertEqual(counts, {("monster", "translated"): 1, ("monster", "untranslated"): 2,
+                                  ("item", "untranslated"): 2})
+        self.assertEqual(CoverageSummary.objects.get(source="monster", status="translated").count, 1)
+        self.assertFalse((self.build_root / coverage.CHECKPOINT_NAME).exists())
+
+    def test_matcher_change_during_scan_discards_and_redoes(self):
+        real_run = coverage._run_range
+        seen = []
+
+        def edited(pk_range):
+            seen.append(pk_range)
+            if len(seen) == 1:                  # 계산 중 (락 밖) 에 matcher 가 바뀐다
+                Matcher.objects.create(category="monster", raw="orc", replace_value={"ko": "오크"})
+            return real_run(pk_range)
+
+        with mock.patch("core.coverage._run_range", side_effect=edited):
+            counts = coverage.compute_coverage(chunk=1000)
+        self.assertEqual(len(seen), 2)                                  # 버리고 새 목록으로 한 번 더
+        self.assertEqual(counts[("monster", "translated")], 2)
+
+    def test_dashboard_reads_only_the_summary(self):
+        coverage.compute_coverage(chunk=1000)
+        staff = get_user_model().objects.create_user(username="staff", is_staff=True)
+        self.client.force_login(staff)
+        with self.assertNumQueries(3):          # 세션 + 사용자 + CoverageSummary
+            resp = self.client.get("/coverage/")
+        self.assertContains(resp, "<code>monster</code>")
+        self.assertContains(resp, "33.3%")
+
+
+class MatcherImpactTests(BuildDirTestCase):
+    """core/impact.py — 저장 전/후 번역 비교"""
+
+    def setUp(self):
+        super().setUp()
+        Matcher.objects.create(category="monster", raw="goblin", replace_value={"ko": "고블린"})
+        self.orc = Matcher.objects.create(category="monster", raw="orc", replace_value={"ko": "오크"})
+        Matcher.objects.create(category="msg", regexp_source=r"^The (.+) hits$",
+                               replace_value={"ko": "$1 때림"}, groups=[["monster"]])
+        for source, content in (("msg", "The goblin hits"), ("msg", "The orc hits"), ("msg", "The rat hits"),
+                                ("monster", "goblin"), ("monster", "rat"), ("item", "rat")):
+            make_row(source, content)
+
+    def test_raw_edit_reports_gained_and_lost_rows(self):
+        self.orc.raw, self.orc.replace_value = "rat", {"ko": "쥐"}
+        report = impact.analyze(self.orc, old_id=self.orc.pk)
+        self.assertEqual(report["categories"], ["monster", "msg"])
+        self.assertEqual(report["candidates"], 4)        # monster 는 raw 문자열 행만, msg 는 전부
+        self.assertTrue(report["complete"])
+        self.assertEqual({(r["source"], r["content"]) for r in report["newly_translated"]},
+                         {("monster", "rat"), ("msg", "The rat hits")})
+        self.assertEqual([r["after"] for r in report["newly_broken"]], ["orc 때림"])
+        self.assertEqual(report["counts"]["changed"], 0)
+
+    def test_time_budget_stops_early(self):
+        with mock.patch("core.impact.CHUNK", 1):
+            report = impact.analyze(Matcher(category="msg", regexp_source="^The", replace_value={"ko": "x"}),
+                                    budget=0)
+        self.assertEqual(report["scanned"], 1)          # 구간 하나는 끝내고 멈춘다
+        self.assertFalse(report["complete"])
+        self.assertLess(report["scanned"], report["candidates"])
+
+    def test_preview_endpoint_renders_report(self):
+        admin = get_user_model().objects.create_superuser(username="admin", password="x")
+        self.client.force_login(admin)
+        resp = self.client.post(f"/admin/core/matcher/{self.orc.pk}/impact/", {
+            "category": "monster", "type": "raw", "raw": "rat", "regexp_source": "", "regexp_flag": "",
+            "replace_value": json.dumps({"ko": "쥐"}), "groups": "[]", "memo": "", "priority": 0,
+        })
+        self.assertContains(resp, "Newly translated")
+        self.assertContains(resp, "The rat hits")
+        self.assertEqual(Matcher.objects.get(pk=self.orc.pk).raw, "orc")      # 저장하지 않음
+
+
+class PrefilterTests(TestCase):
+    """core/prefilter.py — 필수 리터럴 추출 + 색인으로 건너뛰어도 결과는 같아야 한다"""
+
+    def test_required_literals(self):
+        lit = prefilter.required_literals
+        self.assertEqual(lit(r"^(.+?) picks up (a|an|the) (.+)\.$"), [" picks up "])
+        self.assertEqual(lit(r"^You (?:feel|are) (.+)(!|\.)$"), ["You "])
+        self.assertEqual(lit(r"foo|ba+r"), ["foo", "ba"])
+        self.assertEqual(lit(r"A\x42\/C"), ["AB/C"])
+        self.assertEqual(lit(r"^\u{1F600}$", "u"), ["\U0001F600"])
+        self.assertEqual(lit(r"a{0,2}bc?d"), ["b"])
+        self.assertIsNone(lit(r"^(\d+)$"))
+        self.assertIsNone(lit(r"abc|\d"))                # 가지 하나라도 리터럴이 없으면
+        self.assertIsNone(lit("hello", "i"))
+
+    def test_parity_with_every_category_indexed(self):
+        corpus = json.loads((Path(__file__).parent / "testdata" / "translator_parity.json").read_text())
+        with mock.patch("core.prefilter.MIN_FILTERED", 1):
+            fast = Translator(corpus["matchers"], debug=True)
+        slow = Translator(corpus["matchers"], debug=True, prefilter=False)
+        for case in corpus["cases"]:
+            args = (case["target"], case["language"], case["category"])
+            self.assertEqual(fast.translate(*args), slow.translate(*args))
+        self.assertGreater(sum(skipped for _, skipped in fast.prefilter_stats.values()), 0)
+
+    def test_literals_are_exported_in_payload(self):
+        m = Matcher.objects.create(category="msg", regexp_source=r"^The (.+) hits you\.$",
+                                   replace_value={"ko": "x"})
+        payload = views.build_translation_payload()
+        self.assertEqual(payload["matchers"][0]["literals"], [" hits you."])
+        self.assertEqual(compact.decode_compact(compact.encode_compact(payload))["matchers"][0]["id"], m.pk)
+
+
+class MatcherStatsTests(BuildDirTestCase):
+    """manage.py matcher_stats — hit / win / shadowed / nested + 예시"""
+
+    def setUp(self):
+        super().setUp()
+        self.goblin = Matcher.objects.create(category="monster", raw="goblin", replace_value={"ko": "고블린"})
+        self.hits = Matcher.objects.create(category="msg", regexp_source=r"^The (.+) hits$",
+                                           replace_value={"ko": "$1 때림"}, groups=[["monster"]])
+        self.generic = Matcher.objects.create(category="msg", regexp_source=r"^The (.+)$",
+                                              replace_value={"ko": "$1"}, priority=5)
+        self.dead = Matcher.objects.create(category="msg", regexp_source=r"^never$", replace_value={"ko": "x"})
+        for content in ("The goblin hits", "The orc hits", "The rat"):
+            make_row("msg", content)
+
+    def test_counts_and_examples(self):
+        call_command("matcher_stats", "--workers", "1", "--chunk", "2", stdout=io.StringIO())
+        stats = {s.matcher_id: s for s in MatcherStats.objects.all()}
+        self.assertEqual((stats[self.hits.pk].hits, stats[self.hits.pk].wins), (2, 2))
+        self.assertEqual(stats[self.hits.pk].examples, ["The orc hits", "The goblin hits"])
+        self.assertEqual((stats[self.generic.pk].hits, stats[self.generic.pk].wins,
+                          stats[self.generic.pk].shadowed), (3, 1, 2))
+        self.assertEqual((stats[self.goblin.pk].hits, stats[self.goblin.pk].nested), (0, 1))
+        self.assertEqual((stats[self.dead.pk].hits, stats[self.dead.pk].nested), (0, 0))
+
+    def test_top_k_zero_keeps_counts_without_examples(self):
+        call_command("matcher_stats", "--workers", "1", "--top-k", "0", stdout=io.StringIO())
+        stats = MatcherStats.objects.get(matcher=self.hits)
+        self.assertEqual((stats.hits, stats.wins, stats.examples), (2, 2, []))
+
+    def test_admin_filters_dead_and_sorts_by_hits(self):
+        call_command("matcher_stats", "--workers", "1", stdout=io.StringIO())
+        admin = get_user_model().objects.create_superuser(username="admin", password="x")
+        self.client.force_login(admin)
+        resp = self.client.get("/admin/core/matcher/", {"usage": "dead"})
+        self.assertEqual([m.pk for m in resp.context["cl"].result_list], [self.dead.pk])
+        column = MatcherAdmin.list_display.index("hits_col") + 1         # 0 = 액션 체크박스
+        resp = self.client.get("/admin/core/matcher/", {"o": f"-{column}"})
+        self.assertEqual(resp.context["cl"].result_list[0].pk, self.generic.pk)
+
+
+class CategoryGraphTests(BuildDirTestCase):
+    """SCC 로 순환 간선 판정 + 그래프가 같으면 SVG 를 다시 그리지 않음"""
+
+    def test_cycle_edges_match_reachability(self):
+        import random
+        rng = random.Random(7)
+        for _ in range(50):
+            nodes = [f"c{i}" for i in range(rng.randint(1, 12))]
+            edges = {(rng.choice(nodes), rng.choice(nodes)) for _ in range(rng.randint(0, 25))}
+
+            def reaches(src, dst):
+                seen, todo = set(), [src]
+                while todo:
+                    for u, v in edges:
+                        if u == todo[-1] and v not in seen:
+                            seen.add(v)
+                            todo.append(v)
+                            break
+                    else:
+                        todo.pop()
+                return dst in seen
+
+            expected = {(u, v) for u, v in edges if u == v or reaches(v, u)}
+            self.assertEqual(views.cycle_edges(sorted(edges)), expected)
+
+    def test_replace_value_edit_skips_graphviz(self):
+        m = Matcher.objects.create(category="msg", regexp_source="^(.+)$", replace_value={"ko": "$1"},
+                                   groups=[["monster"]])
+        rebuild.rebuild_now()
+        self.assertEqual(self.render.call_count, 1)
+
+        m.replace_value = {"ko": "[$1]"}
+        m.save()
+        self.assertEqual(rebuild.rebuild_now(), 2)
+        self.assertEqual(self.render.call_count, 1)             # 그래프는 그대로
+
+        m.groups = [["monster", "item"]]
+        m.save()
+        rebuild.rebuild_now()
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_large_graph_uses_fallback_engine_and_logs_render(self):
+        Matcher.objects.create(category="msg", regexp_source="^(.+)$", replace_value={"ko": "$1"},
+                               groups=[["monster"]])
+        with override_settings(GRAPH_SFDP_THRESHOLD=1):
+            rebuild.rebuild_now()
+        self.assertEqual(self.render.call_args.kwargs["engine"], "sfdp")
+        entry = graphrender.render_log()[-1]
+        self.assertEqual((entry["generation"], entry["engine"], entry["nodes"], entry["status"]),
+                         (1, "sfdp", 2, "ok"))
+        self.assertEqual(graphrender.published_state()["generation"], 1)
+        self.client.force_login(get_user_model().objects.create_user(username="staff", is_staff=True))
+        self.assertContains(self.client.get(reverse("list-translation-files")), "Graph renders")
+
+    def test_render_timeout_keeps_previous_svg_and_retries(self):
+        m = Matcher.objects.create(category="msg", regexp_source="^(.+)$", replace_value={"ko": "$1"},
+                                   groups=[["monster"]])
+        rebuild.rebuild_now()
+        self.render.side_effect = subprocess.TimeoutExpired("dot", 1)
+        m.groups = [["monster", "item"]]
+        m.save()
+        self.assertEqual(rebuild.rebuild_now(), 2)
+
+        self.assertEqual(json.loads((self.build_root / "latest.json").read_text())["generation"], 2)
+        self.assertEqual((self.build_root / "latest.svg").read_text(), "<svg/>")   # 이전 그림 유지
+        self.assertEqual(graphrender.published_state()["generation"], 1)
+        self.assertEqual(graphrender.render_log()[-1]["status"], "timeout")
+        self.assertEqual([p.name for p in self.build_root.glob(".*.tmp*")], [])
+
+        self.render.side_effect = self.fake_render
+        self.assertEqual(rebuild.rebuild_now(), 2)              # 내용은 그대로여도 그림은 다시
+        self.assertEqual(graphrender.published_state()["generation"], 2)
+
+    def test_background_render_follows_json_and_fills_snapshots(self):
+        class DeferredPool:
+            jobs = []
+
+            def submit(self, fn, job):
+                self.jobs.append(job)
+
+        pool = DeferredPool()
+        self.enterContext(mock.patch.object(graphrender, "_latest", None))
+        self.enterContext(mock.patch.object(graphrender, "_pool", return_value=pool))
+        self.enterContext(override_settings(GRAPH_RENDER_ASYNC=True))
+
+        m = Matcher.objects.create(category="msg", regexp_source="^(.+)$", replace_value={"ko": "$1"},
+                                   groups=[["monster"]])
+        rebuild.rebuild_now(snapshot=True)
+        m.groups = [["monster", "item"]]
+        m.save()
+        rebuild.rebuild_now(snapshot=True)
+
+        # JSON 은 이미 게시, SVG 는 아직 → 스냅샷도 SVG 없이
+        self.assertEqual(json.loads((self.build_root / "latest.json").read_text())["generation"], 2)
+        self.assertFalse((self.build_root / "latest.svg").exists())
+        self.assertFalse(Snapshot.objects.filter(svg_blob__isnull=False).exists())
+        self.assertIs(graphrender.pending_render(), pool.jobs[-1])
+
+        for job in pool.jobs:
+            graphrender._run(job)
+        self.assertEqual([job.status for job in pool.jobs], ["superseded", "ok"])
+        self.assertEqual(self.render.call_count, 1)             # 시작 전에 밀린 렌더는 건너뜀
+        self.assertTrue((self.build_root / "latest.svg").exists())
+        self.assertEqual(Snapshot.objects.filter(svg_blob__isnull=False).count(), 2)
+        self.assertIsNone(graphrender.pending_render())
+
+
+class GroupRefTests(BuildDirTestCase):
+    """Matcher.groups 역색인 유지 + 이름 바꾸기는 참조하는 행만"""
+
+    def make(self, category, groups):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Matcher.objects.create(category=category, regexp_source=f"^(.+) {Matcher.objects.count()}$",
+                                          replace_value={"ko": "$1"}, groups=groups)
+
+    def refs(self, m):
+        return sorted(MatcherGroupRef.objects.filter(matcher=m).values_list("position", "category"))
+
+    def test_refs_follow_save_and_delete(self):
+        m = self.make("msg", [["monster", ["item", "monster"]], "god", None])
+        self.assertEqual(self.refs(m), [(0, "item"), (0, "monster"), (1, "god")])
+        m.groups = [None, ["spell"]]
+        m.save()
+        self.assertEqual(self.refs(m), [(1, "spell")])
+        m.delete()
+        self.assertFalse(MatcherGroupRef.objects.exists())
+
+    def test_rename_touches_only_referencing_rows(self):
+        owner = self.make("monster", [])
+        user = self.make("msg", [["monster", "item"], "monster"])
+        bystander = self.make("msg", [["item"]])
+        stamp = Matcher.objects.get(pk=bystander.pk).updated_at
+
+        self.assertEqual(grouprefs.rename_category("monster", "mon"), (1, 1))
+
+        self.assertEqual(Matcher.objects.get(pk=owner.pk).category, "mon")
+        self.assertEqual(Matcher.objects.get(pk=user.pk).groups, [["mon", "item"], "mon"])
+        self.assertEqual(self.refs(user), [(0, "item"), (0, "mon"), (1, "mon")])
+        self.assertEqual(Matcher.objects.get(pk=bystander.pk).updated_at, stamp)
+        self.assertEqual(grouprefs.referrer_count("monster"), 0)
+        self.assertTrue((self.build_root / rebuild.DIRTY_NAME).exists())
+
+    def test_admin_rename_preview_and_references_filter(self):
+        self.make("msg", [["monster"]])
+        self.make("msg", [["item"]])
+        admin = get_user_model().objects.create_superuser(username="admin", password="x")
+        self.client.force_login(admin)
+        url = reverse("admin:core_matcher_bulk_change_category")
+
+        resp = self.client.get(url, {"old_category": "monster", "new_category": "mon"})
+        self.assertEqual((resp.context["direct_cnt"], resp.context["group_cnt"]), (0, 1))
+
+        resp = self.client.get(reverse("admin:core_matcher_changelist"), {"references": "item"})
+        self.assertEqual(resp.context["cl"].result_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url, {"old_category": "monster", "new_category": "mon"})
+        self.assertEqual(grouprefs.referrer_count("mon"), 1)
+
+
+class BulkSignalTests(BuildDirTestCase):
+    """bulk_signals 범위: 행마다 하던 웹훅·재빌드 예약을 한 번으로 (웹훅은 같은 트랜잭션, 재빌드는 commit 후)"""
+
+    def setUp(self):
+        super().setUp()
+        self.send = self.enterContext(mock.patch("core.signals._send_to_discord"))
+        self.dirty = self.enterContext(mock.patch("core.rebuild.mark_dirty"))
+        self.matchers = [self.create_matcher(f"m{i}") for i in range(5)]
+        self.send.reset_mock()
+        admin = get_user_model().objects.create_superuser(username="admin", password="x")
+        self.client.force_login(admin)
+
+    def post_action(self, action, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("admin:core_matcher_changelist"), {
+                "action": action, "_selected_action": [m.pk for m in self.matchers[:3]], **extra,
+            })
+
+    def test_admin_bulk_delete_sends_one_summary(self):
+        self.post_action("delete_selected", post="yes")
+        self.assertEqual(Matcher.objects.count(), 2)
+        self.assertEqual(self.send.call_count, 1)
+        self.assertEqual(self.dirty.call_count, 1)
+        message = self.send.call_args.args[0]
+        self.assertIn("3 matcher deleted", message["content"])
+        self.assertEqual(message["embeds"][0]["description"].count("deleted"), 3)
+
+    def test_change_category_action_schedules_rebuild(self):
+        self.post_action("change_category_confirm", apply="1", new_category="moved")
+        self.assertEqual(Matcher.objects.filter(category="moved").count(), 3)
+        self.assertEqual((self.send.call_count, self.dirty.call_count), (1, 1))
+
+    def test_summary_is_queued_before_commit(self):
+        from core.batching import bulk_signals
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with bulk_signals("Bulk delete"):
+                self.matchers[0].delete()
+            # 요약은 범위의 트랜잭션 안에서 이미 outbox 에, commit 후에는 재빌드 예약만
+            self.assertEqual((self.send.call_count, self.dirty.call_count), (1, 0))
+        for callback in callbacks:
+            callback()
+        self.assertEqual((self.send.call_count, self.dirty.call_count), (1, 1))
+
+    def test_nested_scope_flushes_once_and_rolls_back_cleanly(self):
+        from core.batching import bulk_signals
+        with self.captureOnCommitCallbacks(execute=True):
+            with bulk_signals("outer"):
+                with bulk_signals("inner"):
+                    self.matchers[0].delete()
+                self.matchers[1].delete()
+        self.assertEqual((self.send.call_count, self.dirty.call_count), (1, 1))
+
+        pk = self.matchers[2].pk
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError):
+            with bulk_signals("failed"):
+                self.matchers[2].delete()
+                raise RuntimeError
+        self.assertTrue(Matcher.objects.filter(pk=pk).exists())
+        self.assertEqual(self.send.call_count, 1)
+
+
+class WebhookOutboxTests(BuildDirTestCase):
+    """웹훅은 outbox 행으로 → 로컬 HTTP 스텁에 합쳐서 전송, rate limit·재시도"""
+
+    def setUp(self):
+        super().setUp()
+        import http.server
+
+        self.replies, self.received = [], []
+        test = self
+
+        class Stub(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                test.received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+                status, headers, body = test.replies.pop(0) if test.replies else (204, {}, b"")
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Stub)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.enterContext(override_settings(
+            WEBHOOK_URL=f"http://127.0.0.1:{server.server_port}/hook", WEBHOOK_OUTBOX_ASYNC=False,
+        ))
+
+    def test_saves_are_recorded_in_the_transaction(self):
+        from django.db import transaction
+        from core.models import WebhookMessage
+        self.create_matcher("a")
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.create_matcher("b")
+            raise RuntimeError
+        self.assertEqual(WebhookMessage.objects.count(), 1)
+        self.assertEqual(self.received, [])                     # 저장 요청 안에서는 보내지 않는다
+
+    def test_backlog_is_merged_and_rate_limits_are_respected(self):
+        from core import outbox
+        from core.models import WebhookMessage
+        for raw in ("a", "b", "c"):
+            self.create_matcher(raw)
+        self.replies = [
+            (429, {"Content-Type": "application/json"}, b'{"retry_after": 0.01}'),
+            (204, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.01"}, b""),
+        ]
+        self.assertEqual(outbox.deliver_pending(), 3)
+        self.assertEqual(len(self.received), 2)                 # 429 한 번 + 합친 메시지 한 번
+        self.assertEqual(len(self.received[1]["embeds"]), 3)
+        self.assertEqual(self.received[1]["content"].count("\n"), 2)
+        self.assertFalse(WebhookMessage.objects.exclude(status=WebhookMessage.STATUS_SENT).exists())
+        self.assertEqual(outbox.outbox_stats()["sent_24h"], 3)
+
+    def test_persistent_rate_limit_falls_back_to_backoff(self):
+        from core import outbox
+        from core.models import WebhookMessage
+        self.create_matcher("a")
+        limited = (429, {"Content-Type": "application/json"}, b'{"retry_after": 0.01}')
+        self.replies = [limited] * (outbox.MAX_RATE_RETRIES + 1)
+        self.assertEqual(outbox.deliver_pending(), 0)
+        self.assertEqual(len(self.received), outbox.MAX_RATE_RETRIES + 1)
+        msg = WebhookMessage.objects.get()
+        self.assertEqual((msg.status, msg.attempts), (WebhookMessage.STATUS_PENDING, 1))
+        self.assertGreater(msg.next_attempt_at, msg.created_at)
+
+    def test_stats_count_every_send_and_sample_the_latest(self):
+        import datetime
+        from core import outbox
+        from core.models import WebhookMessage
+        from django.utils import timezone
+        now = timezone.now()
+        for i in range(5):                                      # 먼저 만든 행일수록 일찍 보냈다
+            WebhookMessage.objects.create(payload={}, status=WebhookMessage.STATUS_SENT,
+                                          sent_at=now - datetime.timedelta(minutes=4 - i))
+        WebhookMessage.objects.filter(status=WebhookMessage.STATUS_SENT).update(
+            created_at=now - datetime.timedelta(minutes=10))
+        with mock.patch("core.outbox.LATENCY_SAMPLE", 2):
+            stats = outbox.outbox_stats()
+        self.assertEqual(stats["sent_24h"], 5)
+        self.assertEqual(stats["latency_max"], 600.0)           # 가장 최근 2건 (지연 9·10분)
+
+    def test_pending_rows_wake_the_sender_on_startup(self):
+        from core import outbox
+
+        def run_now(target, **kwargs):                          # 확인 스레드를 이 스레드에서 (테스트 트랜잭션 안)
+            return mock.Mock(start=target)
+
+        with self.settings(WEBHOOK_OUTBOX_ASYNC=True), \
+                mock.patch("core.outbox.threading.Thread", side_effect=run_now), \
+                mock.patch("core.outbox.connection"), \
+                mock.patch("core.outbox._sender") as sender:
+            outbox.resume_pending()
+            sender.wake.assert_not_called()                     # 대기 행 없음
+            self.create_matcher("a")
+            sender.wake.reset_mock()                            # enqueue 의 on_commit 깨우기는 빼고
+            outbox.resume_pending()
+            sender.wake.assert_called_once()
+
+    def test_failures_back_off_or_die(self):
+        from core import outbox
+        from core.models import WebhookMessage
+        self.create_matcher("a")
+        self.replies = [(503, {}, b"busy")]
+        self.assertEqual(outbox.deliver_pending(), 0)
+        msg = WebhookMessage.objects.get()
+        self.assertEqual((msg.status, msg.attempts), (WebhookMessage.STATUS_PENDING, 1))
+        self.assertGreater(msg.next_attempt_at, msg.created_at)
+        self.assertEqual(outbox.deliver_pending(), 0)           # 아직 재시도 시각 전
+        self.assertEqual(len(self.received), 1)
+
+        WebhookMessage.objects.update(next_attempt_at=msg.created_at)
+        self.create_matcher("b")
+        self.replies = [(400, {}, b"too big"), (204, {}, b""), (400, {}, b"bad")]
+        self.assertEqual(outbox.deliver_pending(), 1)           # 합친 것이 거절 → 하나씩
+        self.assertEqual(WebhookMessage.objects.filter(status=WebhookMessage.STATUS_DEAD).count(), 1)
+        self.assertEqual(outbox.outbox_stats()["dead"], 1)
+
+
+class ImportPacksTests(BuildDirTestCase):
+    """import_packs — JSON / NDJSON / gzip 스트리밍, manifest 로 건너뛰기·이어서 가져오기"""
+
+    def setUp(self):
+        super().setUp()
+        self.base = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+        self.packs = self.base / "packs"
+        self.packs.mkdir()
+        self.enterContext(override_settings(BASE_DIR=self.base))
+
+    def run_import(self, *args, workers=1):
+        out = io.StringIO()
+        call_command("import_packs", "--workers", str(workers), *args, stdout=out)
+        return out.getvalue()
+
+    def test_formats_stream_into_rows(self):
+        (self.packs / "monsters.json").write_text(json.dumps(["You hit the orc.", "The orc dies.", "You hit the orc."]))
+        (self.packs / "items.json.gz").write_bytes(gzip.compress(json.dumps(
+            {"version": 2, "messages": ["a +1 dagger", "a scroll"]}).encode()))
+        (self.packs / "spells.ndjson").write_text('"You cast Magic Dart."\n\n"Your spell fizzles."\n')
+        with mock.patch("core.packs.CHUNK", 7):                 # 원소가 버퍼 경계에 걸리게
+            out = self.run_import(workers=2)                    # 파싱은 fork 된 작업자, 쓰기는 여기
+        self.assertIn("7개 읽음, 6개 삽입", out)
+        self.assertEqual(
+            dict(TranslationData.objects.values_list("source__name").annotate(n=Count("id"))
+                 .values_list("source__name", "n")),
+            {"monsters": 2, "items": 2, "spells": 2})
+        self.assertEqual(dict(Source.objects.values_list("name", "rows")), {"monsters": 2, "items": 2, "spells": 2})
+        self.assertIn("바뀐 pack 없음 (3개 파일 건너뜀)", self.run_import())
+        self.assertIn("7개 읽음, 0개 삽입", self.run_import("--force"))
+
+    def test_row_inserted_concurrently_is_not_counted_twice(self):
+        from core.management.commands import import_packs
+        (self.packs / "log.ndjson").write_text("".join(f'"line {i}"\n' for i in range(3)))
+        real_lookup = import_packs.Command._new_rows
+        calls = []
+
+        def raced(cmd, source_id, rows, **kwargs):
+            new = real_lookup(cmd, source_id, rows, **kwargs)
+            calls.append(kwargs)
+            if len(calls) == 1:                                 # 조회와 INSERT 사이에 다른 곳에서 같은 행
+                make_row("log", "line 0")
+            return new
+
+        with mock.patch.object(import_packs.Command, "_new_rows", raced):
+            out = self.run_import()
+        self.assertIn("3개 읽음, 2개 삽입", out)
+        self.assertEqual(calls, [{"locking": False}, {"locking": True}])
+        self.assertEqual(dict(Source.objects.values_list("name", "rows")), {"log": 3})
+        self.assertEqual(sum(status.status_counts(Source.objects.get(name="log").pk).values()), 3)
+
+    def test_changed_and_interrupted_packs_resume(self):
+        from core.management.commands import import_packs
+        from core.models import PackManifest
+        pack = self.packs / "log.ndjson"
+        pack.write_text("".join(f'"line {i}"\n' for i in range(5)))
+        real_insert = import_packs.Command._insert
+        calls = []
+
+        def interrupted(cmd, source, rows):
+            calls.append(rows)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return real_insert(cmd, source, rows)
+
+        with mock.patch.object(import_packs, "BATCH", 2), \
+                mock.patch.object(import_packs.Command, "_insert", interrupted), \
+                self.assertRaises(KeyboardInterrupt):
+            self.run_import()
+        self.assertEqual(PackManifest.objects.get().records_done, 2)   # 첫 배치만 commit
+
+        with mock.patch.object(import_packs, "BATCH", 2):
+            out = self.run_import()
+        self.assertIn("이어서 1", out)
+        self.assertIn("3개 읽음, 3개 삽입", out)                       # 체크포인트 뒤부터
+
+        with pack.open("a") as fp:
+            fp.write('"line 5"\n')
+        self.assertIn("6개 읽음, 1개 삽입", self.run_import())
+        self.assertEqual(TranslationData.objects.count(), 6)
+        self.assertTrue(PackManifest.objects.get().completed)
+
+    def test_broken_pack_keeps_rows_read_before_the_error(self):
+        (self.packs / "broken.json").write_text('["first", "second" "third"]')
+        out = self.run_import()
+        self.assertIn("broken.json", out)
+        self.assertEqual(sorted(TranslationData.objects.values_list("content", flat=True)), ["first", "second"])
+
+    def test_sync_deletes_rows_missing_from_packs(self):
+        pack = self.packs / "log.json"
+        pack.write_text(json.dumps(["keep", "reworded", "removed"]))
+        self.run_import()
+        make_row("manual", "added by hand")
+        pack.write_text(json.dumps(["keep", "Reworded!"]))
+
+        with mock.patch("core.packsync.SMALL", 0):               # 16 파티션으로 나눠 비교
+            out = self.run_import("--sync", "--dry-run")
+        self.assertIn("1개 삽입 예정", out)
+        self.assertIn("log: pack 2개, 삭제 예정 2개", out)
+        self.assertIn("'removed'", out)
+        self.assertIn("packs 에 파일이 없는 source (건드리지 않음): manual", out)
+        self.assertEqual(TranslationData.objects.count(), 4)
+
+        send = self.enterContext(mock.patch("core.signals._send_to_discord"))
+        with mock.patch("core.packsync.DELETE_CHUNK", 1), \
+                self.captureOnCommitCallbacks(execute=True):
+            out = self.run_import("--sync")
+        self.assertIn("합계 삭제 2개", out)
+        self.assertEqual(sorted(TranslationData.objects.values_list("content", flat=True)),
+                         ["Reworded!", "added by hand", "keep"])
+        self.assertEqual(send.call_count, 1)                    # 행마다가 아니라 요약 한 건
+        self.assertIn("2 translation data deleted", send.call_args.args[0]["content"])
+        self.assertIn("deleted `log`", send.call_args.args[0]["embeds"][0]["description"])
+        self.assertEqual(dict(Source.objects.values_list("name", "rows")), {"log": 2, "manual": 1})
+
+    def test_pack_digest_matches_model_save(self):
+        from core.models import content_digest
+        row = make_row("log", "You feel a little better.")
+        self.assertEqual(bytes(row.content_digest), content_digest("You feel a little better."))
+        self.assertEqual(len(row.content_digest), 16)
+        (self.packs / "log.json").write_text(json.dumps(["You feel a little better.", "new"]))
+        self.assertIn("2개 읽음, 1개 삽입", self.run_import())
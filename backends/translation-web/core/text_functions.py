@@ -0,0 +1,155 @@
+# core/text_functions.py
+"""
+{인자:함수} 특수 패턴 함수 — translation-module/data-manager.js 의 DataManager.functions 이식
+
+• 조사(은/는, 이/가, 을/를 …): 앞 글자 받침 유무로 선택
+• PAD_END / PAD_START(_HTML): 한글 등 비 Latin-1 문자를 2칸으로 세는 정렬
+• TO_KOREAN_RUNE: 룬 문자 → 한글 음차
+
+JS 는 인자가 모자라면 undefined, 남으면 무시하므로 모두 *rest 를 받는다.
+"""
+import re
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+def _jong_idx(word: str) -> int:
+    """마지막 글자 종성 인덱스, 한글이 아니면 -1"""
+    if not word or not _is_hangul(word[-1]):
+        return -1
+    return (ord(word[-1]) - 0xAC00) % 28
+
+
+def _josa(with_batchim: str, without_batchim: str, paren: bool = False):
+    def fn(w: str = "undefined", s: str = "", *rest) -> str:
+        j = _jong_idx(w)
+        if j == -1:
+            return f"{w}{s}{with_batchim}({without_batchim})" if paren else w + without_batchim
+        return w + s + (with_batchim if j != 0 else without_batchim)
+    return fn
+
+
+def _euro(w: str = "undefined", *rest) -> str:
+    """으로/로: 받침 없음 · ㄹ 받침 · 비한글 → 로"""
+    j = _jong_idx(w)
+    return w + ("로" if j in (0, 8, -1) else "으로")
+
+
+def _parse_int(value) -> int | None:
+    """JS parseInt: 앞쪽 정수 부분만, 없으면 None(NaN)"""
+    m = re.match(r"\s*([+-]?\d+)", str(value))
+    return int(m.group(1)) if m else None
+
+
+def _display_width(text: str) -> int:
+    # JS length 는 UTF-16 단위 → BMP 밖 문자는 서로게이트 두 개(각 2칸)
+    width = 0
+    for ch in text:
+        cp = ord(ch)
+        width += 1 if cp <= 0xFF else (2 if cp <= 0xFFFF else 4)
+    return width
+
+
+def _pad_string(pad_start: bool, html: bool):
+    def fn(original: str = "undefined", size=None, *rest) -> str:
+        n = _parse_int(size)
+        if n is None or n <= 0:
+            return original
+        counted = original
+        if html:
+            counted = re.sub(r"<[^\n\r\u2028\u2029]+?>", "", counted)
+            counted = (counted.replace("&amp;", "&").replace("&lt;", "<")
+                       .replace("&gt;", ">").replace("&quot;", '"'))
+        pad = " " * max(n - _display_width(counted), 0)
+        return pad + original if pad_start else original + pad
+    return fn
+
+
+# ── TO_KOREAN_RUNE ───────────────────────────────────────────
+_RUNE_MAP = {
+    "A": "ㅏ", "B": "ㅂ", "C": "ㅋ", "D": "ㄷ", "E": "ㅔ", "F": "ㅍ",
+    "G": "ㄱ", "H": "ㅎ", "I": "ㅣ", "J": "ㅈ", "K": "ㅋ", "L": "ㄹ",
+    "M": "ㅁ", "N": "ㄴ", "O": "ㅗ", "P": "ㅍ", "Q": "ㅋ", "R": "ㄹ",
+    "S": "ㅅ", "T": "ㅌ", "U": "ㅜ", "V": "ㅂ", "W": "ㅈ", "X": "ㅅ",
+    "Y": "ㅡ", "Z": "ㅈ",
+}
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+         "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+_ALLOWED_JONG_IDX = {0, 1, 4, 8, 16, 17, 19, 21}   # '', ㄱ ㄴ ㄹ ㅁ ㅂ ㅅ ㅇ
+_RUNE_PART = re.compile(r"-\s*[^A-Za-z]*([A-Za-z\s]+?)\|")
+
+
+def _compose_segment(seg: str) -> str:
+    out, i = [], 0
+    while i < len(seg) - 1:
+        ci, vi = _CHO.find(seg[i]), _JUNG.find(seg[i + 1])
+        if ci != -1 and vi != -1:
+            ti = 0
+            if i + 2 < len(seg) and seg[i + 2] in _JONG:
+                cand = _JONG.index(seg[i + 2])
+                if cand in _ALLOWED_JONG_IDX:
+                    ti = cand
+                    i += 1
+            out.append(chr(0xAC00 + (ci * 21 + vi) * 28 + ti))
+            i += 2
+        else:
+            i += 1
+    return "".join(out)
+
+
+def _to_korean_rune(rune: str = "undefined", *rest) -> str:
+    lines = []
+    for raw in re.split(r"\r?\n", str(rune)):
+        line = raw.strip()
+        if not line:
+            continue
+        m = _RUNE_PART.search(line)
+        part = re.sub(r"[\"',]", "", m.group(1) if m else line)
+        jamo = "".join(_RUNE_MAP.get(ch.upper(), ch) for ch in part)
+        words = re.split(r"(\s+)", jamo)
+        converted = "".join(w if re.search(r"\s", w) else _compose_segment(w) for w in words)
+        normalized = re.sub(r"\s{2,}", " ", converted)
+        if normalized:
+            lines.append(normalized)
+    return "\n".join(lines)
+
+
+FUNCTIONS = {
+    # 주제·보조 / 주격 / 목적격
+    "은": _josa("은", "는", True), "는": _josa("은", "는", True),
+    "이": _josa("이", "가", True), "가": _josa("이", "가", True),
+    "을": _josa("을", "를", True), "를": _josa("을", "를", True),
+    # 대등·동반
+    "과": _josa("과", "와"), "와": _josa("과", "와"),
+    "이랑": _josa("이랑", "랑"), "랑": _josa("이랑", "랑"),
+    # 선택·비교·양보
+    "이나": _josa("이나", "나"), "나": _josa("이나", "나"),
+    "이라도": _josa("이라도", "라도"), "라도": _josa("이라도", "라도"),
+    "이든": _josa("이든", "든"), "든": _josa("이든", "든"),
+    "이든지": _josa("이든지", "든지"), "든지": _josa("이든지", "든지"),
+    # 인용
+    "이라고": _josa("이라고", "라고"), "라고": _josa("이라고", "라고"),
+    # 조건·원인
+    "이라면": _josa("이라면", "라면"), "라면": _josa("이라면", "라면"),
+    "이라서": _josa("이라서", "라서"), "라서": _josa("이라서", "라서"),
+    # 병렬
+    "이며": _josa("이며", "며"), "며": _josa("이며", "며"),
+    "이고": _josa("이고", "고"), "고": _josa("이고", "고"),
+    # 의문·강조
+    "이냐": _josa("이냐", "냐"), "냐": _josa("이냐", "냐"),
+    "이니": _josa("이니", "니"), "니": _josa("이니", "니"),
+    # 호격
+    "아": _josa("아", "야"), "야": _josa("아", "야"),
+    # 방향·수단 : 특수 규칙
+    "으로": _euro, "로": _euro,
+    # 문자열 길이 정렬
+    "PAD_END": _pad_string(False, False),
+    "PAD_START": _pad_string(True, False),
+    "PAD_END_HTML": _pad_string(False, True),
+    "PAD_START_HTML": _pad_string(True, True),
+    "TO_KOREAN_RUNE": _to_korean_rune,
+}
@@ -0,0 +1,294 @@
+# core/translator.py
+"""
+서버 측 번역 엔진 — modules/translation-module/translator.js 와 같은 결과
+
+• 입력은 build_translation_payload() 의 matchers 구조 그대로
+• regex 는 빌드마다 한 번만 컴파일 (core/jsregex.py 로 JS 문법 변환)
+• category 마다 raw 완전 일치 dict + priority 순 regex 목록
+• 캡처 그룹은 groups 에 적힌 category 로 재귀 번역
+  (translator.js 에 없는 순환·깊이 보호: 같은 (category, 문자열) 재진입 / MAX_DEPTH 초과 → 미번역)
+• ignorePartTranslated, {인자:함수} 특수 패턴 (core/text_functions.py)
+• regex 가 많은 category 는 필수 리터럴 색인(core/prefilter.py)으로 매치 불가능한 matcher 를 건너뜀
+  → prefilter_stats[category] = [실행, 건너뜀]
+• 결과: {"target", "translation", "status", "totalStatus", "translations"} — JS 와 같은 키
+
+parity: core/testdata/translator_parity.json (make_translator_parity.mjs 로 JS 에서 생성)
+"""
+import re
+import threading
+
+from .jsregex import JsRegex, compile_js, js_replace_match, js_replace_string
+from .prefilter import LiteralIndex, build_index
+from .text_functions import FUNCTIONS
+
+TRANSLATED = "translated"
+UNTRANSLATED = "untranslated"
+PART_TRANSLATED = "part-translated"
+
+MAX_DEPTH = 32
+
+# translator.js 의 /\{((?:\\.|[^{}])+?):([\p{L}\p{N}_]+)\}/gu 와 /\{(.+?):([\p{L}\p{N}_]+)\}/gu
+# (Python str 패턴의 \w = [\p{L}\p{N}_], JS 의 . 는 줄바꿈 4종 제외)
+_SPECIAL = re.compile(r"\{((?:\\[^\n\r\u2028\u2029]|[^{}])+?):(\w+)\}")
+_SPECIAL_LOOSE = re.compile(r"\{([^\n\r\u2028\u2029]+?):(\w+)\}")
+_PARAM_ESCAPE = re.compile(r"([\\{}:,])")
+_PARAM_UNESCAPE = re.compile(r"\\(.)", re.S)
+
+
+class _Matcher:
+    __slots__ = ("source", "regex", "replace_value", "groups", "ignore_part_translated", "priority")
+
+    def __init__(self, source: dict, regex: JsRegex | None):
+        self.source = source
+        self.regex = regex
+        self.replace_value = source.get("replaceValue")
+        groups = source.get("groups")
+        # JS: 문자열 그룹은 [g] 로, 배열이 아니면 []
+        self.groups = [[g] if isinstance(g, str) else g for g in groups] if isinstance(groups, list) else []
+        self.ignore_part_translated = bool(source.get("ignorePartTranslated"))
+        self.priority = source.get("priority") or 0
+
+    def replacement(self, language: str, target: str) -> str:
+        rv = self.replace_value
+        if isinstance(rv, str):
+            return rv
+        value = rv.get(language) if isinstance(rv, dict) else None
+        return target if value is None else value
+
+
+class _Category:
+    __slots__ = ("raw", "matchers", "index")
+
+    def __init__(self):
+        self.raw: dict[str, _Matcher] = {}
+        self.matchers: list[_Matcher] = []
+        self.index: LiteralIndex | None = None
+
+
+def _category_key(name) -> str:
+    # JS 객체 키는 문자열로 바뀐다 (null → "null")
+    if isinstance(name, str):
+        return name
+    return "null" if name is None else str(name)
+
+
+class Translator:
+    """translator.js 의 Translator 와 같은 동작 (debug=True 면 matcher / category 도 채움)"""
+
+    def __init__(self, matchers: list[dict], functions: dict | None = None, debug: bool = False,
+                 prefilter: bool = True):
+        self.functions = FUNCTIONS if functions is None else functions
+        self.debug = debug
+        self.categories: dict[str, _Category] = {}
+        self.errors: list[tuple[dict, str]] = []
+        self.prefilter_stats: dict[str, list[int]] = {}
+
+        for m in matchers:
+            regex = None
+            try:
+                if "regex" in m:
+                    spec = m["regex"]
+                    if isinstance(spec, dict):
+                        regex = compile_js(spec.get("pattern") or "", spec.get("flags") or "")
+                    elif spec is None:
+                        raise TypeError("regex is null")
+                    else:
+                        regex = compile_js(str(spec))
+            except (re.error, TypeError, ValueError, OverflowError) as e:
+                # JS 도 컴파일 실패한 matcher 는 통째로 건너뛴다
+                self.errors.append((m, str(e)))
+                continue
+
+            cat = self.categories.setdefault(_category_key(m.get("category")), _Category())
+            compiled = _Matcher(m, regex)
+            if isinstance(m.get("raw"), str):
+                cat.raw[m["raw"]] = compiled
+            elif regex is not None:
+                cat.matchers.append(compiled)
+
+        for cat in self.categories.values():
+            cat.matchers.sort(key=lambda c: c.priority)     # 안정 정렬 → 같은 priority 는 입력 순
+            if prefilter:
+                cat.index = build_index([c.source for c in cat.matchers])
+
+    # ────────────────────────────────────────────────────
+    def replace_special_pattern(self, text: str) -> str:
+        if "{" not in text:
+            return text
+        return _SPECIAL.sub(self._call_function, text)
+
+    def _call_function(self, m: re.Match) -> str:
+        fn = self.functions.get(m.group(2))
+        if fn is None:
+            return m.group(0)
+        params, current, escaping = [], [], False
+        for ch in m.group(1):
+            if escaping:
+                current.append(ch)
+                escaping = False
+            elif ch == "\\":
+                escaping = True
+            elif ch == ",":
+                params.append("".join(current))
+                current = []
+            else:
+                current.append(ch)
+        params.append("".join(current))
+        return str(fn(*(_PARAM_UNESCAPE.sub(r"\1", p) for p in params)))
+
+    # ────────────────────────────────────────────────────
+    def translate(self, target: str, language: str, category: str) -> dict:
+        return self._translate(target, language, category, 0, set())
+
+    def _translate(self, target, language, category, depth, active) -> dict:
+        result = {
+            "target": target, "translation": target,
+            "status": UNTRANSLATED, "totalStatus": UNTRANSLATED,
+        }
+
+        # 0. 카테고리 존재 여부 (+ 순환 / 깊이 보호)
+        cat = self.categories.get(category)
+        if cat is None:
+            return result
+        key = (category, target)
+        if depth > MAX_DEPTH or key in active:
+            result["translations"] = []
+            return result
+
+        # 1. 완전 일치(raw)
+        raw_matcher = cat.raw.get(target)
+        if raw_matcher is not None:
+            if self.debug:
+                result["matcher"] = raw_matcher.source
+            result["translation"] = self.replace_special_pattern(raw_matcher.replacement(language, target))
+            result["status"] = result["totalStatus"] = TRANSLATED
+            return result
+
+        # 2. 정규식 순회 (필수 리터럴이 없는 matcher 는 건너뜀 — 순서는 그대로)
+        allowed = cat.index.allowed(target) if cat.index is not None else None
+        tried = skipped = 0
+        active.add(key)
+        try:
+            translations = []
+            for i, matcher in enumerate(cat.matchers):
+                if allowed is not None and i not in allowed:
+                    skipped += 1
+                    continue
+                tried += 1
+                translations = self._apply(matcher, target, language, depth, active, result)
+                if translations is None:
+                    translations = []
+                    continue
+                if matcher.ignore_part_translated and result["totalStatus"] != TRANSLATED:
+                    # 이번 매처 결과를 버리고 다음 매처 계속 탐색
+                    translations = []
+                    result["translation"] = target
+                    result["status"] = result["totalStatus"] = UNTRANSLATED
+                    continue
+                break
+        finally:
+            active.discard(key)
+            if allowed is not None:
+                stats = self.prefilter_stats.setdefault(category, [0, 0])
+                stats[0] += tried
+                stats[1] += skipped
+
+        if result["status"] == UNTRANSLATED:
+            result["totalStatus"] = UNTRANSLATED
+        result["translations"] = translations
+        return result
+
+    def _apply(self, matcher: _Matcher, target, language, depth, active, result) -> list | None:
+        """matcher 하나 적용 → 하위 번역 목록 (매치 안 되면 None), result 를 채운다"""
+        regex = matcher.regex
+        m = regex.compiled.search(target)
+        if m is None:
+            return None
+        if regex.global_:
+            captures = [x.group(0) for x in regex.compiled.finditer(target)][1:]
+        else:
+            captures = m.groups()
+        if self.debug:
+            result["matcher"] = matcher.source
+
+        replaced = js_replace_match(regex, target, matcher.replacement(language, target), m)
+
+        # 캡처 그룹별 재귀 번역
+        translations = []
+        groups = matcher.groups
+        for i, capture in enumerate(captures):
+            names = groups[i] if i < len(groups) else None
+            if not isinstance(names, list) or capture is None:
+                entry = {"target": capture, "translation": capture,
+                         "status": TRANSLATED, "totalStatus": TRANSLATED}
+                translations.append({"category": None, **entry} if self.debug else entry)
+                continue
+
+            for name in names:
+                name = _category_key(name)
+                if name not in self.categories:
+                    continue
+                sub = self._translate(capture, language, name, depth + 1, active)
+                if self.debug:
+                    sub = {"category": name, **sub}
+                if sub["status"] == TRANSLATED:
+                    replaced, escaped = self._escape_in_special(replaced, capture, sub["translation"])
+                    if not escaped:
+                        replaced = js_replace_string(replaced, capture, sub["translation"])
+                    translations.append(sub)
+                    break
+            else:
+                replaced, _ = self._escape_in_special(replaced, capture, capture)
+                translations.append({"target": capture, "status": UNTRANSLATED, "totalStatus": UNTRANSLATED})
+
+        result["translation"] = self.replace_special_pattern(replaced)
+        result["status"] = TRANSLATED
+        all_done = all(t["totalStatus"] == TRANSLATED for t in translations)
+        result["totalStatus"] = TRANSLATED if all_done else PART_TRANSLATED
+        return translations
+
+    @staticmethod
+    def _escape_in_special(text: str, capture: str, value: str) -> tuple[str, bool]:
+        """
+        {…:함수} 인자 안에 capture 가 있으면 첫 번째 것만 value(\\ { } : , 이스케이프)로 교체
+        → (결과, 교체 여부)
+        """
+        if "{" not in text:
+            return text, False
+        escaped = False
+
+        def sub(m):
+            nonlocal escaped
+            params, fn = m.group(1), m.group(2)
+            if not escaped and capture in params:
+                escaped = True
+                params = js_replace_string(params, capture, _PARAM_ESCAPE.sub(r"\\\1", value))
+            return "{" + params + ":" + fn + "}"
+
+        return _SPECIAL_LOOSE.sub(sub, text), escaped
+
+
+# ────────────────────────────────────────────────────────
+# 현재 DB 기준 Translator (matcher 가 바뀌면 다시 컴파일)
+# ────────────────────────────────────────────────────────
+_current: tuple[tuple, Translator] | None = None
+_current_lock = threading.Lock()
+
+
+def get_translator() -> Translator:
+    """
+    Matcher 개수 + 최신 updated_at 이 같으면 컴파일해 둔 Translator 재사용
+    debug=True — 상태 저장(core/status.py evaluate)에 이긴 matcher id 가 필요하다
+    """
+    global _current
+    from django.db.models import Count, Max
+
+    from .models import Matcher
+    from .views import matcher_dicts
+
+    agg = Matcher.objects.aggregate(n=Count("pk"), last=Max("updated_at"))
+    signature = (agg["n"], agg["last"])
+    with _current_lock:
+        if _current is None or _current[0] != signature:
+            _current = (signature, Translator(matcher_dicts(), debug=True))
+        return _current[1]
@@ -19,7 +19,7 @@ def matcher_to_dict(m):
 def td_to_dict(t):
     return {
         "id":      t.id,
-        "source":  t.source,
+        "source":  t.source.name,
         "content": t.content,
         "memo":    t.memo,
     }
@@ -1,17 +1,28 @@
+import hashlib
 import json
 import os
 import datetime
+import subprocess
+import threading
 import urllib
 from pathlib import Path
 from urllib.parse import quote
 
 import graphviz
+from django.core.paginator import Paginator
 from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.utils import timezone
+from django.utils.html import escape
 from django.urls import reverse
 from django.contrib.admin.views.decorators import staff_member_required
 from django.conf import settings
 
-from .models import Matcher
+from .compact import encode_compact, pack
+from .encodings import write_compressed_siblings
+from .etags import record_etags
+from .models import Matcher, Snapshot
+from .prefilter import matcher_literals
+from .snapshots import store_snapshot
 
 from django.contrib.contenttypes.models import ContentType
 # ─────────────────────────────────────────────────────────
@@ -32,9 +43,14 @@ def _to_dict(m: Matcher) -> dict:
         d["ignorePartTranslated"] = m.ignore_part_translated
     d["priority"] = m.priority
     d["id"] = m.pk
+    # 사전 필터: 이 중 하나라도 target 에 없으면 정규식을 돌릴 필요 없음 (core/prefilter.py)
+    literals = matcher_literals(d)
+    if literals is not None:
+        d["literals"] = literals
     return d
 
 from collections import Counter
+from django.db.models import Count
 from django.contrib.admin.models import LogEntry, ADDITION, CHANGE, DELETION
 from django.contrib.auth import get_user_model
 from django.contrib.admin.views.decorators import staff_member_required
@@ -101,43 +117,77 @@ def user_activity_statistics(request):
 # ─────────────────────────────────────────────────────────
 # 1) matcher 파일 목록 페이지  /builds/
 # ─────────────────────────────────────────────────────────
+SNAPSHOTS_PER_PAGE = 50
+RENDERS_SHOWN = 10
+
+
 @staff_member_required
 def list_translation_files(request):
     root = Path(settings.BUILD_ROOT)
-    files = []
-
-    # latest.json 최우선
-    latest = root / "latest.json"
-    if latest.exists():
-        files.append(latest)
-
-    latest_svg = root / "latest.svg"
-    if latest_svg.exists():
-        files.append(latest_svg)
-
-    # matchers_*.json 내림차순
-    files.extend(sorted(root.glob("translation_file_*.json"), reverse=True))
-    files.extend(sorted(root.glob("translation_file_*.svg"), reverse=True))
-
-    # HTML 작성
     rows = []
-    for fp in files:
-        name  = fp.name
-        size  = fp.stat().st_size
-        mtime = datetime.datetime.fromtimestamp(fp.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-        url   = f"{settings.BUILD_URL}{quote(name)}"
+
+    def row(name, size, when, extra=""):
+        url = f"{settings.BUILD_URL}{quote(name)}"
         rows.append(
             f'<li style="margin-bottom:4px;">'
-            f'<a href="{url}" style="color:#000;text-decoration:none;">{name}</a> '
-            f'<small>({size:,} bytes, {mtime})</small>'
+            f'<a href="{url}" style="color:#000;text-decoration:none;">{escape(name)}</a> '
+            f'<small>({size:,} bytes, {when:%Y-%m-%d %H:%M:%S}{extra})</small>'
             '</li>'
         )
 
+    # latest.* 최우선 (고정된 몇 개만 stat)
+    from .graphrender import pending_render, published_state, render_log
+    state = published_state()
+    svg_extra = (f", generation {state['generation']}, {state['engine']} {state['seconds']:.2f}s"
+                 if state else "")
+    if pending_render() is not None:
+        svg_extra += ", re-rendering…"
+    for name in ("latest.json", "latest.svg", "latest.compact.json", "latest.msgpack"):
+        fp = root / name
+        if fp.exists():
+            st = fp.stat()
+            row(name, st.st_size, datetime.datetime.fromtimestamp(st.st_mtime),
+                svg_extra if name == "latest.svg" else "")
+
+    # 스냅샷은 DB 인덱스에서 페이지 단위로
+    page = Paginator(
+        Snapshot.objects.select_related("json_blob", "svg_blob"), SNAPSHOTS_PER_PAGE
+    ).get_page(request.GET.get("page"))
+    for snap in page:
+        when = timezone.localtime(snap.created_at)
+        blob = snap.json_blob
+        row(f"{snap.name}.json", blob.size, when,
+            f", {snap.matcher_count:,} matchers, sha256 {blob.hash[:12]}, "
+            f"stored {blob.stored_size:,} bytes{' as delta' if blob.base_id else ''}")
+        if snap.svg_blob:
+            row(f"{snap.name}.svg", snap.svg_blob.size, when)
+
+    nav = []
+    if page.has_previous():
+        nav.append(f'<a href="?page={page.previous_page_number()}">← Newer</a>')
+    nav.append(f"page {page.number} / {page.paginator.num_pages}")
+    if page.has_next():
+        nav.append(f'<a href="?page={page.next_page_number()}">Older →</a>')
+
+    # 그래프 렌더 기록 (최근 것부터)
+    renders = "".join(
+        f"<tr><td>{e['generation']}</td><td>{escape(e['engine'])}</td><td>{e['nodes']:,}</td>"
+        f"<td>{e['edges']:,}</td><td>{e['seconds']:.2f}s</td><td>{escape(e['status'])}</td>"
+        f"<td>{escape(e['finished_at'])}</td></tr>"
+        for e in reversed(render_log()[-RENDERS_SHOWN:])
+    )
+
     html = (
             "<h2>Build files</h2>"
             "<ul style='list-style:none;padding-left:0;'>"
             + "".join(rows) +
             "</ul>"
+            f"<p>{' · '.join(nav)}</p>"
+            + ("<h3>Graph renders</h3>"
+               "<table border='1' cellpadding='4' style='border-collapse:collapse;'>"
+               "<tr><th>generation</th><th>engine</th><th>nodes</th><th>edges</th>"
+               "<th>time</th><th>status</th><th>finished</th></tr>"
+               + renders + "</table>" if renders else "") +
             "<p><a href='#' "
             "onclick='history.back();return false;' "
             "style='color:#000;text-decoration:none;'>"
@@ -146,10 +196,65 @@ def list_translation_files(request):
     return HttpResponse(html)
 
 
-def build_translation_payload() -> dict:
-    """matcher 직렬화 + 기여자 통계 JSON 반환"""
-    # 1) 매처 목록
-    matchers = [_to_dict(m) for m in Matcher.objects.all()]
+# ─────────────────────────────────────────────────────────
+# 증분 빌드용 조각 캐시: matcher id → (updated_at, dict, JSON 조각, 조각 해시)
+#   • 바뀐/추가된 행만 다시 _to_dict + json.dumps
+#   • 사라진 id 는 캐시에서 제거
+#   • 최종 문서는 dump_payload() 가 조각을 이어 붙여 만든다
+#   • 재빌드/상태 데몬·요청 스레드가 함께 쓰므로 갱신은 _fragments_lock 안에서만,
+#     읽기는 락 안에서 떠 둔 _snapshot (교체만 하고 수정하지 않음) 으로
+# ─────────────────────────────────────────────────────────
+FRAGMENT_FETCH_CHUNK = 500
+_fragments: dict[int, tuple] = {}
+_fragments_lock = threading.Lock()
+_snapshot: dict[int, tuple] = {}
+
+
+def _dump_fragment(d: dict) -> str:
+    return json.dumps(d, ensure_ascii=False, separators=(",", ":"))
+
+
+def _digest(fragment: str) -> str:
+    return hashlib.blake2b(fragment.encode(), digest_size=8).hexdigest()
+
+
+def _refresh_fragments(*, full: bool = False) -> dict[int, tuple]:
+    """캐시를 DB 와 맞추고 id 오름차순 스냅숏 {id: 항목} 을 반환"""
+    global _snapshot
+    with _fragments_lock:
+        if full:
+            _fragments.clear()
+
+        stamps = dict(Matcher.objects.values_list("pk", "updated_at"))
+
+        for pk in _fragments.keys() - stamps.keys():
+            del _fragments[pk]
+
+        stale = [pk for pk, ts in stamps.items()
+                 if pk not in _fragments or _fragments[pk][0] != ts]
+        for i in range(0, len(stale), FRAGMENT_FETCH_CHUNK):
+            for m in Matcher.objects.filter(pk__in=stale[i:i + FRAGMENT_FETCH_CHUNK]):
+                d = _to_dict(m)
+                frag = _dump_fragment(d)
+                _fragments[m.pk] = (m.updated_at, d, frag, _digest(frag))
+
+        _snapshot = {pk: _fragments[pk] for pk in sorted(stamps) if pk in _fragments}
+        return _snapshot
+
+
+def matcher_dicts(*, full: bool = False) -> list[dict]:
+    """payload 의 matchers 부분만 (id 오름차순, 캐시와 공유 → 수정 금지)"""
+    return [entry[1] for entry in _refresh_fragments(full=full).values()]
+
+
+def build_translation_payload(*, full: bool = False) -> dict:
+    """
+    matcher 직렬화 + 기여자 통계 JSON 반환
+    full=True → 조각 캐시를 버리고 전체 재직렬화
+    ※ matchers 안의 dict 는 캐시와 공유되므로 수정 금지
+    """
+    # 1) 매처 목록 (바뀐 행만 재직렬화)
+    matchers = matcher_dicts(full=full)
 
     # 2) 기여자 카운트
     matcher_ct = ContentType.objects.get_for_model(Matcher)
@@ -157,32 +262,59 @@ def build_translation_payload() -> dict:
         content_type=matcher_ct,
         action_flag__in=(ADDITION, CHANGE, DELETION)
     )
-    counts = Counter(log_qs.values_list("user__username", flat=True))
+    counts = log_qs.order_by().values_list("user__username").annotate(cnt=Count("pk"))
     messages = [", ".join(
         f"{user} (x{cnt})"
-        for user, cnt in sorted(counts.items(), key=lambda x: -x[1])
+        for user, cnt in sorted(counts, key=lambda x: (-x[1], x[0] or ""))
     )]
 
-    # 3) 최종 구조
+    # 3) 최종 구조 — time 은 content_digest() 에서 제외
     return {
         "matchers": matchers,
         "time": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
         "messages": messages,
     }
 
+
+def dump_payload(payload: dict) -> str:
+    """
+    payload → JSON 문자열. matcher 한 줄에 하나씩,
+    캐시에 있는 matcher 는 이미 만들어 둔 조각을 그대로 이어 붙인다.
+    """
+    snapshot, parts = _snapshot, []
+    for m in payload.get("matchers", []):
+        entry = snapshot.get(m.get("id"))
+        parts.append(entry[2] if entry is not None and entry[1] is m else _dump_fragment(m))
+
+    rest = {k: v for k, v in payload.items() if k != "matchers"}
+    tail = "," + _dump_fragment(rest)[1:] if rest else "}"
+    return '{"matchers":[\n' + ",\n".join(parts) + "\n]" + tail + "\n"
+
+
+def content_digest(payload: dict) -> str:
+    """time / generation 을 뺀 payload 해시 — 같으면 다시 게시할 필요 없음"""
+    body = {k: v for k, v in payload.items() if k not in ("time", "generation")}
+    return hashlib.sha256(dump_payload(body).encode("utf-8")).hexdigest()
+
+
+def fragment_digests(payload: dict) -> dict[int, str]:
+    """matcher id → 직렬화 조각의 해시 (delta 계산용, 캐시에 있으면 재계산 없음)"""
+    snapshot, digests = _snapshot, {}
+    for m in payload.get("matchers", []):
+        entry = snapshot.get(m.get("id"))
+        digests[m["id"]] = (entry[3] if entry is not None and entry[1] is m
+                            else _digest(_dump_fragment(m)))
+    return digests
+
 # ────────────────────────────────────────────────────────────────
 # 공통 2) 그래프(SVG) 생성기
 # ────────────────────────────────────────────────────────────────
-def generate_category_graph(matchers: list, svg_path: Path) -> None:
-    """
-    payload 안의 matchers → Graphviz SVG.
-    • 노드: category (matcher 개수 포함) – admin 링크 달림
-    • 간선: groups 안에 참조된 category
-    • 순환 간선은 빨간색
-    """
-    # ── 1. 데이터 수집 ───────────────────────────────────────────
+GRAPH_VERSION = 1          # 그림 모양(속성·URL)을 바꾸면 올려서 다시 그리게 한다
+
+
+def category_graph(matchers: list) -> tuple[dict[str, int], list[tuple[str, str]]]:
+    """matchers → ({category: matcher 개수}, 정렬된 간선 목록) — groups 참조가 간선"""
     edges: set[tuple[str, str]] = set()
-    categories: set[str] = set()
     matcher_count: dict[str, int] = {}
 
     def flatten(groups):
@@ -198,42 +330,104 @@ def generate_category_graph(matchers: list, svg_path: Path) -> None:
         cat = m.get("category")
         if cat:
             matcher_count[cat] = matcher_count.get(cat, 0) + 1
-            categories.add(cat)
         groups = m.get("groups")
         if cat and groups:
             for g in flatten(groups):
                 if g:
                     edges.add((cat, g))
-                    categories.add(g)
+                    matcher_count.setdefault(g, 0)      # 카운트 없는 노드 0으로
 
-    for c in categories:                # 카운트 없는 노드 0으로
-        matcher_count.setdefault(c, 0)
+    return matcher_count, sorted(edges)
 
-    # ── 2. 순환 간선 찾아서 색상 구분 ─────────────────────────────
-    adj: dict[str, set[str]] = {}
-    for u, v in edges:
-        adj.setdefault(u, set()).add(v)
-    cycle_edges: set[tuple[str, str]] = set()
-
-    def dfs(start, cur, visited):
-        if cur not in adj:
-            return False
-        for nxt in adj[cur]:
-            if (cur, nxt) in visited:
-                continue
-            visited.add((cur, nxt))
-            if nxt == start or dfs(start, nxt, visited):
-                return True
-        return False
 
+def cycle_edges(edges) -> set[tuple[str, str]]:
+    """
+    순환 위의 간선 = 자기 자신으로 가는 간선 + 같은 강연결요소(SCC) 안의 간선.
+    Tarjan 한 번 (반복문, O(V+E)) — 깊은 그래프에서도 재귀 한도와 무관
+    """
+    adj: dict[str, list[str]] = {}
     for u, v in edges:
-        if u == v or dfs(u, v, set()):
-            cycle_edges.add((u, v))
+        adj.setdefault(u, []).append(v)
+        adj.setdefault(v, [])
+
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    component: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    counter = 0
+
+    for root in adj:
+        if root in index:
+            continue
+        work = [(root, iter(adj[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, it = work[-1]
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(adj[nxt])))
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:        # SCC 루트 → 스택에서 한 덩어리 꺼냄
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component[w] = index[node]
+                        if w == node:
+                            break
+
+    return {(u, v) for u, v in edges if u == v or component[u] == component[v]}
+
+
+def graph_fingerprint(matchers: list) -> str:
+    """노드·개수·간선이 같으면 같은 값 → 같은 SVG"""
+    return graph_digest(*category_graph(matchers))
+
+
+def graph_digest(matcher_count: dict[str, int], edges: list[tuple[str, str]]) -> str:
+    h = hashlib.sha256(f"v{GRAPH_VERSION}\n".encode())
+    for c in sorted(matcher_count):
+        h.update(f"n\t{c}\t{matcher_count[c]}\n".encode())
+    for u, v in edges:
+        h.update(f"e\t{u}\t{v}\n".encode())
+    return h.hexdigest()
+
+
+def generate_category_graph(matchers: list, svg_path: Path, *,
+                            engine: str = "dot", timeout: float | None = None) -> None:
+    """
+    payload 안의 matchers → Graphviz SVG ({svg_path}.svg).
+    • 노드: category (matcher 개수 포함) – admin 링크 달림
+    • 간선: groups 안에 참조된 category
+    • 순환 간선은 빨간색
+    • engine 하위 프로세스를 timeout 초 안에 못 끝내면 kill 후 subprocess.TimeoutExpired
+    """
+    # ── 1. 데이터 수집 ───────────────────────────────────────────
+    matcher_count, edges = category_graph(matchers)
+
+    # ── 2. 순환 간선 찾아서 색상 구분 ─────────────────────────────
+    cycles = cycle_edges(edges)
 
     # ── 3. Graphviz 객체 구성 ──────────────────────────────────
     dot = graphviz.Digraph("Categories", format="svg")
 
     dot.attr(rankdir="LR", fontsize="10")
+    if engine != "dot":
+        dot.attr(overlap="prism", splines="true")      # sfdp 등 힘 기반 레이아웃: 노드 겹침 제거
     dot.attr("node", shape="rect", style="filled",
              fillcolor="lightgrey", fontname="Helvetica", fontsize="10")
 
@@ -241,55 +435,103 @@ def generate_category_graph(matchers: list, svg_path: Path) -> None:
         "https://translation.nemelex.cards/admin/core/matcher/?category="
     )
 
-    for c in sorted(categories):
+    for c in sorted(matcher_count):
         label = f"{c} ({matcher_count[c]})"
         url = f"{base_admin_url}{urllib.parse.quote(c, safe='')}"
         dot.node(c, label=label, URL=url, target="_blank")
 
-    for u, v in edges:
-        if (u, v) in cycle_edges:
+    for u, v in edges:                  # 같은 입력 → 같은 SVG
+        if (u, v) in cycles:
             dot.edge(u, v, color="red")
         else:
             dot.edge(u, v)
 
-    dot.render(svg_path, cleanup=True)
+    subprocess.run(
+        [engine, "-Tsvg", "-o", f"{svg_path}.svg"],
+        input=dot.source.encode("utf-8"), capture_output=True, check=True, timeout=timeout,
+    )
+
 
-def write_payload(payload: dict, *, snapshot: bool) -> None:
+def _atomic_write_text(path: Path, text: str) -> None:
+    """임시 파일에 쓴 뒤 rename → 읽는 쪽은 항상 완성된 파일만 본다"""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_payload(payload: dict, *, snapshot: bool, content: str | None = None) -> None:
     """
-    • latest.json / latest.svg 항상 덮어씀
-    • snapshot=True → translation_file_YYYYMMDD_HHMMSS.json + .svg 추가
+    • latest.json 항상 덮어씀 (write-then-rename)
+    • latest.svg 는 그래프가 바뀐 경우에만 백그라운드에서 다시 렌더 (core/graphrender.py)
+    • latest.compact.json / latest.msgpack 선택 포맷도 함께 (core/compact.py)
+    • 각 파일 옆에 .br / .zst / .gz 사전 압축본 생성 (serve_build 가 협상)
+    • 파일마다 강한 ETag 를 매니페스트에 기록 (core/etags.py)
+    • snapshot=True → Snapshot 등록 (/build/translation_file_YYYYMMDD_HHMMSS.json|svg)
     """
     root = Path(settings.BUILD_ROOT)
     root.mkdir(parents=True, exist_ok=True)
+    text = dump_payload(payload)
 
     # 1) 최신 JSON
     latest_json = root / "latest.json"
-    latest_json.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    # 2) 최신 SVG
-    latest_svg = root / "latest"
-    generate_category_graph(payload.get('matchers', []), latest_svg)
-
-    # 3) 스냅샷
+    _atomic_write_text(latest_json, text)
+    write_compressed_siblings(latest_json)
+    # 1-1) 선택 포맷: 열 지향 JSON + MessagePack (core/compact.py 스키마)
+    compact = encode_compact(payload)
+    compact_json = root / "latest.compact.json"
+    _atomic_write_text(compact_json, _dump_fragment(compact))
+    write_compressed_siblings(compact_json)
+    packed = pack(compact)
+    if packed is not None:
+        latest_msgpack = root / "latest.msgpack"
+        _atomic_write_bytes(latest_msgpack, packed)
+        write_compressed_siblings(latest_msgpack)
+    written = [latest_json, compact_json] + ([latest_msgpack] if packed is not None else [])
+    record_etags(written, content=content)
+
+    # 2) 최신 SVG — 그래프(노드·개수·간선)가 바뀌었을 때만, 렌더는 백그라운드 (core/graphrender.py)
+    #    끝날 때까지는 이전 latest.svg 가 그대로 서비스된다
+    from .graphrender import schedule_render
+    schedule_render(payload.get("matchers", []), generation=payload.get("generation", 0))
+
+    # 3) 스냅샷 — 내용 주소 저장소에 등록 (core/snapshots.py)
     if snapshot:
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        snap_json = root / f"translation_file_{ts}.json"
-        snap_json.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-        snap_svg = root / f"translation_file_{ts}"
-        generate_category_graph(payload.get('matchers', []), snap_svg)
+        snapshot_latest(generation=payload.get("generation", 0),
+                        matcher_count=len(payload.get("matchers", [])))
+
+
+def snapshot_latest(*, generation: int, matcher_count: int) -> None:
+    """
+    현재 latest.json / latest.svg 를 스냅샷으로 등록 (같은 내용이면 blob 재사용).
+    SVG 렌더가 진행 중이면 SVG 없이 등록하고 렌더가 끝날 때 채운다
+    """
+    from .graphrender import pending_render
+    root = Path(settings.BUILD_ROOT)
+    latest_svg = root / "latest.svg"
+    job = pending_render()
+    snap = store_snapshot(
+        (root / "latest.json").read_bytes(),
+        latest_svg.read_bytes() if job is None and latest_svg.exists() else None,
+        generation=generation,
+        matcher_count=matcher_count,
+    )
+    if job is not None:
+        job.attach(snap.pk)
 # ─────────────────────────────────────────────────────────
 # 2) Generate matchers  ─ build/ 에 파일 저장 후 /builds/ 로 redirect
 # ─────────────────────────────────────────────────────────
 # ── 메인 뷰 ───────────────────────────────────────────────────
 @staff_member_required
 def generate_translation_file(request):
-    # 1. 매처 목록 직렬화
-    payload = build_translation_payload()
-    write_payload(payload, snapshot=True)
-    # 5. 목록 페이지로 리다이렉트
+    # 대기 중인 재빌드까지 한 번에 처리 (빌드 락 공유)
+    # 수동 빌드는 조각 캐시도 새로 만든다 (update() 로 스탬프가 빠진 행 대비)
+    from .rebuild import rebuild_now
+    rebuild_now(snapshot=True, full=True)
+    # 목록 페이지로 리다이렉트
     return HttpResponseRedirect(reverse("list-translation-files"))
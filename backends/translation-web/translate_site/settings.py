@@ -174,6 +174,43 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 BUILD_ROOT = BASE_DIR / "build"
 BUILD_URL  = "/build/"
 
+# latest.json 재빌드 스케줄러 (core/rebuild.py)
+REBUILD_ASYNC     = True                                          # False → mark_dirty 만, 빌드는 수동
+REBUILD_DEBOUNCE  = float(os.getenv("REBUILD_DEBOUNCE", "2"))     # 마지막 저장 후 대기(초)
+REBUILD_MAX_DELAY = float(os.getenv("REBUILD_MAX_DELAY", "30"))   # 연속 저장 시 최대 지연(초)
+DELTA_HISTORY     = 500                                           # /build/delta 가 보관하는 generation 수
+
+# Discord 웹훅 outbox (core/outbox.py)
+WEBHOOK_OUTBOX_ASYNC     = True                                   # False → manage.py webhook_outbox --drain 으로만 전송
+WEBHOOK_TIMEOUT          = 10                                     # 요청 하나당(초)
+WEBHOOK_MAX_ATTEMPTS     = 8                                      # 넘으면 dead
+WEBHOOK_RETRY_BASE       = 5.0                                    # 재시도 간격 = base × 2^(n-1) (초)
+WEBHOOK_RETRY_MAX        = 3600.0
+WEBHOOK_OUTBOX_KEEP_DAYS = 7                                      # 전송된 행 보관 기간 (지연 통계용)
+
+# latest.svg 백그라운드 렌더 (core/graphrender.py)
+GRAPH_RENDER_ASYNC    = True                                      # False → 빌드 중에 바로 렌더
+GRAPH_RENDER_WORKERS  = 1
+GRAPH_RENDER_TIMEOUT  = float(os.getenv("GRAPH_RENDER_TIMEOUT", "120"))   # 초과 시 kill, 이전 SVG 유지
+GRAPH_SFDP_THRESHOLD  = int(os.getenv("GRAPH_SFDP_THRESHOLD", "400"))     # 노드가 이보다 많으면 sfdp
+GRAPH_RENDER_HISTORY  = 50                                        # .graph-renders.json 보관 수
+
+# TranslationData 번역 상태 저장 (core/status.py)
+TRANSLATION_STATUS_AUTO     = True                                # 재빌드 / 행 추가 때 증분 재계산
+TRANSLATION_STATUS_ASYNC    = True                                # False → 빌드 락을 놓은 뒤 같은 스레드에서 재계산
+TRANSLATION_STATUS_LANGUAGE = os.getenv("TRANSLATION_STATUS_LANGUAGE", "ko")
+
+# matcher 영향 분석 (core/impact.py) — 초 단위 시간 예산
+MATCHER_IMPACT_ON_SAVE     = False                                # 저장할 때 요약 메시지 (전체 matcher 컴파일 → 저장이 느려짐)
+MATCHER_IMPACT_SAVE_BUDGET = 1.0
+MATCHER_IMPACT_BUDGET      = 3.0                                  # "Preview impact" 버튼
+
+# 스냅샷 저장소 (core/snapshots.py) — 최근 N 개 또는 N 일 이내는 보관, 나머지는 GC
+SNAPSHOT_KEEP_LAST   = int(os.getenv("SNAPSHOT_KEEP_LAST", "100"))
+SNAPSHOT_KEEP_DAYS   = int(os.getenv("SNAPSHOT_KEEP_DAYS", "90"))
+SNAPSHOT_DELTA_CHAIN = 10                                         # delta 로 이어 저장할 최대 깊이
+SNAPSHOT_GC_EVERY    = 20                                         # 저장 N 개마다 보관 정책 적용 (0 → manage.py snapshots --gc 만)
+
 STATICFILES_DIRS = [
     BASE_DIR / "static",        # (있다면)
     BUILD_ROOT,                 # ★ 추가
@@ -189,6 +226,7 @@ JAZZMIN_SETTINGS = {
             "permissions": ["core.view_matcher"],
         },
         {"name": "User statistics", "url": "user-statistics", "permissions": ["auth.view_user"]},
+        {"name": "Coverage", "url": "coverage-report", "permissions": ["core.view_translationdata"]},
     ],
 }
 
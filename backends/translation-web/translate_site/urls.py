@@ -5,6 +5,8 @@ from django.conf.urls.static import static
 from django.shortcuts import redirect
 from django.contrib import admin
 from core import views as core_views
+from core.coverage import coverage_report
+from core.delta import delta_view
 from django.urls import re_path
 from .views_build import serve_build
 
@@ -13,6 +15,7 @@ urlpatterns = [
     path("statistics", core_views.user_activity_statistics, name="statistics-json"),
     path("statistics/", core_views.user_activity_statistics, name="statistics-json-slash"),
     path("user-statistics/", core_views.user_activity_report, name="user-statistics"),
+    path("coverage/", coverage_report, name="coverage-report"),
 
     path("admin/", admin.site.urls),
 
@@ -21,6 +24,8 @@ urlpatterns = [
 
     # (2) JSON 생성 → 이름을 **generate-matchers** 로 유지
     path("build/generate/", core_views.generate_translation_file, name="generate-translation-file"),
+    # (3) generation 간 변경분  ?since=<generation>
+    path("build/delta", delta_view, name="build-delta"),
     re_path(r"^build/(?P<path>.+)$", serve_build, name="serve-build"),
 
 ]
@@ -1,43 +1,186 @@
 # views_build.py  ─ 수정 버전
+import mimetypes
+import re
 from pathlib import Path
 from urllib.parse import unquote  # ⬅️ 여기
 from django.conf import settings
-from django.http import FileResponse, Http404
-from django.http import FileResponse, Http404, HttpResponseNotModified
-from django.utils.http import http_date, parse_http_date_safe
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
 
-BUILD_ROOT = Path(settings.BUILD_ROOT).resolve()
+from core.encodings import SUFFIXES, negotiate
+from core.etags import lookup_etag
+from core.snapshots import encoded_object, find_snapshot_file, plain_object
 
+# latest.msgpack (core/compact.py)
+mimetypes.add_type("application/vnd.msgpack", ".msgpack")
 
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_SIBLING_TYPES = {".br": "application/x-brotli", ".zst": "application/zstd", ".gz": "application/gzip"}
+
+
+@require_safe
 def serve_build(request, path):
     # 디렉터리 트래버설 방지
-    full_path = (BUILD_ROOT / unquote(path)).resolve()
-    if not full_path.is_file() or BUILD_ROOT not in full_path.parents:
+    build_root = Path(settings.BUILD_ROOT).resolve()
+    full_path = (build_root / unquote(path)).resolve()
+    if build_root not in full_path.parents:
+        raise Http404()
+    # .rebuild.lock / .latest.json.tmp / .objects/ 같은 내부 파일은 숨김
+    if any(part.startswith(".") for part in full_path.relative_to(build_root).parts):
         raise Http404()
-    stat = full_path.stat()
-    last_mtime = stat.st_mtime
-    last_modified = http_date(last_mtime)  # Fri, 09 May 2025 04:12:30 GMT
-    etag = f'W/"{int(last_mtime)}-{stat.st_size}"'  # Weak ETag 예시
-
-    # ── 조건부 GET 처리 ─────────────────────────────
-    ims = request.headers.get("If-Modified-Since")
-    inm = request.headers.get("If-None-Match")
-
-    not_modified = (
-            (ims and parse_http_date_safe(ims) >= int(last_mtime)) or
-            (inm == etag)
+    if not full_path.is_file():
+        # translation_file_*.json|svg → 스냅샷 저장소에서 복원
+        found = find_snapshot_file(full_path.name) if full_path.parent == build_root else None
+        if found is None:
+            raise Http404()
+        return _serve_snapshot(request, *found)
+
+    # ── 사전 압축본 선택 (latest.json → latest.json.br 등) ─────
+    # 압축본을 직접 요청한 경우는 협상하지 않고 그대로 보낸다
+    negotiable = not full_path.name.endswith(SUFFIXES)
+    send_path, encoding = (
+        negotiate(full_path, request.headers.get("Accept-Encoding"))
+        if negotiable else (full_path, None)
+    )
+
+    stat = send_path.stat()
+    # 빌드 때 계산해 둔 내용 해시 → 강한 ETag (변형마다 다름)
+    # 매니페스트에 없거나 교체 도중이면 예전처럼 mtime-size 약한 ETag
+    etag = lookup_etag(send_path, stat) or f'W/"{int(stat.st_mtime)}-{stat.st_size}"'
+
+    # 압축본을 보내도 Content-Type 은 원본 기준, 압축본을 직접 요청했으면 압축 형식 그대로
+    if negotiable:
+        content_type = mimetypes.guess_type(full_path.name)[0] or "application/octet-stream"
+    else:
+        content_type = _SIBLING_TYPES[full_path.suffix]
+
+    resp = _send(
+        request,
+        size=stat.st_size,
+        open_body=lambda: open(send_path, "rb"),
+        content_type=content_type,
+        etag=etag,
+        last_modified=int(stat.st_mtime),
+        cache_control="public, max-age=0, must-revalidate",
+    )
+    if encoding and resp.status_code != 304:
+        resp["Content-Encoding"] = encoding
+    if negotiable:
+        patch_vary_headers(resp, ("Accept-Encoding",))
+    return resp
+
+
+def _serve_snapshot(request, snap, blob):
+    """
+    스냅샷 내용은 이름별로 불변 → 강한 ETag(sha256) + 긴 캐시
+    압축본은 latest.* 와 같은 협상으로 (ETag 는 변형마다 "<hash>-gz|br|zst")
+    — delta 가 아닌 blob 의 gzip 은 저장된 .gz 그대로, 나머지는 처음 요청 때 만들어 둔 캐시
+    받는 인코딩이 없거나 Range 요청이면 풀어 둔 원본 파일(<hash>.body)에서 보낸다
+    """
+    common = dict(
+        content_type="application/json" if blob.kind == "json" else "image/svg+xml",
+        last_modified=int(snap.created_at.timestamp()),
+        cache_control="public, max-age=31536000, immutable",
     )
-    if not_modified:
-        resp = HttpResponseNotModified()
-        resp["ETag"] = etag
-        resp["Last-Modified"] = last_modified
-        resp["Access-Control-Allow-Origin"] = "*"
-        return resp
-
-    # ── 정상 200 응답 ───────────────────────────────
-    resp = FileResponse(open(full_path, "rb"))
+    packed = None
+    if "Range" not in request.headers:
+        packed = encoded_object(blob, request.headers.get("Accept-Encoding"))
+    if packed is not None:
+        path, encoding, suffix = packed
+        resp = _send(request, size=path.stat().st_size, open_body=lambda: open(path, "rb"),
+                     etag=f'"{blob.hash}-{suffix[1:]}"', **common)
+        if resp.status_code != 304:
+            resp["Content-Encoding"] = encoding
+    else:
+        resp = _send(request, size=blob.size, open_body=lambda: open(plain_object(blob), "rb"),
+                     etag=f'"{blob.hash}"', **common)
+    patch_vary_headers(resp, ("Accept-Encoding",))
+    return resp
+
+
+# ────────────────────────────────────────────────────────────────
+# 공통: 조건부 요청 → Range → HEAD / GET 본문
+# ────────────────────────────────────────────────────────────────
+def _byte_range(request, size: int, etag: str, last_modified: int):
+    """
+    단일 'bytes=' Range → (start, end) 포함 구간
+    None  = 전체 전송 (Range 없음 / 다중 구간 / If-Range 불일치)
+    False = 만족할 수 없는 구간 (416)
+    """
+    header = request.headers.get("Range")
+    if not header:
+        return None
+    # If-Range: 강한 ETag 정확히 일치 또는 Last-Modified 날짜 일치일 때만 부분 전송
+    if_range = request.headers.get("If-Range")
+    if if_range:
+        strong_match = not etag.startswith("W/") and if_range == etag
+        if not strong_match and if_range != http_date(last_modified):
+            return None
+
+    m = _RANGE_RE.match(header.replace(" ", ""))
+    if m is None:
+        return None
+    first, last = m.groups()
+    if not first:                       # bytes=-N → 마지막 N 바이트 (빈 파일이면 만족할 구간이 없다)
+        if not last or int(last) == 0 or size == 0:
+            return False
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+class _RangeReader:
+    """열린 파일의 [start, start + length) 만 읽히는 래퍼 — FileResponse 가 블록 단위로 읽어 보낸다"""
+
+    def __init__(self, f, start: int, length: int):
+        f.seek(start)
+        self._f = f
+        self._left = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self._left:
+            size = self._left
+        data = self._f.read(size)
+        self._left -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def _send(request, *, size, open_body, content_type, etag, last_modified, cache_control):
+    # If-None-Match(목록 / *) · If-Match · If-Modified-Since 는 Django 구현 사용
+    resp = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if resp is None:
+        byte_range = _byte_range(request, size, etag, last_modified)
+        if byte_range is False:
+            resp = HttpResponse(status=416)
+            resp["Content-Range"] = f"bytes */{size}"
+        elif byte_range is not None:
+            start, end = byte_range
+            if request.method == "HEAD":
+                resp = HttpResponse(status=206, content_type=content_type)
+            else:
+                # 구간만 블록 단위로 스트리밍 (큰 스냅샷 이어받기도 메모리에 통째로 읽지 않는다)
+                resp = FileResponse(_RangeReader(open_body(), start, end - start + 1),
+                                    status=206, content_type=content_type)
+            resp["Content-Range"] = f"bytes {start}-{end}/{size}"
+            resp["Content-Length"] = str(end - start + 1)
+        elif request.method == "HEAD":
+            # 본문 없이 헤더만 (파일은 열지도 않는다)
+            resp = HttpResponse(content_type=content_type)
+            resp["Content-Length"] = str(size)
+        else:
+            resp = FileResponse(open_body(), content_type=content_type)
+        resp["Cache-Control"] = cache_control
+        resp["Accept-Ranges"] = "bytes"
+
     resp["ETag"] = etag
-    resp["Last-Modified"] = last_modified
-    resp["Cache-Control"] = "public, max-age=0, must-revalidate"
+    resp["Last-Modified"] = http_date(last_modified)
     resp["Access-Control-Allow-Origin"] = "*"
     return resp